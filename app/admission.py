@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Callable, Mapping
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import MetricsRegistry, registry
+
+ADMISSION_SHED = registry.counter(
+    "examifyr_admission_shed_total",
+    "Requests rejected with 503, by route class and reason.",
+    ("route_class", "reason"),
+)
+
+# Returns the route class for (method, path), or None for routes that are
+# never queued or shed.
+RouteClassifier = Callable[[str, str], "str | None"]
+
+
+class AdaptiveLimit:
+    """Additive-increase/multiplicative-decrease concurrency limit.
+
+    Every request that finishes under ``target_latency`` raises the limit by
+    roughly one per limit's worth of requests; a slower one cuts it by
+    ``backoff``, at most once per ``target_latency`` so a burst of slow
+    completions counts as one signal.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        max_limit: int,
+        target_latency: float,
+        min_limit: int = 1,
+        backoff: float = 0.9,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= initial <= max_limit")
+        self._limit = float(initial)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._target_latency = target_latency
+        self._backoff = backoff
+        self._clock = clock
+        self._last_decrease = float("-inf")
+
+    @property
+    def value(self) -> int:
+        return int(self._limit)
+
+    def record(self, latency: float) -> None:
+        if latency <= self._target_latency:
+            self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+            return
+        now = self._clock()
+        if now - self._last_decrease >= self._target_latency:
+            self._last_decrease = now
+            self._limit = max(self._min_limit, self._limit * self._backoff)
+
+
+class OverloadedError(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionQueue:
+    """Admits up to ``limit.value`` concurrent requests with a bounded FIFO wait."""
+
+    def __init__(self, limit: AdaptiveLimit, max_queue: int, queue_timeout: float) -> None:
+        self.limit = limit
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self.in_flight = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.in_flight < self.limit.value and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self._max_queue:
+            raise OverloadedError("queue_full")
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait({waiter}, timeout=self._queue_timeout)
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        if not waiter.done():
+            self._abandon(waiter)
+            raise OverloadedError("queue_timeout")
+
+    def release(self, latency: float) -> None:
+        self.in_flight -= 1
+        self.limit.record(latency)
+        self._wake()
+
+    def _abandon(self, waiter: asyncio.Future[None]) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # The slot was handed over just as the wait ended; give it back.
+            self.in_flight -= 1
+            self._wake()
+            return
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _wake(self) -> None:
+        # A slot is handed straight to the next waiter, which counts it as
+        # in flight before it even wakes up.
+        while self._waiters and self.in_flight < self.limit.value:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class AdmissionMiddleware:
+    """Queues and sheds requests per route class before they reach the app.
+
+    Requests beyond a class's concurrency limit wait in a bounded queue;
+    once the queue is full or the wait exceeds its deadline they get an
+    immediate 503 with ``Retry-After``. The latency fed back to a class's
+    limit stops at ``http.response.start``: a streamed body or a slow client
+    keeps holding its slot but does not count as a slow request.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        queues: Mapping[str, AdmissionQueue],
+        classify: RouteClassifier,
+        retry_after_seconds: int = 1,
+        metrics: MetricsRegistry = registry,
+    ) -> None:
+        self.app = app
+        self.queues = dict(queues)
+        self.classify = classify
+        self.retry_after_seconds = retry_after_seconds
+        # The gauges read these queues, so they belong to the app's registry
+        # rather than the process-wide one.
+        queue_depth = metrics.gauge(
+            "examifyr_admission_queue_depth",
+            "Requests waiting for an admission slot, by route class.",
+            ("route_class",),
+        )
+        in_flight = metrics.gauge(
+            "examifyr_admission_in_flight",
+            "Admitted requests currently running, by route class.",
+            ("route_class",),
+        )
+        concurrency_limit = metrics.gauge(
+            "examifyr_admission_concurrency_limit",
+            "Current adaptive concurrency limit, by route class.",
+            ("route_class",),
+        )
+        for route_class, queue in self.queues.items():
+            queue_depth.set_function(lambda queue=queue: queue.depth, route_class)
+            in_flight.set_function(lambda queue=queue: queue.in_flight, route_class)
+            concurrency_limit.set_function(lambda queue=queue: queue.limit.value, route_class)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route_class = self.classify(scope["method"], scope["path"])
+        queue = self.queues.get(route_class) if route_class is not None else None
+        if queue is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await queue.acquire()
+        except OverloadedError as exc:
+            ADMISSION_SHED.inc(route_class, exc.reason)
+            await self._reject(send)
+            return
+        started = time.perf_counter()
+        response_started: float | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start" and response_started is None:
+                response_started = time.perf_counter()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finished = response_started if response_started is not None else time.perf_counter()
+            queue.release(finished - started)
+
+    async def _reject(self, send: Send) -> None:
+        body = json.dumps({"detail": "Server is overloaded, retry later"}).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("ascii")),
+                    (b"retry-after", str(self.retry_after_seconds).encode("ascii")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+from typing import Callable
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+from app.quiz.cache import LoadingCache
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Bodies smaller than this are not worth the CPU or the extra header bytes.
+MIN_COMPRESS_BYTES = 256
+
+_COMPRESSORS: dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda body: gzip.compress(body, compresslevel=6, mtime=0),
+}
+if brotli is not None:
+    _COMPRESSORS["br"] = lambda body: brotli.compress(body, quality=5)
+
+# Preferred first when the client accepts several encodings with equal weight.
+_ENCODING_PREFERENCE = ("br", "gzip")
+
+
+def available_encodings() -> tuple[str, ...]:
+    return tuple(encoding for encoding in _ENCODING_PREFERENCE if encoding in _COMPRESSORS)
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[token] = weight
+
+    best: str | None = None
+    best_weight = 0.0
+    for encoding in available_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def parse_if_none_match(header: str | None) -> set[str]:
+    if not header:
+        return set()
+    tags = set()
+    for part in header.split(","):
+        tag = part.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag:
+            tags.add(tag)
+    return tags
+
+
+class QuizRepresentation:
+    """A stored quiz body with its ETag and lazily built compressed variants."""
+
+    __slots__ = ("body", "etag", "_encoded", "_lock")
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self._encoded: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def variant_etag(self, encoding: str | None) -> str:
+        if encoding is None:
+            return self.etag
+        return f'{self.etag[:-1]}-{encoding}"'
+
+    def matches(self, if_none_match: str | None) -> bool:
+        tags = parse_if_none_match(if_none_match)
+        if not tags:
+            return False
+        if "*" in tags:
+            return True
+        candidates = {self.etag, *(self.variant_etag(encoding) for encoding in _COMPRESSORS)}
+        return not tags.isdisjoint(candidates)
+
+    def encoded(self, encoding: str | None) -> tuple[bytes, str | None]:
+        if encoding is None or len(self.body) < MIN_COMPRESS_BYTES:
+            return self.body, None
+        variant = self._encoded.get(encoding)
+        if variant is None:
+            with self._lock:
+                variant = self._encoded.get(encoding)
+                if variant is None:
+                    variant = _COMPRESSORS[encoding](self.body)
+                    self._encoded[encoding] = variant
+        return variant, encoding
+
+
+class RepresentationCache(LoadingCache[bytes, QuizRepresentation]):
+    """LRU of serialized quizzes, keyed by quiz id."""
+
+    def _build(self, source: bytes) -> QuizRepresentation:
+        return QuizRepresentation(source)
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class IdempotencyConflictError(Exception):
+    pass
+
+
+def request_fingerprint(body: str) -> str:
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _Entry(Generic[T]):
+    fingerprint: str
+    result: asyncio.Future[T]
+    expires_at: float
+
+
+class IdempotencyStore(Generic[T]):
+    """Remembers the result of each idempotency key for ``ttl_seconds``.
+
+    The first request for a key runs the operation as its own task; repeats
+    and concurrent duplicates await that same task, so a client hanging up
+    does not cancel the work others are waiting for. Failed operations are
+    forgotten so the client can retry them. Keys are local to the process;
+    ``SqliteIdempotencyStore`` shares them between workers.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 24 * 60 * 60,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry[T]] = OrderedDict()
+
+    async def run(
+        self,
+        key: str,
+        fingerprint: str,
+        operation: Callable[[], Awaitable[T]],
+    ) -> tuple[T, bool]:
+        """Return the operation's result and whether it was replayed."""
+        now = self._clock()
+        self._sweep_expired(now)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyConflictError(
+                    "Idempotency-Key was already used with a different request"
+                )
+            return await asyncio.shield(entry.result), True
+
+        result = asyncio.ensure_future(operation())
+        entry = _Entry(fingerprint=fingerprint, result=result, expires_at=now + self._ttl_seconds)
+        self._entries[key] = entry
+        result.add_done_callback(lambda done: self._settle(key, entry))
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return await asyncio.shield(result), False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _sweep_expired(self, now: float) -> None:
+        # Entries are kept in insertion order and share one TTL, so expired
+        # ones are always at the front.
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.expires_at > now:
+                break
+            del self._entries[key]
+
+    def _settle(self, key: str, entry: _Entry[T]) -> None:
+        if entry.result.cancelled() or entry.result.exception() is not None:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+
+
+_CREATE_KEYS_TABLE = """
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    response BLOB,
+    claimed_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+_CREATE_KEYS_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idempotency_keys_by_expiry ON idempotency_keys (expires_at)"
+)
+_DELETE_EXPIRED = "DELETE FROM idempotency_keys WHERE expires_at <= ?"
+# A claim whose response never arrived belongs to a worker that died mid-request.
+_DELETE_ABANDONED = (
+    "DELETE FROM idempotency_keys WHERE key = ? AND response IS NULL AND claimed_at <= ?"
+)
+_CLAIM = (
+    "INSERT OR IGNORE INTO idempotency_keys (key, fingerprint, response, claimed_at, expires_at)"
+    " VALUES (?, ?, NULL, ?, ?)"
+)
+_SELECT_KEY = "SELECT fingerprint, response FROM idempotency_keys WHERE key = ?"
+_COMPLETE = "UPDATE idempotency_keys SET response = ? WHERE key = ?"
+_RELEASE = "DELETE FROM idempotency_keys WHERE key = ? AND response IS NULL"
+
+
+class SqliteIdempotencyStore(Generic[T]):
+    """Idempotency keys shared by every worker through a sqlite table.
+
+    The first worker to insert a key runs the operation and stores its
+    encoded result in the row; any worker that finds the row replays that
+    result, or polls until it appears while the first run is in flight.
+    Failed runs delete their row. A per-process ``IdempotencyStore`` in front
+    keeps concurrent duplicates within one worker on a single run.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        encode: Callable[[T], bytes],
+        decode: Callable[[bytes], T],
+        ttl_seconds: float = 24 * 60 * 60,
+        max_entries: int = 10_000,
+        abandoned_after_seconds: float = 60.0,
+        poll_interval_seconds: float = 0.05,
+        clock: Callable[[], float] = time.time,
+        busy_timeout_ms: int = 5000,
+    ) -> None:
+        self._local: IdempotencyStore[tuple[T, bool]] = IdempotencyStore(
+            ttl_seconds=ttl_seconds, max_entries=max_entries, clock=clock
+        )
+        self._path = path
+        self._encode = encode
+        self._decode = decode
+        self._ttl_seconds = ttl_seconds
+        self._abandoned_after_seconds = abandoned_after_seconds
+        self._poll_interval_seconds = poll_interval_seconds
+        # Wall-clock time, since rows are compared across processes.
+        self._clock = clock
+        self._busy_timeout_ms = busy_timeout_ms
+        self._connections = threading.local()
+        with self._connection() as connection:
+            connection.execute(_CREATE_KEYS_TABLE)
+            connection.execute(_CREATE_KEYS_INDEX)
+
+    async def run(
+        self,
+        key: str,
+        fingerprint: str,
+        operation: Callable[[], Awaitable[T]],
+    ) -> tuple[T, bool]:
+        """Return the operation's result and whether it was replayed."""
+        (result, replayed_shared), replayed_local = await self._local.run(
+            key, fingerprint, lambda: self._run_shared(key, fingerprint, operation)
+        )
+        return result, replayed_shared or replayed_local
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+    async def _run_shared(
+        self,
+        key: str,
+        fingerprint: str,
+        operation: Callable[[], Awaitable[T]],
+    ) -> tuple[T, bool]:
+        while True:
+            row = await asyncio.to_thread(self._claim, key, fingerprint)
+            if row is None:
+                break
+            stored_fingerprint, response = row
+            if stored_fingerprint != fingerprint:
+                raise IdempotencyConflictError(
+                    "Idempotency-Key was already used with a different request"
+                )
+            if response is not None:
+                return self._decode(response), True
+            await asyncio.sleep(self._poll_interval_seconds)
+
+        try:
+            result = await operation()
+        except BaseException:
+            await asyncio.to_thread(self._execute, _RELEASE, (key,))
+            raise
+        await asyncio.to_thread(self._execute, _COMPLETE, (self._encode(result), key))
+        return result, False
+
+    def _claim(self, key: str, fingerprint: str) -> tuple[str, bytes | None] | None:
+        """Insert the key, or return the row that already holds it."""
+        now = self._clock()
+        with self._connection() as connection:
+            connection.execute(_DELETE_EXPIRED, (now,))
+            connection.execute(_DELETE_ABANDONED, (key, now - self._abandoned_after_seconds))
+            claimed = connection.execute(
+                _CLAIM, (key, fingerprint, now, now + self._ttl_seconds)
+            ).rowcount
+            if claimed:
+                return None
+            return connection.execute(_SELECT_KEY, (key,)).fetchone()
+
+    def _execute(self, statement: str, parameters: tuple) -> None:
+        with self._connection() as connection:
+            connection.execute(statement, parameters)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._connections, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self._path, timeout=self._busy_timeout_ms / 1000, check_same_thread=False
+            )
+            connection.execute(f"PRAGMA busy_timeout = {int(self._busy_timeout_ms)}")
+            self._connections.connection = connection
+        return connection
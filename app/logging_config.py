@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Mapping, TextIO
+
+# Attributes every LogRecord has; anything else came in through ``extra``.
+_STANDARD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "asctime", "taskName"}
+
+
+class JsonLineFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRIBUTES and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, separators=(",", ":"), default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Thins out high-volume records below WARNING; never drops warnings.
+
+    ``sample_rates`` keeps a deterministic fraction of records per message,
+    and ``max_per_second`` caps how many records of any one message pass.
+    """
+
+    def __init__(
+        self,
+        sample_rates: Mapping[str, float] | None = None,
+        max_per_second: float = 0.0,
+    ) -> None:
+        super().__init__()
+        rates = dict(sample_rates or {})
+        self._sample_every = {
+            message: max(1, round(1 / rate)) for message, rate in rates.items() if rate > 0
+        }
+        self._muted = {message for message, rate in rates.items() if rate <= 0}
+        self._max_per_second = max_per_second
+        self._seen: dict[str, int] = {}
+        self._windows: dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        message = record.msg if isinstance(record.msg, str) else str(record.msg)
+        with self._lock:
+            keep = (
+                message not in self._muted
+                and self._sampled(message)
+                and self._within_rate(message)
+            )
+            if not keep:
+                self.dropped += 1
+        return keep
+
+    def _sampled(self, message: str) -> bool:
+        every = self._sample_every.get(message)
+        if every is None:
+            return True
+        seen = self._seen.get(message, 0)
+        self._seen[message] = seen + 1
+        return seen % every == 0
+
+    def _within_rate(self, message: str) -> bool:
+        if self._max_per_second <= 0:
+            return True
+        second = int(time.monotonic())
+        window, count = self._windows.get(message, (second, 0))
+        if window != second:
+            window, count = second, 0
+        if count >= self._max_per_second:
+            self._windows[message] = (window, count)
+            return False
+        self._windows[message] = (window, count + 1)
+        return True
+
+
+class EnqueueOnlyHandler(QueueHandler):
+    """QueueHandler that defers all formatting to the listener thread.
+
+    The stock handler formats every record before enqueueing it; here the
+    record is handed over untouched. When the queue is full, records below
+    WARNING are dropped and warnings wait for space.
+    """
+
+    def __init__(self, log_queue: queue.Queue[logging.LogRecord]) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno >= logging.WARNING:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_async_logging(
+    logger_name: str = "app",
+    level: int = logging.INFO,
+    sample_rates: Mapping[str, float] | None = None,
+    max_per_second: float = 0.0,
+    queue_size: int = 10_000,
+    stream: TextIO | None = None,
+) -> QueueListener:
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=queue_size)
+    output = logging.StreamHandler(sys.stderr if stream is None else stream)
+    output.setFormatter(JsonLineFormatter())
+
+    handler = EnqueueOnlyHandler(log_queue)
+    handler.addFilter(SamplingFilter(sample_rates, max_per_second))
+
+    logger = logging.getLogger(logger_name)
+    for existing in list(logger.handlers):
+        if isinstance(existing, EnqueueOnlyHandler):
+            logger.removeHandler(existing)
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+    listener = QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_listener, listener)
+    return listener
+
+
+def stop_listener(listener: QueueListener) -> None:
+    # QueueListener.stop() fails if called twice, e.g. by a lifespan hook and atexit.
+    if listener._thread is not None:
+        listener.stop()
+
+
+def stop_async_logging(listener: QueueListener, logger_name: str = "app") -> None:
+    """Flush and stop ``listener``, then return the logger to normal propagation."""
+    stop_listener(listener)
+    logger = logging.getLogger(logger_name)
+    for existing in list(logger.handlers):
+        if isinstance(existing, EnqueueOnlyHandler):
+            logger.removeHandler(existing)
+    logger.propagate = True
+
+
+def parse_sample_rates(raw: str) -> dict[str, float]:
+    """Parse ``"message=rate;message=rate"`` into a mapping."""
+    rates: dict[str, float] = {}
+    for part in raw.split(";"):
+        message, separator, rate = part.rpartition("=")
+        if separator and message.strip():
+            rates[message.strip()] = float(rate)
+    return rates
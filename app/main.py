@@ -1,56 +1,801 @@
+import asyncio
+import contextlib
+import gc
+import itertools
+import logging
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, Iterator, Literal
 from uuid import UUID
 
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
 
-from app.quiz.generator import DeterministicQuizGenerator
-from app.quiz.models import QuizGenerateRequest, QuizGenerateResponse
+from app.admission import AdaptiveLimit, AdmissionMiddleware, AdmissionQueue
+from app.http_cache import IMMUTABLE_CACHE_CONTROL, RepresentationCache, negotiate_encoding
+from app.idempotency import (
+    IdempotencyConflictError,
+    IdempotencyStore,
+    SqliteIdempotencyStore,
+    request_fingerprint,
+)
+from app.logging_config import configure_async_logging, parse_sample_rates, stop_async_logging
+from app.metrics import (
+    CONTENT_TYPE,
+    STAGE_LATENCY,
+    MetricsMiddleware,
+    MetricsRegistry,
+    registry,
+)
+from app.quiz.bank import InMemoryQuestionBank, MappedQuestionBank, QuestionBank
+from app.quiz.cache import QuizContentCache
+from app.quiz.executor import GenerationExecutor, GenerationTimeoutError
+from app.quiz.generator import (
+    CachingQuizGenerator,
+    DeterministicQuizGenerator,
+    QuizGenerator,
+    QuizSpec,
+)
+from app.quiz.grading import AnswerKey, AnswerKeyCache, SubmissionLengthError
+from app.quiz.instrumentation import InstrumentedQuizGenerator, InstrumentedQuizRepository
+from app.quiz.listing import InvalidCursorError
+from app.quiz.models import (
+    DEFAULT_LIST_LIMIT,
+    MAX_BATCH_TOTAL_QUESTIONS,
+    MAX_LIST_LIMIT,
+    QuizBatchGenerateRequest,
+    QuizBatchGenerateResponse,
+    QuizBatchItemError,
+    QuizBatchItemResult,
+    QuizBulkGradeItem,
+    QuizBulkGradeResponse,
+    QuizBulkSubmissionRequest,
+    QuizGenerateRequest,
+    QuizGenerateResponse,
+    QuizListResponse,
+    QuizQuestionGrade,
+    QuizSheetResponse,
+    QuizStreamRequest,
+    QuizSubmissionRequest,
+    QuizSubmissionResponse,
+    TopicStat,
+    TopicStatsResponse,
+    serialize_quiz,
+)
 from app.quiz.normalizer import normalize_topic
-from app.quiz.repo import InMemoryQuizRepository
+from app.quiz.remote import RemoteQuizGenerator
+from app.quiz.repo import (
+    BoundedInMemoryQuizRepository,
+    InMemoryQuizRepository,
+    QuizRepository,
+    SeedQuizRepository,
+)
 from app.quiz.service import QuizService
+from app.quiz.sqlite_repo import SqliteQuizRepository
+from app.quiz.stats import DecayingTopK, TopicKey, load_topic_snapshot, save_topic_snapshot
+from app.quiz.streaming import (
+    NDJSON_MEDIA_TYPE,
+    SSE_MEDIA_TYPE,
+    iter_quiz_stream,
+    negotiate_stream_format,
+)
+from app.settings import Settings
+from app.tracing import (
+    Tracer,
+    TracedRoute,
+    TracingMiddleware,
+    TracingSwitch,
+    checkpoint,
+    span,
+    span_since_route_entry,
+)
 
-app = FastAPI()
+# Never queued or shed, so probes and scrapes keep working under overload.
+ADMISSION_EXEMPT_PATHS = frozenset({"/health", "/ready", "/version", "/metrics"})
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://127.0.0.1:3000",
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-@app.get("/health")
+def classify_route(method: str, path: str) -> str | None:
+    if path in ADMISSION_EXEMPT_PATHS or path.startswith("/admin/"):
+        return None
+    if method == "POST" and path == "/api/v1/quizzes/generate:stream":
+        return "stream"
+    if method == "POST" and (
+        path.startswith("/api/v1/quizzes/generate") or path.endswith(":batch")
+    ):
+        return "heavy"
+    return "light"
+
+
+def build_admission_queues(settings: Settings) -> dict[str, AdmissionQueue]:
+    def queue(max_concurrency: int, target_latency: float) -> AdmissionQueue:
+        limit = AdaptiveLimit(
+            initial=max(1, max_concurrency // 2),
+            max_limit=max_concurrency,
+            target_latency=target_latency,
+        )
+        return AdmissionQueue(
+            limit,
+            max_queue=settings.admission_queue_size,
+            queue_timeout=settings.admission_queue_timeout_seconds,
+        )
+
+    return {
+        "heavy": queue(settings.admission_heavy_max_concurrency, target_latency=1.0),
+        "light": queue(settings.admission_light_max_concurrency, target_latency=0.1),
+        # Streams send their headers before generating, so their latency is
+        # always small and this limit settles at its maximum: a fixed cap that
+        # keeps long streams from taking the heavy class's slots.
+        "stream": queue(settings.admission_stream_max_concurrency, target_latency=1.0),
+    }
+
+
+# Question counts generated for each hot topic when prewarming; 5 is the
+# request default.
+PREWARM_QUESTION_COUNTS = (5, 10)
+QUIZ_DIFFICULTIES = ("easy", "medium", "hard")
+
+# Backends whose reads and writes block: sqlite waits on the database and the
+# seed backend regenerates quizzes. In-memory lookups stay on the event loop.
+BLOCKING_REPOSITORY_BACKENDS = frozenset({"sqlite", "seed"})
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AppServices:
+    settings: Settings
+    tracer: Tracer
+    quiz_generator: QuizGenerator
+    quiz_repository: InstrumentedQuizRepository
+    topic_stats: DecayingTopK[TopicKey]
+    quiz_service: QuizService
+    quiz_representations: RepresentationCache
+    quiz_sheet_representations: RepresentationCache
+    answer_keys: AnswerKeyCache
+    idempotent_generations: (
+        IdempotencyStore[QuizGenerateResponse] | SqliteIdempotencyStore[QuizGenerateResponse]
+    )
+    generation_executor: GenerationExecutor
+    # Gauges that read this app's objects; the module-level registry holds
+    # the process-wide counters and histograms.
+    metrics: MetricsRegistry
+    remote_generator: RemoteQuizGenerator | None = None
+    offload_repository: bool = False
+
+
+def build_repository(settings: Settings, generator: QuizGenerator) -> QuizRepository:
+    if settings.repository_backend == "bounded":
+        return BoundedInMemoryQuizRepository(
+            max_entries=settings.repository_max_entries,
+            max_bytes=settings.repository_max_bytes,
+            ttl_seconds=settings.repository_ttl_seconds,
+        )
+    if settings.repository_backend == "sqlite":
+        return SqliteQuizRepository(settings.sqlite_path)
+    if settings.repository_backend == "seed":
+        return SeedQuizRepository(generator)
+    return InMemoryQuizRepository()
+
+
+def build_idempotency_store(
+    settings: Settings,
+) -> IdempotencyStore[QuizGenerateResponse] | SqliteIdempotencyStore[QuizGenerateResponse]:
+    # Only a sqlite database is shared by every worker; other backends keep
+    # keys per process, and gunicorn.conf.py warns when that runs multi-worker.
+    if settings.repository_backend == "sqlite":
+        return SqliteIdempotencyStore(
+            settings.sqlite_path,
+            encode=serialize_quiz,
+            decode=QuizGenerateResponse.model_validate_json,
+            ttl_seconds=settings.idempotency_ttl_seconds,
+            max_entries=settings.idempotency_max_keys,
+            abandoned_after_seconds=settings.generation_timeout_seconds + 60,
+        )
+    return IdempotencyStore(
+        ttl_seconds=settings.idempotency_ttl_seconds,
+        max_entries=settings.idempotency_max_keys,
+    )
+
+
+def build_question_bank(settings: Settings) -> QuestionBank:
+    if settings.question_bank_path:
+        return MappedQuestionBank(settings.question_bank_path)
+    return InMemoryQuestionBank.default()
+
+
+def build_generator(settings: Settings, local: QuizGenerator) -> QuizGenerator:
+    if settings.generator_backend == "remote":
+        return RemoteQuizGenerator(
+            settings.remote_generator_url,
+            fallback=local,
+            timeout_seconds=settings.remote_generator_timeout_seconds,
+            max_concurrency=settings.remote_generator_max_concurrency,
+        )
+    return local
+
+
+def precompute_specs(
+    settings: Settings, bank: QuestionBank, topic_stats: DecayingTopK[TopicKey]
+) -> list[QuizSpec]:
+    """Hot topics from the last snapshot first, then bank topics, up to the configured cap."""
+    hot_topics = (hitter.key[0] for hitter in topic_stats.top(topic_stats.capacity))
+    topics = itertools.islice(
+        _unique(itertools.chain(hot_topics, bank.topics())), settings.precompute_max_topics
+    )
+    return [
+        (topic, difficulty, num_questions)
+        for topic in topics
+        for difficulty in QUIZ_DIFFICULTIES
+        for num_questions in PREWARM_QUESTION_COUNTS
+    ]
+
+
+def _unique(items: Iterable[str]) -> Iterator[str]:
+    seen: set[str] = set()
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            yield item
+
+
+def build_services(settings: Settings) -> AppServices:
+    topic_stats: DecayingTopK[TopicKey] = DecayingTopK(
+        capacity=settings.topic_stats_capacity,
+        half_life_seconds=settings.topic_stats_half_life_seconds,
+    )
+    if settings.topic_stats_path:
+        load_topic_snapshot(settings.topic_stats_path, topic_stats)
+
+    bank = build_question_bank(settings)
+    local = DeterministicQuizGenerator(bank, engine=settings.generation_engine)
+    if settings.precompute_max_topics > 0:
+        local.precompute(precompute_specs(settings, bank, topic_stats))
+
+    generator = build_generator(settings, local)
+    quiz_generator = InstrumentedQuizGenerator(CachingQuizGenerator(generator, QuizContentCache()))
+    repository = build_repository(settings, quiz_generator)
+    quiz_repository = InstrumentedQuizRepository(repository)
+    # Only the bounded repository drops quizzes, so only it needs checking on cache hits.
+    is_live = (
+        repository.contains if isinstance(repository, BoundedInMemoryQuizRepository) else None
+    )
+    # Remote generations hold a pool thread while they wait on the network, so
+    # a pool smaller than the remote concurrency limit would be the real cap.
+    generation_workers = settings.generation_workers
+    if settings.generator_backend == "remote":
+        generation_workers = max(generation_workers, settings.remote_generator_max_concurrency)
+    generation_executor = GenerationExecutor(
+        quiz_generator,
+        max_workers=generation_workers,
+        timeout_seconds=settings.generation_timeout_seconds,
+    )
+
+    metrics = MetricsRegistry(name="app-metrics")
+    if settings.metrics_dir:
+        metrics.enable_multiprocess(settings.metrics_dir)
+    # A shared sqlite file reports the same size from every worker; counting it
+    # is a table scan, so the gauge reads a periodically refreshed count.
+    if isinstance(repository, SqliteQuizRepository):
+        count_quizzes = repository.cached_len
+    else:
+        count_quizzes = quiz_repository.__len__
+    metrics.gauge(
+        "examifyr_repository_quizzes",
+        "Quizzes currently stored in the repository.",
+        multiprocess_mode="max" if settings.repository_backend == "sqlite" else "sum",
+    ).set_function(count_quizzes)
+    metrics.gauge(
+        "examifyr_generations_in_flight",
+        "Distinct quiz generations currently running.",
+    ).set_function(lambda: generation_executor.in_flight)
+
+    return AppServices(
+        settings=settings,
+        tracer=Tracer(
+            enabled=settings.tracing_enabled,
+            admin_token=settings.admin_token,
+            max_traces=settings.trace_buffer_size,
+        ),
+        quiz_generator=quiz_generator,
+        quiz_repository=quiz_repository,
+        topic_stats=topic_stats,
+        quiz_service=QuizService(
+            generator=quiz_generator,
+            repository=quiz_repository,
+            topic_stats=topic_stats,
+        ),
+        quiz_representations=RepresentationCache(is_live=is_live),
+        quiz_sheet_representations=RepresentationCache(is_live=is_live),
+        answer_keys=AnswerKeyCache(is_live=is_live),
+        idempotent_generations=build_idempotency_store(settings),
+        generation_executor=generation_executor,
+        metrics=metrics,
+        remote_generator=generator if isinstance(generator, RemoteQuizGenerator) else None,
+        offload_repository=settings.repository_backend in BLOCKING_REPOSITORY_BACKENDS,
+    )
+
+
+def prewarm_hot_topics(services: AppServices) -> int:
+    """Fill generator and bank caches for the currently hottest topics."""
+    settings, topic_stats = services.settings, services.topic_stats
+    specs = [
+        (*hitter.key, num_questions)
+        for hitter in topic_stats.top(settings.prewarm_top_topics)
+        for num_questions in PREWARM_QUESTION_COUNTS
+    ]
+    warmed = services.quiz_service.prewarm(specs)
+    if settings.topic_stats_path:
+        save_topic_snapshot(settings.topic_stats_path, topic_stats.top(topic_stats.capacity))
+    return warmed
+
+
+async def _prewarm(services: AppServices) -> None:
+    try:
+        await run_in_threadpool(prewarm_hot_topics, services)
+    except Exception:
+        # A cold cache is slower, not broken; keep serving and try again later.
+        logger.exception("Prewarm failed")
+
+
+async def _warm_up(app: FastAPI) -> None:
+    services: AppServices = app.state.services
+    if services.settings.prewarm_top_topics <= 0:
+        app.state.ready = True
+        return
+    await _prewarm(services)
+    app.state.ready = True
+    while True:
+        await asyncio.sleep(services.settings.prewarm_interval_seconds)
+        await _prewarm(services)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Runs in each worker after the fork; /ready turns true once warm-up ends.
+    services: AppServices = app.state.services
+    settings, topic_stats = services.settings, services.topic_stats
+    # Threads do not survive a fork, so the log writer starts here rather
+    # than in create_app.
+    log_listener = None
+    if settings.log_mode == "async":
+        log_listener = configure_async_logging(
+            sample_rates=parse_sample_rates(settings.log_sample_rates),
+            max_per_second=settings.log_max_per_second,
+        )
+    for metrics_registry in (registry, services.metrics):
+        metrics_registry.start_flushing()
+    warm_up_task = asyncio.create_task(_warm_up(app))
+    try:
+        yield
+    finally:
+        try:
+            app.state.ready = False
+            warm_up_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await warm_up_task
+            services.generation_executor.shutdown()
+            if services.remote_generator is not None:
+                services.remote_generator.close()
+            if settings.topic_stats_path:
+                try:
+                    save_topic_snapshot(
+                        settings.topic_stats_path, topic_stats.top(topic_stats.capacity)
+                    )
+                except Exception:
+                    logger.exception("Saving the topic snapshot failed")
+            for metrics_registry in (registry, services.metrics):
+                try:
+                    metrics_registry.stop_flushing()
+                except Exception:
+                    logger.exception("Writing the final metrics snapshot failed")
+        finally:
+            # Last, so records logged during shutdown are still flushed.
+            if log_listener is not None:
+                stop_async_logging(log_listener)
+
+
+def create_app(settings: Settings | None = None) -> FastAPI:
+    """Build the app and everything it serves from ``settings``.
+
+    All expensive setup happens here rather than in the lifespan, so under
+    ``gunicorn --preload`` it runs once in the master and workers share the
+    result copy-on-write.
+    """
+    settings = Settings.from_env() if settings is None else settings
+    if settings.metrics_dir:
+        registry.enable_multiprocess(settings.metrics_dir)
+
+    services = build_services(settings)
+    app = FastAPI(lifespan=lifespan)
+    app.state.services = services
+    app.state.ready = False
+
+    if settings.admission_enabled:
+        app.add_middleware(
+            AdmissionMiddleware,
+            queues=build_admission_queues(settings),
+            classify=classify_route,
+            metrics=services.metrics,
+        )
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            "http://localhost:3000",
+            "http://127.0.0.1:3000",
+        ],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(MetricsMiddleware)
+    app.add_middleware(TracingMiddleware, tracer=services.tracer)
+    app.include_router(router)
+    return app
+
+
+async def _run_repository_call(services: AppServices, func, *args, **kwargs):
+    """Run a call that touches the repository, off the loop when it can block."""
+    if services.offload_repository:
+        return await run_in_threadpool(func, *args, **kwargs)
+    return func(*args, **kwargs)
+
+
+# async so FastAPI resolves it on the loop instead of hopping to the threadpool.
+async def get_services(request: Request) -> AppServices:
+    return request.app.state.services
+
+
+router = APIRouter(route_class=TracedRoute)
+
+
+@router.get("/health")
 def health():
     return {"status": "ok"}
 
 
-@app.get("/version")
+@router.get("/ready")
+def ready(request: Request):
+    if not request.app.state.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready"}
+
+
+@router.get("/version")
 def version():
     return {"service": "examifyr-backend", "version": "0.1.0"}
 
 
-quiz_service = QuizService(
-    generator=DeterministicQuizGenerator(),
-    repository=InMemoryQuizRepository(),
-)
+@router.get("/metrics", include_in_schema=False)
+def metrics(services: AppServices = Depends(get_services)):
+    return Response(
+        content=registry.render() + services.metrics.render(), media_type=CONTENT_TYPE
+    )
 
 
-@app.post("/api/v1/quizzes/generate", response_model=QuizGenerateResponse)
-async def generate_quiz(payload: QuizGenerateRequest):
-    normalized_topic = normalize_topic(payload.topic)
-    return quiz_service.generate_quiz(
+def _require_admin(tracer: Tracer, admin_token: str | None) -> None:
+    if tracer.admin_token is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not tracer.is_admin(admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.get("/admin/traces", include_in_schema=False)
+def list_traces(
+    x_admin_token: str | None = Header(default=None),
+    services: AppServices = Depends(get_services),
+):
+    tracer = services.tracer
+    _require_admin(tracer, x_admin_token)
+    return {
+        "enabled": tracer.enabled,
+        "traces": [trace.as_dict() for trace in tracer.store.slowest()],
+    }
+
+
+@router.get("/admin/traces/{trace_id}", include_in_schema=False)
+def get_trace(
+    trace_id: str,
+    x_admin_token: str | None = Header(default=None),
+    services: AppServices = Depends(get_services),
+):
+    _require_admin(services.tracer, x_admin_token)
+    trace = services.tracer.store.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return trace.as_dict()
+
+
+@router.put("/admin/tracing", include_in_schema=False)
+def switch_tracing(
+    payload: TracingSwitch,
+    x_admin_token: str | None = Header(default=None),
+    services: AppServices = Depends(get_services),
+):
+    tracer = services.tracer
+    _require_admin(tracer, x_admin_token)
+    tracer.enabled = payload.enabled
+    if payload.clear:
+        tracer.store.clear()
+    return {"enabled": tracer.enabled}
+
+
+@router.post("/api/v1/quizzes/generate", response_model=QuizGenerateResponse)
+async def generate_quiz(
+    payload: QuizGenerateRequest,
+    response: Response,
+    idempotency_key: str | None = Header(default=None, min_length=1, max_length=255),
+    services: AppServices = Depends(get_services),
+):
+    span_since_route_entry("validation")
+    if idempotency_key is None:
+        quiz = await _generate_quiz(services, payload)
+        checkpoint()
+        return quiz
+    try:
+        quiz, replayed = await services.idempotent_generations.run(
+            idempotency_key,
+            request_fingerprint(payload.model_dump_json()),
+            lambda: _generate_quiz(services, payload),
+        )
+    except IdempotencyConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    checkpoint()
+    return quiz
+
+
+async def _generate_quiz(
+    services: AppServices, payload: QuizGenerateRequest
+) -> QuizGenerateResponse:
+    with STAGE_LATENCY.time("normalize_topic"), span("normalize_topic"):
+        normalized_topic = normalize_topic(payload.topic)
+    try:
+        with span("generate"):
+            questions = await services.generation_executor.generate(
+                normalized_topic,
+                payload.difficulty,
+                payload.num_questions,
+            )
+    except GenerationTimeoutError:
+        raise HTTPException(status_code=504, detail="Quiz generation timed out")
+    return await _run_repository_call(
+        services,
+        services.quiz_service.generate_quiz,
         normalized_topic,
         payload.difficulty,
         payload.num_questions,
+        questions=questions,
+    )
+
+
+@router.post("/api/v1/quizzes/generate:stream")
+async def generate_quiz_stream(
+    payload: QuizStreamRequest,
+    accept: str | None = Header(default=None),
+    services: AppServices = Depends(get_services),
+):
+    stream_format = negotiate_stream_format(accept)
+    normalized_topic = normalize_topic(payload.topic)
+    services.quiz_service.record_topic(normalized_topic, payload.difficulty)
+    return StreamingResponse(
+        iter_quiz_stream(
+            services.quiz_generator,
+            normalized_topic,
+            payload.difficulty,
+            payload.num_questions,
+            stream_format,
+        ),
+        media_type=SSE_MEDIA_TYPE if stream_format == "sse" else NDJSON_MEDIA_TYPE,
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+@router.post("/api/v1/quizzes/generate:batch", response_model=QuizBatchGenerateResponse)
+async def generate_quiz_batch(
+    payload: QuizBatchGenerateRequest,
+    services: AppServices = Depends(get_services),
+):
+    results: list[QuizBatchItemResult | None] = []
+    specs: list[tuple[str, str, int]] = []
+    for index, item in enumerate(payload.items):
+        try:
+            request = QuizGenerateRequest.model_validate(item)
+        except ValidationError as exc:
+            results.append(
+                QuizBatchItemResult(
+                    index=index,
+                    status="error",
+                    error=QuizBatchItemError(
+                        message="Invalid quiz request",
+                        details=exc.errors(include_url=False, include_context=False),
+                    ),
+                )
+            )
+            continue
+        results.append(None)
+        specs.append((normalize_topic(request.topic), request.difficulty, request.num_questions))
+
+    total_questions = sum(num_questions for _, _, num_questions in specs)
+    if total_questions > MAX_BATCH_TOTAL_QUESTIONS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Batch requests at most {MAX_BATCH_TOTAL_QUESTIONS} questions in total",
+        )
+
+    quizzes = iter(await run_in_threadpool(services.quiz_service.generate_quizzes, specs))
+    for index, result in enumerate(results):
+        if result is not None:
+            continue
+        quiz = next(quizzes)
+        if quiz is None:
+            results[index] = QuizBatchItemResult(
+                index=index,
+                status="error",
+                error=QuizBatchItemError(message="Quiz generation failed"),
+            )
+        else:
+            results[index] = QuizBatchItemResult(index=index, status="ok", quiz=quiz)
+    return QuizBatchGenerateResponse(results=results)
+
+
+@router.get("/api/v1/stats/topics", response_model=TopicStatsResponse)
+async def topic_statistics(
+    limit: int = Query(default=10, ge=1, le=100),
+    services: AppServices = Depends(get_services),
+):
+    return TopicStatsResponse(
+        half_life_seconds=services.topic_stats.half_life_seconds,
+        capacity=services.topic_stats.capacity,
+        topics=[
+            TopicStat(
+                topic=hitter.key[0],
+                difficulty=hitter.key[1],
+                count=round(hitter.count, 3),
+                error=round(hitter.error, 3),
+            )
+            for hitter in services.topic_stats.top(limit)
+        ],
     )
 
 
-@app.get("/api/v1/quizzes/{quiz_id}", response_model=QuizGenerateResponse)
-async def get_quiz(quiz_id: UUID):
-    quiz = quiz_service.get_quiz(quiz_id)
-    if quiz is None:
+@router.get("/api/v1/quizzes", response_model=QuizListResponse)
+async def list_quizzes(
+    topic: str | None = Query(default=None, min_length=1, max_length=120),
+    difficulty: Literal["easy", "medium", "hard"] | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=DEFAULT_LIST_LIMIT, ge=1, le=MAX_LIST_LIMIT),
+    services: AppServices = Depends(get_services),
+):
+    normalized_topic = None if topic is None else normalize_topic(topic)
+    try:
+        return await run_in_threadpool(
+            services.quiz_service.list_quizzes, normalized_topic, difficulty, limit, cursor
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# The stored payload is already serialized; responses only documents it.
+@router.get(
+    "/api/v1/quizzes/{quiz_id}",
+    responses={
+        200: {
+            "model": QuizGenerateResponse | QuizSheetResponse,
+            "description": "The quiz; a QuizSheetResponse when include_answers is false",
+        }
+    },
+)
+async def get_quiz(
+    quiz_id: UUID,
+    include_answers: bool = True,
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+    services: AppServices = Depends(get_services),
+):
+    if include_answers:
+        cache, loader = services.quiz_representations, services.quiz_service.get_quiz_json
+    else:
+        cache, loader = (
+            services.quiz_sheet_representations,
+            services.quiz_service.get_quiz_sheet_json,
+        )
+    representation = cache.get(quiz_id)
+    if representation is None:
+        representation = await _run_repository_call(services, cache.get_or_load, quiz_id, loader)
+    if representation is None:
         raise HTTPException(status_code=404, detail="Quiz not found")
-    return quiz
+
+    encoding = negotiate_encoding(accept_encoding)
+    body, content_encoding = representation.encoded(encoding)
+    headers = {
+        "ETag": representation.variant_etag(content_encoding),
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if representation.matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+    if content_encoding is not None:
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _load_answer_key(services: AppServices, quiz_id: UUID) -> AnswerKey:
+    key = services.answer_keys.get(quiz_id)
+    if key is None:
+        key = await _run_repository_call(
+            services, services.answer_keys.get_or_load, quiz_id, services.quiz_service.get_quiz
+        )
+    if key is None:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+    return key
+
+
+@router.post("/api/v1/quizzes/{quiz_id}/submissions", response_model=QuizSubmissionResponse)
+async def submit_quiz(
+    quiz_id: UUID,
+    payload: QuizSubmissionRequest,
+    services: AppServices = Depends(get_services),
+):
+    key = await _load_answer_key(services, quiz_id)
+    try:
+        correct = key.grade(payload.answers)
+    except SubmissionLengthError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return QuizSubmissionResponse(
+        quiz_id=quiz_id,
+        score=correct.count(1),
+        total=len(key),
+        questions=[
+            QuizQuestionGrade(
+                id=index + 1,
+                correct=bool(correct[index]),
+                submitted_index=payload.answers[index],
+                answer_index=key.answers[index],
+                explanation=key.explanations[index],
+            )
+            for index in range(len(key))
+        ],
+    )
+
+
+@router.post(
+    "/api/v1/quizzes/{quiz_id}/submissions:batch",
+    response_model=QuizBulkGradeResponse,
+)
+async def submit_quiz_batch(
+    quiz_id: UUID,
+    payload: QuizBulkSubmissionRequest,
+    services: AppServices = Depends(get_services),
+):
+    key = await _load_answer_key(services, quiz_id)
+    try:
+        graded = await run_in_threadpool(
+            key.grade_many, [submission.answers for submission in payload.submissions]
+        )
+    except SubmissionLengthError as exc:
+        raise HTTPException(status_code=422, detail=f"Submission {exc.index}: {exc}")
+    return QuizBulkGradeResponse(
+        quiz_id=quiz_id,
+        total=len(key),
+        answer_indexes=list(key.answers),
+        explanations=list(key.explanations),
+        results=[
+            QuizBulkGradeItem(
+                index=index,
+                score=correct.count(1),
+                correct=[bool(flag) for flag in correct],
+            )
+            for index, correct in enumerate(graded)
+        ],
+    )
+
+
+app = create_app()
+# Runs once per process, at import: under ``gunicorn --preload`` that is the
+# master before it forks. Everything built so far lives as long as the
+# process, and freezing it keeps the collector from writing to those objects
+# and so from un-sharing the pages of forked workers.
+gc.freeze()
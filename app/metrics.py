@@ -0,0 +1,416 @@
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Literal, Sequence, TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# How a gauge is combined across worker processes in multiprocess mode.
+GaugeMode = Literal["sum", "max"]
+
+LabelValues = tuple[str, ...]
+
+logger = logging.getLogger(__name__)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Sequence[str]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(label) for label in labels)
+
+
+MetricT = TypeVar("MetricT", bound=_Metric)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def snapshot(self) -> dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        multiprocess_mode: GaugeMode = "sum",
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.multiprocess_mode = multiprocess_mode
+        self._values: dict[LabelValues, float] = {}
+        self._functions: dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set_function(self, function: Callable[[], float], *labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = function
+
+    def snapshot(self) -> dict[LabelValues, float]:
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, function in functions.items():
+            values[key] = float(function())
+        return values
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: one count per bucket plus an overflow slot, then sum.
+        self._values: dict[LabelValues, list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def snapshot(self) -> dict[LabelValues, list[float]]:
+        with self._lock:
+            return {key: list(series) for key, series in self._values.items()}
+
+
+class MetricsRegistry:
+    """Holds the process's metrics and renders them in Prometheus text format.
+
+    In multiprocess mode every worker periodically writes its snapshot to a
+    shared directory and a scrape merges all of them, so whichever worker
+    answers ``/metrics`` reports totals for the whole node. Snapshots are
+    written by a background thread (``start_flushing``), never on the
+    request path. ``name`` prefixes the snapshot files, so registries that
+    share a directory keep separate snapshots.
+    """
+
+    def __init__(self, name: str = "metrics") -> None:
+        self._name = name
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._directory: Path | None = None
+        self._flush_interval = 0.0
+        self._flush_stop: threading.Event | None = None
+        self._flush_thread: threading.Thread | None = None
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        multiprocess_mode: GaugeMode = "sum",
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, multiprocess_mode))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def enable_multiprocess(
+        self,
+        directory: str | os.PathLike[str],
+        flush_interval: float = 5.0,
+    ) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._flush_interval = flush_interval
+
+    def start_flushing(self) -> None:
+        """Write this process's snapshot every ``flush_interval`` from a thread.
+
+        Threads do not survive a fork, so each worker starts its own.
+        """
+        if self._directory is None or self._flush_thread is not None:
+            return
+        stop = threading.Event()
+        self._flush_stop = stop
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, args=(stop,), name="metrics-flush", daemon=True
+        )
+        self._flush_thread.start()
+
+    def stop_flushing(self) -> None:
+        """Stop the flush thread and write one last snapshot."""
+        if self._flush_thread is None:
+            return
+        self._flush_stop.set()
+        self._flush_thread.join()
+        self._flush_stop = self._flush_thread = None
+        self.flush()
+
+    def _flush_loop(self, stop: threading.Event) -> None:
+        while not stop.wait(self._flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Writing the metrics snapshot failed")
+
+    def flush(self) -> None:
+        if self._directory is None:
+            return
+        pid = os.getpid()
+        target = self._directory / f"{self._name}-{pid}.json"
+        temporary = self._directory / f".{self._name}-{pid}.json.tmp"
+        temporary.write_text(json.dumps(self._export()), encoding="utf-8")
+        os.replace(temporary, target)
+
+    def render(self) -> str:
+        if self._directory is None:
+            merged = {
+                name: {"pids": [0], "series": [series]}
+                for name, series in self._export().items()
+            }
+        else:
+            self.flush()
+            merged = self._collect_directory()
+
+        lines: list[str] = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(self._render_metric(metric, merged.get(name)))
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: MetricT) -> MetricT:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def _export(self) -> dict[str, list[list]]:
+        return {
+            name: [[list(key), value] for key, value in metric.snapshot().items()]
+            for name, metric in self._metrics.items()
+        }
+
+    def _collect_directory(self) -> dict[str, dict[str, list]]:
+        merged: dict[str, dict[str, list]] = {}
+        for path in sorted(self._directory.glob(f"{self._name}-*.json")):
+            try:
+                pid = int(path.stem[len(self._name) + 1 :])
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (ValueError, OSError):
+                continue
+            for name, series in data.items():
+                entry = merged.setdefault(name, {"pids": [], "series": []})
+                entry["pids"].append(pid)
+                entry["series"].append(series)
+        return merged
+
+    def _render_metric(self, metric: _Metric, collected: dict[str, list] | None) -> list[str]:
+        if not collected:
+            return []
+        combined: dict[LabelValues, float | list[float]] = {}
+        for pid, series in zip(collected["pids"], collected["series"]):
+            # Counters and histograms from exited workers still count towards
+            # the totals; gauges only describe live processes.
+            if isinstance(metric, Gauge) and pid and not _pid_alive(pid):
+                continue
+            for labels, value in series:
+                key = tuple(labels)
+                current = combined.get(key)
+                if current is None:
+                    combined[key] = list(value) if isinstance(value, list) else value
+                elif isinstance(metric, Histogram):
+                    combined[key] = [a + b for a, b in zip(current, value)]
+                elif isinstance(metric, Gauge) and metric.multiprocess_mode == "max":
+                    combined[key] = max(current, value)
+                else:
+                    combined[key] = current + value
+
+        lines = []
+        for key in sorted(combined):
+            labels = _format_labels(metric.labelnames, key)
+            value = combined[key]
+            if isinstance(metric, Histogram):
+                lines.extend(self._render_histogram(metric, key, value))
+            else:
+                lines.append(f"{metric.name}{labels} {_format_value(value)}")
+        return lines
+
+    @staticmethod
+    def _render_histogram(metric: Histogram, key: LabelValues, series: list[float]) -> list[str]:
+        lines = []
+        cumulative = 0.0
+        bounds = [*metric.buckets, math.inf]
+        for bound, count in zip(bounds, series[:-1]):
+            cumulative += count
+            labels = _format_labels(
+                (*metric.labelnames, "le"), (*key, _format_value(bound))
+            )
+            lines.append(f"{metric.name}_bucket{labels} {_format_value(cumulative)}")
+        labels = _format_labels(metric.labelnames, key)
+        lines.append(f"{metric.name}_sum{labels} {_format_value(series[-1])}")
+        lines.append(f"{metric.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+
+def wipe_multiprocess_directory(directory: str | os.PathLike[str]) -> None:
+    """Delete every worker snapshot, as the process manager starts.
+
+    Snapshots from a previous run would otherwise keep adding their counters
+    to the totals. Call this once, before any worker starts: wiping while
+    workers run loses their counts.
+    """
+    path = Path(directory)
+    for pattern in ("*metrics-*.json", ".*metrics-*.json.tmp"):
+        for snapshot in path.glob(pattern):
+            snapshot.unlink(missing_ok=True)
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.histogram(
+    "examifyr_http_request_duration_seconds",
+    "HTTP request latency by route template, method and status.",
+    ("route", "method", "status"),
+)
+REQUESTS_IN_FLIGHT = registry.gauge(
+    "examifyr_http_requests_in_flight",
+    "HTTP requests currently being served.",
+)
+STAGE_LATENCY = registry.histogram(
+    "examifyr_stage_duration_seconds",
+    "Latency of individual request stages such as normalization, generation and persistence.",
+    ("stage",),
+)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", "unmatched")
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - started, template, scope["method"], str(status)
+            )
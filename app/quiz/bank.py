@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Protocol, Sequence
+
+DEFAULT_BANK_PATH = Path(__file__).parent / "banks" / "default.json"
+
+# Compiled bank layout (all integers little-endian):
+#   header       magic, format version, topic count, string count, section
+#                offsets and the sha256 fingerprint of the bank content
+#   topic table  (name string id u32, item count u32, items offset u64) per
+#                topic, sorted by the UTF-8 bytes of the name
+#   items        (question u32, correct u32, explanation u32,
+#                distractor count u32, distractor ids u32...) per item
+#   string index (string count + 1) u64 offsets into the string data
+#   string data  deduplicated UTF-8 strings
+MAGIC = b"EXQB"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHIIQQQ32s")
+_TOPIC_ENTRY = struct.Struct("<IIQ")
+_ITEM_HEAD = struct.Struct("<IIII")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+
+@dataclass(frozen=True)
+class QuestionBankItem:
+    question: str
+    correct: str
+    distractors: list[str]
+    explanation: str
+
+
+class QuestionBank(Protocol):
+    @property
+    def fingerprint(self) -> str:
+        ...
+
+    def get(self, topic: str) -> Sequence[QuestionBankItem] | None:
+        ...
+
+    def topics(self) -> Iterable[str]:
+        ...
+
+
+class BankFormatError(ValueError):
+    pass
+
+
+def bank_fingerprint(bank: Mapping[str, Sequence[QuestionBankItem]]) -> str:
+    digest = hashlib.sha256()
+    for topic in sorted(bank):
+        digest.update(topic.encode("utf-8"))
+        for item in bank[topic]:
+            for text in (item.question, item.correct, *item.distractors, item.explanation):
+                digest.update(b"\x00" + text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_bank_source(path: str | os.PathLike[str]) -> dict[str, list[QuestionBankItem]]:
+    source_path = Path(path)
+    text = source_path.read_text(encoding="utf-8")
+    if source_path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as exc:
+            raise BankFormatError("PyYAML is required to read YAML question banks") from exc
+        raw = yaml.safe_load(text)
+    else:
+        raw = json.loads(text)
+
+    if not isinstance(raw, dict):
+        raise BankFormatError("question bank source must map topics to item lists")
+    bank: dict[str, list[QuestionBankItem]] = {}
+    for topic, items in raw.items():
+        try:
+            bank[str(topic)] = [
+                QuestionBankItem(
+                    question=item["question"],
+                    correct=item["correct"],
+                    distractors=list(item["distractors"]),
+                    explanation=item["explanation"],
+                )
+                for item in items
+            ]
+        except (KeyError, TypeError) as exc:
+            raise BankFormatError(f"invalid item for topic {topic!r}: {exc}") from exc
+    return bank
+
+
+class InMemoryQuestionBank:
+    def __init__(self, items: Mapping[str, Sequence[QuestionBankItem]]) -> None:
+        self._items = {topic: tuple(topic_items) for topic, topic_items in items.items()}
+        self._fingerprint = bank_fingerprint(self._items)
+
+    @classmethod
+    def default(cls) -> InMemoryQuestionBank:
+        return cls(load_bank_source(DEFAULT_BANK_PATH))
+
+    @property
+    def fingerprint(self) -> str:
+        return self._fingerprint
+
+    def get(self, topic: str) -> Sequence[QuestionBankItem] | None:
+        return self._items.get(topic)
+
+    def topics(self) -> Iterable[str]:
+        return iter(self._items)
+
+
+def compile_bank(
+    bank: Mapping[str, Sequence[QuestionBankItem]],
+    path: str | os.PathLike[str],
+) -> None:
+    strings: dict[str, int] = {}
+
+    def intern(text: str) -> int:
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    topics = sorted(bank, key=lambda topic: topic.encode("utf-8"))
+    topic_names = [intern(topic) for topic in topics]
+
+    items_offset = _HEADER.size + _TOPIC_ENTRY.size * len(topics)
+    topic_table = bytearray()
+    items = bytearray()
+    for topic, name_id in zip(topics, topic_names):
+        topic_items = bank[topic]
+        topic_table += _TOPIC_ENTRY.pack(name_id, len(topic_items), items_offset + len(items))
+        for item in topic_items:
+            items += _ITEM_HEAD.pack(
+                intern(item.question),
+                intern(item.correct),
+                intern(item.explanation),
+                len(item.distractors),
+            )
+            for distractor in item.distractors:
+                items += _U32.pack(intern(distractor))
+
+    string_index_offset = items_offset + len(items)
+    string_index = bytearray()
+    string_data = bytearray()
+    for text in strings:
+        string_index += _U64.pack(len(string_data))
+        string_data += text.encode("utf-8")
+    string_index += _U64.pack(len(string_data))
+    string_data_offset = string_index_offset + len(string_index)
+
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        0,
+        len(topics),
+        len(strings),
+        _HEADER.size,
+        string_index_offset,
+        string_data_offset,
+        bytes.fromhex(bank_fingerprint(bank)),
+    )
+    target = Path(path)
+    temporary = target.with_name(target.name + ".tmp")
+    temporary.write_bytes(header + topic_table + items + string_index + string_data)
+    os.replace(temporary, target)
+
+
+class MappedQuestionBank:
+    """Read-only view of a compiled bank file.
+
+    The file is memory-mapped, so worker processes share its pages through the
+    OS cache. Opening only parses the fixed-size header; a topic's items are
+    decoded the first time that topic is requested and then kept.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        with open(path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size < _HEADER.size:
+                raise BankFormatError(f"{path} is not a compiled question bank")
+            self._buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            format_version,
+            _,
+            self._topic_count,
+            self._string_count,
+            self._topic_table_offset,
+            self._string_index_offset,
+            self._string_data_offset,
+            fingerprint,
+        ) = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            self._buffer.close()
+            raise BankFormatError(f"{path} is not a compiled question bank")
+        self._fingerprint = fingerprint.hex()
+        self._decoded: dict[str, tuple[QuestionBankItem, ...]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def fingerprint(self) -> str:
+        return self._fingerprint
+
+    def get(self, topic: str) -> Sequence[QuestionBankItem] | None:
+        items = self._decoded.get(topic)
+        if items is not None:
+            return items
+        entry = self._find_topic(topic.encode("utf-8"))
+        if entry is None:
+            return None
+        with self._lock:
+            items = self._decoded.get(topic)
+            if items is None:
+                items = self._decoded[topic] = self._decode_items(*entry)
+        return items
+
+    def topics(self) -> Iterator[str]:
+        for position in range(self._topic_count):
+            name_id, _, _ = self._topic_entry(position)
+            yield self._string(name_id)
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def _topic_entry(self, position: int) -> tuple[int, int, int]:
+        offset = self._topic_table_offset + position * _TOPIC_ENTRY.size
+        return _TOPIC_ENTRY.unpack_from(self._buffer, offset)
+
+    def _find_topic(self, name: bytes) -> tuple[int, int] | None:
+        low, high = 0, self._topic_count
+        while low < high:
+            middle = (low + high) // 2
+            name_id, item_count, items_offset = self._topic_entry(middle)
+            candidate = self._string_bytes(name_id)
+            if candidate == name:
+                return item_count, items_offset
+            if candidate < name:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _decode_items(self, item_count: int, offset: int) -> tuple[QuestionBankItem, ...]:
+        items = []
+        for _ in range(item_count):
+            question, correct, explanation, distractor_count = _ITEM_HEAD.unpack_from(
+                self._buffer, offset
+            )
+            offset += _ITEM_HEAD.size
+            distractors = struct.unpack_from(f"<{distractor_count}I", self._buffer, offset)
+            offset += _U32.size * distractor_count
+            items.append(
+                QuestionBankItem(
+                    question=self._string(question),
+                    correct=self._string(correct),
+                    distractors=[self._string(distractor) for distractor in distractors],
+                    explanation=self._string(explanation),
+                )
+            )
+        return tuple(items)
+
+    def _string_bytes(self, string_id: int) -> bytes:
+        if string_id >= self._string_count:
+            raise BankFormatError(f"string id {string_id} out of range")
+        start, end = struct.unpack_from(
+            "<QQ", self._buffer, self._string_index_offset + string_id * _U64.size
+        )
+        base = self._string_data_offset
+        return self._buffer[base + start : base + end]
+
+    def _string(self, string_id: int) -> str:
+        return self._string_bytes(string_id).decode("utf-8")
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Question bank tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compile_parser = commands.add_parser(
+        "compile", help="compile a JSON/YAML question bank into the memory-mapped format"
+    )
+    compile_parser.add_argument("source", help="JSON or YAML file mapping topics to items")
+    compile_parser.add_argument("output", help="path of the compiled bank file")
+    args = parser.parse_args(argv)
+
+    bank = load_bank_source(args.source)
+    compile_bank(bank, args.output)
+    item_count = sum(len(items) for items in bank.values())
+    print(f"Compiled {len(bank)} topics ({item_count} items) into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Sequence, TypeVar
+from uuid import UUID
+
+from app.quiz.models import QuizQuestion, estimate_question_size
+
+CacheKey = tuple[str, str, int]
+
+SourceT = TypeVar("SourceT")
+ValueT = TypeVar("ValueT")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    entries: int
+    size_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class QuizContentCache:
+    """Bounded LRU cache of generated question lists.
+
+    Entries are stored as tuples of frozen ``QuizQuestion`` models so callers
+    can share them without copying.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[CacheKey, tuple[tuple[QuizQuestion, ...], int]] = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> tuple[QuizQuestion, ...] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: CacheKey, questions: Sequence[QuizQuestion]) -> tuple[QuizQuestion, ...]:
+        frozen = tuple(questions)
+        size = sum(estimate_question_size(question) for question in frozen)
+        if size > self._max_bytes:
+            return frozen
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= previous[1]
+            self._entries[key] = (frozen, size)
+            self._size_bytes += size
+            while len(self._entries) > self._max_entries or self._size_bytes > self._max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted_size
+                self._evictions += 1
+        return frozen
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+            )
+
+
+class LoadingCache(Generic[SourceT, ValueT]):
+    """LRU of values built from stored quizzes, filled from a loader on a miss.
+
+    ``is_live`` is checked on every hit when the repository can drop quizzes
+    (TTL or eviction), so a cached value never outlives its stored quiz.
+    Subclasses turn what the loader returns into the cached value in ``_build``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        is_live: Callable[[UUID], bool] | None = None,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._max_entries = max_entries
+        self._is_live = is_live
+        self._entries: OrderedDict[UUID, ValueT] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, quiz_id: UUID) -> ValueT | None:
+        """Return a cached value without calling any loader."""
+        with self._lock:
+            value = self._entries.get(quiz_id)
+            if value is None:
+                return None
+            self._entries.move_to_end(quiz_id)
+        if self._is_live is None or self._is_live(quiz_id):
+            return value
+        with self._lock:
+            self._entries.pop(quiz_id, None)
+        return None
+
+    def get_or_load(
+        self,
+        quiz_id: UUID,
+        loader: Callable[[UUID], SourceT | None],
+    ) -> ValueT | None:
+        value = self.get(quiz_id)
+        if value is not None:
+            return value
+
+        source = loader(quiz_id)
+        if source is None:
+            return None
+        value = self._build(source)
+        with self._lock:
+            self._entries[quiz_id] = value
+            self._entries.move_to_end(quiz_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _build(self, source: SourceT) -> ValueT:
+        raise NotImplementedError
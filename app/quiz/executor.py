@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from app.quiz.generator import QuizGenerator
+from app.quiz.models import QuizQuestion
+
+GenerationKey = tuple[str, str, int]
+
+
+class GenerationTimeoutError(Exception):
+    pass
+
+
+class GenerationExecutor:
+    """Runs generator calls on a bounded thread pool, off the event loop.
+
+    Concurrent calls with the same inputs share one in-flight generation. A
+    caller that times out stops waiting, but the generation keeps running so
+    the other waiters still get its result.
+    """
+
+    def __init__(
+        self,
+        generator: QuizGenerator,
+        max_workers: int = 4,
+        timeout_seconds: float = 10.0,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if timeout_seconds <= 0:
+            raise ValueError("timeout_seconds must be positive")
+        self._generator = generator
+        self._max_workers = max_workers
+        self._timeout_seconds = timeout_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="quiz-gen")
+        self._in_flight: dict[GenerationKey, asyncio.Future[list[QuizQuestion]]] = {}
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def generate(self, topic: str, difficulty: str, num_questions: int) -> list[QuizQuestion]:
+        key = (topic, difficulty, num_questions)
+        future = self._in_flight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            # The caller's context goes along so trace spans land on its request.
+            context = contextvars.copy_context()
+            future = loop.run_in_executor(
+                self._pool, context.run, self._generator.generate, *key
+            )
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        try:
+            questions = await asyncio.wait_for(asyncio.shield(future), self._timeout_seconds)
+        except asyncio.TimeoutError as exc:
+            raise GenerationTimeoutError(
+                f"quiz generation exceeded {self._timeout_seconds:g}s"
+            ) from exc
+        return list(questions)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _forget(self, key: GenerationKey, future: asyncio.Future[list[QuizQuestion]]) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved when every waiter has timed out.
+            future.exception()
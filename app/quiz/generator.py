@@ -1,158 +1,82 @@
 from __future__ import annotations
 
 import hashlib
+import itertools
+import math
 import random
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Iterable, Iterator, Protocol, Sequence
 
+from app.quiz.bank import InMemoryQuestionBank, QuestionBank, QuestionBankItem
+from app.quiz.cache import QuizContentCache
 from app.quiz.models import QuizQuestion
+from app.settings import GENERATION_ENGINES, GenerationEngine
+from app.tracing import span
 
 
-@dataclass(frozen=True)
-class QuestionBankItem:
-    question: str
-    correct: str
-    distractors: list[str]
-    explanation: str
+# Bump whenever generate() would produce different output for the same bank.
+ALGORITHM_REVISION = 1
+
+_CHOICE_PERMUTATIONS: tuple[tuple[int, ...], ...] = tuple(itertools.permutations(range(4)))
+_FALLBACK_DISTRACTORS = (
+    "None of the above.",
+    "All of the above.",
+    "Not enough information.",
+    "Depends on the context.",
+)
+
+
+QuizSpec = tuple[str, str, int]
+
+
+@dataclass(frozen=True, slots=True)
+class _GenericTexts:
+    stems: tuple[str, ...]
+    answer_sets: tuple[tuple[str, tuple[str, ...]], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class _QuizArtifacts:
+    seed: int
+    # Counter engine only: the question order over bank items or generic stems.
+    order: _AffinePermutation | None
+
+
+class UncacheableQuestions(list[QuizQuestion]):
+    """Questions a generator answered with but that must not be cached.
+
+    A degraded answer, such as a remote generator's local fallback, would
+    otherwise keep being served from the cache after the cause clears.
+    """
 
 
 class QuizGenerator(Protocol):
+    @property
+    def version(self) -> str:
+        ...
+
     def generate(self, topic: str, difficulty: str, num_questions: int) -> list[QuizQuestion]:
         ...
 
+    def iter_questions(
+        self, topic: str, difficulty: str, num_questions: int
+    ) -> Iterator[QuizQuestion]:
+        ...
+
 
 class DeterministicQuizGenerator:
-    def __init__(self) -> None:
-        self._bank = {
-            "python lists": [
-                QuestionBankItem(
-                    question="What is the primary purpose of a Python list?",
-                    correct="To store an ordered, mutable collection of items.",
-                    distractors=[
-                        "To store only unique items without order.",
-                        "To map keys to values in a fixed structure.",
-                        "To define an immutable sequence of characters.",
-                    ],
-                    explanation="Lists are ordered and mutable, ideal for sequences you need to change.",
-                ),
-                QuestionBankItem(
-                    question="Which list operation appends an item to the end?",
-                    correct="list.append(item)",
-                    distractors=[
-                        "list.extend(item)",
-                        "list.insert(item)",
-                        "list.add(item)",
-                    ],
-                    explanation="append adds a single item to the end of a list.",
-                ),
-                QuestionBankItem(
-                    question="What does slicing a list return?",
-                    correct="A new list containing the selected elements.",
-                    distractors=[
-                        "A tuple with the first and last element.",
-                        "A view into the original list.",
-                        "A generator that yields items lazily.",
-                    ],
-                    explanation="Slicing returns a new list with the selected items.",
-                ),
-            ],
-            "python dicts": [
-                QuestionBankItem(
-                    question="What data structure does a Python dict represent?",
-                    correct="A mapping of unique keys to values.",
-                    distractors=[
-                        "An ordered list of duplicate values.",
-                        "A fixed-size array of numbers.",
-                        "A stack of items with LIFO access.",
-                    ],
-                    explanation="Dicts map unique keys to values for fast lookup.",
-                ),
-                QuestionBankItem(
-                    question="Which method safely retrieves a value with a default?",
-                    correct="dict.get(key, default)",
-                    distractors=[
-                        "dict.fetch(key, default)",
-                        "dict.find(key, default)",
-                        "dict.value(key, default)",
-                    ],
-                    explanation="get returns the default if the key is missing.",
-                ),
-                QuestionBankItem(
-                    question="What happens when you assign an existing key in a dict?",
-                    correct="The value is overwritten.",
-                    distractors=[
-                        "A new key is created with a suffix.",
-                        "The assignment is ignored.",
-                        "A KeyError is raised.",
-                    ],
-                    explanation="Keys are unique; assigning replaces the existing value.",
-                ),
-            ],
-            "python functions": [
-                QuestionBankItem(
-                    question="What does a function return if no return statement is present?",
-                    correct="None",
-                    distractors=[
-                        "False",
-                        "0",
-                        "An empty string",
-                    ],
-                    explanation="Python functions return None by default.",
-                ),
-                QuestionBankItem(
-                    question="What is a parameter in a function definition?",
-                    correct="A named variable listed in the function signature.",
-                    distractors=[
-                        "A value passed at call time.",
-                        "A type annotation only.",
-                        "A required keyword for all functions.",
-                    ],
-                    explanation="Parameters are variables defined in the function signature.",
-                ),
-                QuestionBankItem(
-                    question="What is the purpose of *args in a function?",
-                    correct="To accept a variable number of positional arguments.",
-                    distractors=[
-                        "To accept only keyword arguments.",
-                        "To unpack dictionaries.",
-                        "To define default values.",
-                    ],
-                    explanation="*args captures extra positional arguments.",
-                ),
-            ],
-            "sql basics": [
-                QuestionBankItem(
-                    question="Which SQL clause filters rows in a SELECT query?",
-                    correct="WHERE",
-                    distractors=[
-                        "ORDER BY",
-                        "GROUP BY",
-                        "HAVING",
-                    ],
-                    explanation="WHERE filters rows before grouping or ordering.",
-                ),
-                QuestionBankItem(
-                    question="Which SQL statement inserts new rows?",
-                    correct="INSERT INTO",
-                    distractors=[
-                        "ADD ROW",
-                        "CREATE ROW",
-                        "APPEND ROW",
-                    ],
-                    explanation="INSERT INTO adds new rows to a table.",
-                ),
-                QuestionBankItem(
-                    question="What does SELECT * do in SQL?",
-                    correct="Returns all columns from the selected tables.",
-                    distractors=[
-                        "Returns only primary key columns.",
-                        "Deletes all rows from the table.",
-                        "Returns only aggregated values.",
-                    ],
-                    explanation="SELECT * retrieves all columns in the result set.",
-                ),
-            ],
-        }
+    def __init__(
+        self,
+        bank: QuestionBank | None = None,
+        engine: GenerationEngine = "sequential",
+    ) -> None:
+        if engine not in GENERATION_ENGINES:
+            raise ValueError(f"engine must be one of {', '.join(GENERATION_ENGINES)}")
+        self._bank = InMemoryQuestionBank.default() if bank is None else bank
+        # "sequential" draws every question from one random.Random stream and
+        # is kept so existing quizzes regenerate unchanged; "counter" derives
+        # question i from a hash of (seed, i) and supports random access.
+        self._engine = engine
 
         self._generic_stems = [
             "Which statement about {topic} is correct?",
@@ -192,98 +116,289 @@ class DeterministicQuizGenerator:
             "The correct answer aligns with how the topic is commonly applied.",
             "The correct option matches standard expectations for the topic.",
         ]
+        self._version = self._fingerprint()
+        self._artifacts: dict[QuizSpec, _QuizArtifacts] = {}
+        self._generic_texts: dict[str, _GenericTexts] = {}
+
+    @property
+    def version(self) -> str:
+        return self._version
+
+    @property
+    def engine(self) -> GenerationEngine:
+        return self._engine
 
     def generate(self, topic: str, difficulty: str, num_questions: int) -> list[QuizQuestion]:
-        rng = random.Random(self._stable_seed(topic, difficulty, num_questions))
-        if topic in self._bank:
-            return self._generate_from_bank(topic, difficulty, num_questions, rng)
-        return self._generate_generic(topic, difficulty, num_questions, rng)
+        return list(self.iter_questions(topic, difficulty, num_questions))
 
-    def _generate_from_bank(
+    def precompute(self, specs: Iterable[QuizSpec]) -> int:
+        """Derive seeds, question orders and formatted generic texts up front.
+
+        Meant to run once before serving (and before forking workers); the
+        stored artifacts are only read afterwards. Returns how many are held.
+        """
+        for topic, difficulty, num_questions in specs:
+            spec = (topic, difficulty, num_questions)
+            if spec not in self._artifacts:
+                self._artifacts[spec] = self._derive_artifacts(*spec)
+            if not self._bank.get(topic) and topic not in self._generic_texts:
+                self._generic_texts[topic] = self._format_generic_texts(topic)
+        return len(self._artifacts)
+
+    def iter_questions(
+        self, topic: str, difficulty: str, num_questions: int
+    ) -> Iterator[QuizQuestion]:
+        if self._engine == "counter":
+            return self.iter_range(topic, difficulty, num_questions, 0, num_questions)
+        artifacts = self._artifacts.get((topic, difficulty, num_questions))
+        seed = (
+            self._stable_seed(topic, difficulty, num_questions)
+            if artifacts is None
+            else artifacts.seed
+        )
+        rng = random.Random(seed)
+        items = self._bank.get(topic)
+        if items:
+            return self._iter_from_bank(items, difficulty, num_questions, rng)
+        return self._iter_generic(topic, difficulty, num_questions, rng)
+
+    def _iter_from_bank(
         self,
-        topic: str,
+        items: Sequence[QuestionBankItem],
         difficulty: str,
         num_questions: int,
         rng: random.Random,
-    ) -> list[QuizQuestion]:
-        bank = list(self._bank[topic])
+    ) -> Iterator[QuizQuestion]:
+        bank = list(items)
         rng.shuffle(bank)
 
-        questions: list[QuizQuestion] = []
         for i in range(num_questions):
             item = bank[i % len(bank)]
             choices, answer_index = self._build_choices(item.correct, item.distractors, rng)
-            questions.append(
-                QuizQuestion(
-                    id=i + 1,
-                    question=f"{item.question} ({difficulty})",
-                    choices=choices,
-                    answer_index=answer_index,
-                    explanation=item.explanation,
-                )
+            yield QuizQuestion(
+                id=i + 1,
+                question=f"{item.question} ({difficulty})",
+                choices=choices,
+                answer_index=answer_index,
+                explanation=item.explanation,
             )
-        return questions
 
-    def _generate_generic(
+    def _iter_generic(
         self,
         topic: str,
         difficulty: str,
         num_questions: int,
         rng: random.Random,
-    ) -> list[QuizQuestion]:
-        stems = list(self._generic_stems)
+    ) -> Iterator[QuizQuestion]:
+        texts = self._generic_texts_for(topic)
+        stems = list(texts.stems)
         rng.shuffle(stems)
 
-        questions: list[QuizQuestion] = []
         for i in range(num_questions):
             stem = stems[i % len(stems)]
-            correct_template, distractors = self._generic_answer_sets[
-                i % len(self._generic_answer_sets)
-            ]
-            correct = correct_template.format(topic=topic)
-            distractor_texts = [text.format(topic=topic) for text in distractors]
+            correct, distractor_texts = texts.answer_sets[i % len(texts.answer_sets)]
             choices, answer_index = self._build_choices(correct, distractor_texts, rng)
             explanation = self._generic_explanations[i % len(self._generic_explanations)]
-            questions.append(
-                QuizQuestion(
+            yield QuizQuestion(
+                id=i + 1,
+                question=f"{stem} ({difficulty})",
+                choices=choices,
+                answer_index=answer_index,
+                explanation=explanation,
+            )
+
+    def question_at(
+        self, topic: str, difficulty: str, num_questions: int, index: int
+    ) -> QuizQuestion:
+        """Return question ``index`` (zero-based) of the quiz ``generate`` would build."""
+        return next(self.iter_range(topic, difficulty, num_questions, index, index + 1))
+
+    def iter_range(
+        self, topic: str, difficulty: str, num_questions: int, start: int, stop: int
+    ) -> Iterator[QuizQuestion]:
+        """Yield questions ``start`` to ``stop - 1`` of a quiz.
+
+        The counter engine computes each question independently, so any slice
+        costs only its own length. The sequential engine has to replay the
+        stream from the first question.
+        """
+        if not 0 <= start <= stop <= num_questions:
+            raise IndexError("question range out of bounds")
+        if self._engine == "sequential":
+            return itertools.islice(
+                self.iter_questions(topic, difficulty, num_questions), start, stop
+            )
+        return self._iter_counter(topic, difficulty, num_questions, start, stop)
+
+    def _iter_counter(
+        self, topic: str, difficulty: str, num_questions: int, start: int, stop: int
+    ) -> Iterator[QuizQuestion]:
+        artifacts = self._artifacts.get((topic, difficulty, num_questions))
+        if artifacts is None:
+            artifacts = self._derive_artifacts(topic, difficulty, num_questions)
+        key = artifacts.seed.to_bytes(32, "big")
+        order = artifacts.order
+        items = self._bank.get(topic)
+        if items:
+            for i in range(start, stop):
+                item = items[order[i]]
+                choices, answer_index = self._permute_choices(
+                    item.correct, item.distractors, _counter_hash(key, i)
+                )
+                yield QuizQuestion(
                     id=i + 1,
-                    question=f"{stem.format(topic=topic)} ({difficulty})",
+                    question=f"{item.question} ({difficulty})",
                     choices=choices,
                     answer_index=answer_index,
-                    explanation=explanation,
+                    explanation=item.explanation,
                 )
+            return
+
+        texts = self._generic_texts_for(topic)
+        for i in range(start, stop):
+            stem = texts.stems[order[i]]
+            correct, distractor_texts = texts.answer_sets[i % len(texts.answer_sets)]
+            choices, answer_index = self._permute_choices(
+                correct, distractor_texts, _counter_hash(key, i)
             )
-        return questions
+            yield QuizQuestion(
+                id=i + 1,
+                question=f"{stem} ({difficulty})",
+                choices=choices,
+                answer_index=answer_index,
+                explanation=self._generic_explanations[i % len(self._generic_explanations)],
+            )
+
+    def _derive_artifacts(self, topic: str, difficulty: str, num_questions: int) -> _QuizArtifacts:
+        seed = self._stable_seed(topic, difficulty, num_questions)
+        if self._engine != "counter":
+            return _QuizArtifacts(seed=seed, order=None)
+        items = self._bank.get(topic)
+        size = len(items) if items else len(self._generic_stems)
+        return _QuizArtifacts(seed=seed, order=_AffinePermutation(seed.to_bytes(32, "big"), size))
+
+    def _generic_texts_for(self, topic: str) -> _GenericTexts:
+        texts = self._generic_texts.get(topic)
+        return self._format_generic_texts(topic) if texts is None else texts
+
+    def _format_generic_texts(self, topic: str) -> _GenericTexts:
+        return _GenericTexts(
+            stems=tuple(stem.format(topic=topic) for stem in self._generic_stems),
+            answer_sets=tuple(
+                (
+                    correct.format(topic=topic),
+                    tuple(text.format(topic=topic) for text in distractors),
+                )
+                for correct, distractors in self._generic_answer_sets
+            ),
+        )
+
+    def _fingerprint(self) -> str:
+        digest = hashlib.sha256(f"algorithm={ALGORITHM_REVISION}".encode("utf-8"))
+        if self._engine != "sequential":
+            digest.update(f"engine={self._engine}".encode("utf-8"))
+        digest.update(self._bank.fingerprint.encode("ascii"))
+        for stem in self._generic_stems:
+            digest.update(b"\x01" + stem.encode("utf-8"))
+        for correct, distractors in self._generic_answer_sets:
+            for text in (correct, *distractors):
+                digest.update(b"\x02" + text.encode("utf-8"))
+        for explanation in self._generic_explanations:
+            digest.update(b"\x03" + explanation.encode("utf-8"))
+        return f"det-{digest.hexdigest()[:16]}"
 
     @staticmethod
     def _stable_seed(topic: str, difficulty: str, num_questions: int) -> int:
         seed_input = f"{topic}|{difficulty}|{num_questions}".encode("utf-8")
         return int(hashlib.sha256(seed_input).hexdigest(), 16)
 
+    @staticmethod
+    def _distinct_choices(correct: str, distractors: Sequence[str]) -> list[str]:
+        unique = dict.fromkeys(item for item in distractors if item != correct)
+        if len(unique) < 3:
+            for item in _FALLBACK_DISTRACTORS:
+                if item != correct:
+                    unique.setdefault(item)
+                if len(unique) >= 3:
+                    break
+        return [correct, *itertools.islice(unique, 3)]
+
     @staticmethod
     def _build_choices(
         correct: str,
-        distractors: list[str],
+        distractors: Sequence[str],
         rng: random.Random,
     ) -> tuple[list[str], int]:
-        unique_distractors: list[str] = []
-        for item in distractors:
-            if item != correct and item not in unique_distractors:
-                unique_distractors.append(item)
-
-        if len(unique_distractors) < 3:
-            fallback = [
-                "None of the above.",
-                "All of the above.",
-                "Not enough information.",
-                "Depends on the context.",
-            ]
-            for item in fallback:
-                if item != correct and item not in unique_distractors:
-                    unique_distractors.append(item)
-                if len(unique_distractors) == 3:
-                    break
+        with span("build_choices"):
+            choices = DeterministicQuizGenerator._distinct_choices(correct, distractors)
+            rng.shuffle(choices)
+            return choices, choices.index(correct)
+
+    @staticmethod
+    def _permute_choices(
+        correct: str,
+        distractors: Sequence[str],
+        counter: int,
+    ) -> tuple[list[str], int]:
+        with span("build_choices"):
+            choices = DeterministicQuizGenerator._distinct_choices(correct, distractors)
+            permutation = _CHOICE_PERMUTATIONS[counter % len(_CHOICE_PERMUTATIONS)]
+            return [choices[position] for position in permutation], permutation.index(0)
+
+
+def _counter_hash(key: bytes, index: int) -> int:
+    digest = hashlib.blake2b(index.to_bytes(8, "little"), key=key, digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class _AffinePermutation:
+    """Maps question index i onto a shuffled, cycling order of ``size`` slots.
+
+    ``i -> (a * i + b) mod size`` with ``a`` coprime to ``size`` visits every
+    slot once per cycle, so slot i is known without drawing slots 0..i-1.
+    """
+
+    def __init__(self, key: bytes, size: int) -> None:
+        digest = hashlib.blake2b(b"order", key=key, digest_size=16).digest()
+        mixed = int.from_bytes(digest, "little")
+        self._size = size
+        self._step = 1 + (mixed >> 64) % size
+        while math.gcd(self._step, size) != 1:
+            self._step += 1
+        self._offset = (mixed & 0xFFFFFFFFFFFFFFFF) % size
+
+    def __getitem__(self, index: int) -> int:
+        return (self._step * (index % self._size) + self._offset) % self._size
+
+
+class CachingQuizGenerator:
+    def __init__(self, generator: QuizGenerator, cache: QuizContentCache) -> None:
+        self._generator = generator
+        self._cache = cache
+
+    @property
+    def version(self) -> str:
+        return self._generator.version
+
+    @property
+    def cache(self) -> QuizContentCache:
+        return self._cache
+
+    def generate(self, topic: str, difficulty: str, num_questions: int) -> list[QuizQuestion]:
+        key = (topic, difficulty, num_questions)
+        cached = self._cache.get(key)
+        if cached is None:
+            questions = self._generator.generate(topic, difficulty, num_questions)
+            if isinstance(questions, UncacheableQuestions):
+                return list(questions)
+            cached = self._cache.put(key, questions)
+        return list(cached)
 
-        choices = [correct] + unique_distractors[:3]
-        rng.shuffle(choices)
-        return choices, choices.index(correct)
+    def iter_questions(
+        self, topic: str, difficulty: str, num_questions: int
+    ) -> Iterator[QuizQuestion]:
+        # Streams are typically long; read through the cache but never fill it.
+        cached = self._cache.get((topic, difficulty, num_questions))
+        if cached is not None:
+            return iter(cached)
+        return self._generator.iter_questions(topic, difficulty, num_questions)
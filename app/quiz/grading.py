@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from app.quiz.cache import LoadingCache
+from app.quiz.models import QuizGenerateResponse
+
+# Byte stored for an unanswered question; it never equals an answer index.
+UNANSWERED = 0xFF
+
+# bytes.translate table mapping a zero byte to 1 and everything else to 0.
+_ZERO_TO_ONE = bytes([1]) + bytes(255)
+
+
+class SubmissionLengthError(ValueError):
+    def __init__(self, index: int, expected: int, received: int) -> None:
+        super().__init__(f"expected {expected} answers, got {received}")
+        self.index = index
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    """A quiz's answer indexes packed one byte per question.
+
+    Grading XORs the packed submission against the key as two big integers,
+    so a whole batch of submissions is compared in a single operation.
+    """
+
+    answers: bytes
+    explanations: tuple[str, ...]
+    _packed: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_packed", int.from_bytes(self.answers, "big"))
+
+    @classmethod
+    def from_quiz(cls, quiz: QuizGenerateResponse) -> AnswerKey:
+        return cls(
+            answers=bytes(question.answer_index for question in quiz.questions),
+            explanations=tuple(question.explanation for question in quiz.questions),
+        )
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def grade(self, submitted: Sequence[int | None]) -> bytes:
+        """Return one byte per question: 1 if answered correctly, else 0."""
+        return self.grade_many([submitted])[0]
+
+    def grade_many(self, submissions: Sequence[Sequence[int | None]]) -> list[bytes]:
+        size = len(self.answers)
+        if not submissions:
+            return []
+        packed = b"".join(
+            self._pack(index, answers) for index, answers in enumerate(submissions)
+        )
+        # A single submission, the common case, reuses the key packed once up
+        # front; a batch needs the key repeated once per submission.
+        if len(submissions) == 1:
+            repeated = self._packed
+        else:
+            repeated = int.from_bytes(self.answers * len(submissions), "big")
+        difference = int.from_bytes(packed, "big") ^ repeated
+        correct = difference.to_bytes(len(packed), "big").translate(_ZERO_TO_ONE)
+        return [correct[i * size : (i + 1) * size] for i in range(len(submissions))]
+
+    def _pack(self, index: int, answers: Sequence[int | None]) -> bytes:
+        if len(answers) != len(self.answers):
+            raise SubmissionLengthError(index, len(self.answers), len(answers))
+        return bytes(UNANSWERED if answer is None else answer for answer in answers)
+
+
+class AnswerKeyCache(LoadingCache[QuizGenerateResponse, AnswerKey]):
+    """LRU of answer keys, keyed by quiz id."""
+
+    def _build(self, source: QuizGenerateResponse) -> AnswerKey:
+        return AnswerKey.from_quiz(source)
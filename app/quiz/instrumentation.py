@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+from uuid import UUID
+
+from app.metrics import STAGE_LATENCY
+from app.quiz.generator import QuizGenerator
+from app.quiz.listing import ListingKey
+from app.quiz.models import QuizGenerateResponse, QuizQuestion, QuizSummary
+from app.quiz.repo import QuizRepository
+from app.tracing import span
+
+
+class InstrumentedQuizGenerator:
+    def __init__(self, generator: QuizGenerator) -> None:
+        self._generator = generator
+
+    @property
+    def version(self) -> str:
+        return self._generator.version
+
+    def generate(self, topic: str, difficulty: str, num_questions: int) -> list[QuizQuestion]:
+        with STAGE_LATENCY.time("generate"):
+            return self._generator.generate(topic, difficulty, num_questions)
+
+    def iter_questions(
+        self, topic: str, difficulty: str, num_questions: int
+    ) -> Iterator[QuizQuestion]:
+        return self._generator.iter_questions(topic, difficulty, num_questions)
+
+
+class InstrumentedQuizRepository:
+    def __init__(self, repository: QuizRepository) -> None:
+        self._repository = repository
+
+    def save(self, quiz: QuizGenerateResponse) -> None:
+        with STAGE_LATENCY.time("repository_save"), span("repository.save"):
+            self._repository.save(quiz)
+
+    def save_many(self, quizzes: Iterable[QuizGenerateResponse]) -> None:
+        with STAGE_LATENCY.time("repository_save_many"):
+            self._repository.save_many(quizzes)
+
+    def get(self, quiz_id: UUID) -> QuizGenerateResponse | None:
+        with STAGE_LATENCY.time("repository_get"):
+            return self._repository.get(quiz_id)
+
+    def get_json(self, quiz_id: UUID) -> bytes | None:
+        with STAGE_LATENCY.time("repository_get"):
+            return self._repository.get_json(quiz_id)
+
+    def list_quizzes(
+        self,
+        topic: str | None,
+        difficulty: str | None,
+        limit: int,
+        before: ListingKey | None = None,
+    ) -> list[QuizSummary]:
+        with STAGE_LATENCY.time("repository_list"):
+            return self._repository.list_quizzes(topic, difficulty, limit, before)
+
+    def __len__(self) -> int:
+        return len(self._repository)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import bisect
+import struct
+import threading
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from app.quiz.models import QuizSummary
+
+# Quizzes are listed newest first, ordered by (created_at, quiz_id) so ties
+# on the timestamp still have a stable order.
+ListingKey = tuple[int, bytes]
+Scope = tuple[str | None, str | None]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_CURSOR = struct.Struct(">q16s")
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def to_micros(moment: datetime) -> int:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - _EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(micros: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+def listing_key(summary: QuizSummary) -> ListingKey:
+    return to_micros(summary.created_at), summary.quiz_id.bytes
+
+
+def encode_cursor(key: ListingKey) -> str:
+    return base64.urlsafe_b64encode(_CURSOR.pack(*key)).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> ListingKey:
+    try:
+        return _CURSOR.unpack(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, struct.error, UnicodeEncodeError) as exc:
+        raise InvalidCursorError("cursor is malformed") from exc
+
+
+class QuizIndex:
+    """Secondary indexes for listing quizzes by topic and difficulty.
+
+    Every quiz is kept in four sorted key lists: all quizzes, its topic, its
+    difficulty, and its (topic, difficulty) pair. A page is a bisect for the
+    cursor followed by a slice, so deep pages cost the same as the first.
+
+    Removal only tombstones the key; a list is compacted once half of it is
+    dead, so evicting old quizzes never shifts the whole list per entry.
+    """
+
+    def __init__(self) -> None:
+        self._keys: dict[Scope, list[ListingKey]] = {}
+        self._dead: dict[Scope, int] = {}
+        # Tombstoned key -> number of lists that still hold it.
+        self._tombstones: dict[ListingKey, int] = {}
+        self._summaries: dict[bytes, QuizSummary] = {}
+        self._lock = threading.Lock()
+
+    def add(self, summary: QuizSummary) -> None:
+        key = listing_key(summary)
+        with self._lock:
+            self._remove(summary.quiz_id.bytes)
+            if key in self._tombstones:
+                for scope in list(self._dead):
+                    self._compact(scope)
+            self._summaries[key[1]] = summary
+            for scope in _scopes(summary.topic, summary.difficulty):
+                bisect.insort(self._keys.setdefault(scope, []), key)
+
+    def remove(self, quiz_id: UUID) -> None:
+        with self._lock:
+            self._remove(quiz_id.bytes)
+
+    def page(
+        self,
+        topic: str | None,
+        difficulty: str | None,
+        limit: int,
+        before: ListingKey | None = None,
+    ) -> list[QuizSummary]:
+        scope = (topic, difficulty)
+        with self._lock:
+            keys = self._keys.get(scope, [])
+            end = len(keys) if before is None else bisect.bisect_left(keys, before)
+            if not self._dead.get(scope):
+                selected = keys[max(0, end - limit) : end]
+                return [self._summaries[quiz_id] for _, quiz_id in reversed(selected)]
+            page: list[QuizSummary] = []
+            for position in range(end - 1, -1, -1):
+                if len(page) == limit:
+                    break
+                key = keys[position]
+                if key not in self._tombstones:
+                    page.append(self._summaries[key[1]])
+            return page
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    def _remove(self, quiz_id: bytes) -> None:
+        summary = self._summaries.pop(quiz_id, None)
+        if summary is None:
+            return
+        scopes = _scopes(summary.topic, summary.difficulty)
+        self._tombstones[listing_key(summary)] = len(scopes)
+        for scope in scopes:
+            dead = self._dead.get(scope, 0) + 1
+            self._dead[scope] = dead
+            if dead * 2 >= len(self._keys[scope]):
+                self._compact(scope)
+
+    def _compact(self, scope: Scope) -> None:
+        live = []
+        for key in self._keys[scope]:
+            holders = self._tombstones.get(key)
+            if holders is None:
+                live.append(key)
+            elif holders == 1:
+                del self._tombstones[key]
+            else:
+                self._tombstones[key] = holders - 1
+        del self._dead[scope]
+        if live:
+            self._keys[scope] = live
+        else:
+            del self._keys[scope]
+
+
+def _scopes(topic: str, difficulty: str) -> tuple[Scope, ...]:
+    return ((None, None), (topic, None), (None, difficulty), (topic, difficulty))
@@ -1,18 +1,43 @@
-from typing import Literal
+from datetime import datetime, timezone
+from typing import Annotated, Any, Literal
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 # Quiz constraints
 MIN_ANSWER_INDEX = 0
 MAX_ANSWER_INDEX = 3
 REQUIRED_CHOICES_COUNT = 4
 
+# Rough per-object overheads used for memory budgeting
+QUESTION_OVERHEAD_BYTES = 512
+QUIZ_OVERHEAD_BYTES = 256
+
+# Batch generation limits
+MAX_BATCH_ITEMS = 100
+MAX_BATCH_TOTAL_QUESTIONS = 1000
+
+# Only generated quizzes are stored, so this also bounds what can be graded
+MAX_QUIZ_QUESTIONS = 20
+
+# Streamed quizzes are never held in memory as a whole
+MAX_STREAM_QUESTIONS = 500
+
+# A submission answers one stored quiz
+MAX_SUBMISSION_ANSWERS = MAX_QUIZ_QUESTIONS
+
+# Bulk grading limits
+MAX_BULK_SUBMISSIONS = 5000
+
+# Listing page sizes
+DEFAULT_LIST_LIMIT = 20
+MAX_LIST_LIMIT = 100
+
 
 class QuizGenerateRequest(BaseModel):
     topic: str = Field(min_length=1, max_length=120)
     difficulty: Literal["easy", "medium", "hard"] = "easy"
-    num_questions: int = Field(default=5, ge=1, le=20)
+    num_questions: int = Field(default=5, ge=1, le=MAX_QUIZ_QUESTIONS)
 
     @field_validator("topic")
     @classmethod
@@ -23,7 +48,13 @@ class QuizGenerateRequest(BaseModel):
         return cleaned
 
 
+class QuizStreamRequest(QuizGenerateRequest):
+    num_questions: int = Field(default=5, ge=1, le=MAX_STREAM_QUESTIONS)
+
+
 class QuizQuestion(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: int
     question: str
     choices: list[str] = Field(
@@ -37,8 +68,156 @@ class QuizQuestion(BaseModel):
     explanation: str
 
 
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class QuizGenerateResponse(BaseModel):
     quiz_id: UUID
     topic: str
     difficulty: str
     questions: list[QuizQuestion]
+    created_at: datetime = Field(default_factory=utc_now)
+
+
+class QuizSummary(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    quiz_id: UUID
+    topic: str
+    difficulty: str
+    num_questions: int
+    created_at: datetime
+
+    @classmethod
+    def from_quiz(cls, quiz: QuizGenerateResponse) -> "QuizSummary":
+        return cls(
+            quiz_id=quiz.quiz_id,
+            topic=quiz.topic,
+            difficulty=quiz.difficulty,
+            num_questions=len(quiz.questions),
+            created_at=quiz.created_at,
+        )
+
+
+class QuizListResponse(BaseModel):
+    items: list[QuizSummary]
+    next_cursor: str | None = None
+
+
+class QuizSheetQuestion(BaseModel):
+    id: int
+    question: str
+    choices: list[str]
+
+
+class QuizSheetResponse(BaseModel):
+    """A quiz as handed to students: no answer indexes or explanations."""
+
+    quiz_id: UUID
+    topic: str
+    difficulty: str
+    questions: list[QuizSheetQuestion]
+    created_at: datetime
+
+
+SubmittedAnswer = Annotated[int, Field(ge=MIN_ANSWER_INDEX, le=MAX_ANSWER_INDEX)] | None
+
+
+class QuizSubmissionRequest(BaseModel):
+    # One entry per question, in order; null marks an unanswered question.
+    answers: list[SubmittedAnswer] = Field(max_length=MAX_SUBMISSION_ANSWERS)
+
+
+class QuizQuestionGrade(BaseModel):
+    id: int
+    correct: bool
+    submitted_index: int | None
+    answer_index: int
+    explanation: str
+
+
+class QuizSubmissionResponse(BaseModel):
+    quiz_id: UUID
+    score: int
+    total: int
+    questions: list[QuizQuestionGrade]
+
+
+class QuizBulkSubmissionRequest(BaseModel):
+    submissions: list[QuizSubmissionRequest] = Field(
+        min_length=1, max_length=MAX_BULK_SUBMISSIONS
+    )
+
+
+class QuizBulkGradeItem(BaseModel):
+    index: int
+    score: int
+    correct: list[bool]
+
+
+class QuizBulkGradeResponse(BaseModel):
+    quiz_id: UUID
+    total: int
+    answer_indexes: list[int]
+    explanations: list[str]
+    results: list[QuizBulkGradeItem]
+
+
+class TopicStat(BaseModel):
+    topic: str
+    difficulty: str
+    # Exponentially decayed request count; ``error`` bounds its overestimate.
+    count: float
+    error: float
+
+
+class TopicStatsResponse(BaseModel):
+    half_life_seconds: float
+    capacity: int
+    topics: list[TopicStat]
+
+
+class QuizBatchGenerateRequest(BaseModel):
+    # Items are validated one by one so a bad item yields a per-item error
+    # instead of rejecting the whole batch.
+    items: list[dict[str, Any]] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class QuizBatchItemError(BaseModel):
+    message: str
+    details: list[dict[str, Any]] = Field(default_factory=list)
+
+
+class QuizBatchItemResult(BaseModel):
+    index: int
+    status: Literal["ok", "error"]
+    quiz: QuizGenerateResponse | None = None
+    error: QuizBatchItemError | None = None
+
+
+class QuizBatchGenerateResponse(BaseModel):
+    results: list[QuizBatchItemResult]
+
+
+_ANSWER_FIELDS = {"questions": {"__all__": {"answer_index", "explanation"}}}
+
+
+def estimate_question_size(question: QuizQuestion) -> int:
+    text_bytes = len(question.question) + len(question.explanation)
+    text_bytes += sum(len(choice) for choice in question.choices)
+    return text_bytes + QUESTION_OVERHEAD_BYTES
+
+
+def estimate_quiz_size(quiz: QuizGenerateResponse) -> int:
+    text_bytes = len(quiz.topic) + len(quiz.difficulty)
+    text_bytes += sum(estimate_question_size(question) for question in quiz.questions)
+    return text_bytes + QUIZ_OVERHEAD_BYTES
+
+
+def serialize_quiz(quiz: QuizGenerateResponse) -> bytes:
+    return quiz.model_dump_json().encode("utf-8")
+
+
+def serialize_quiz_sheet(quiz: QuizGenerateResponse) -> bytes:
+    return quiz.model_dump_json(exclude=_ANSWER_FIELDS).encode("utf-8")
@@ -1,22 +1,195 @@
+from __future__ import annotations
+
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Mapping
+
+DEFAULT_ALIASES: dict[str, str] = {
+    "lists": "python lists",
+    "list": "python lists",
+    "python list": "python lists",
+    "python lists": "python lists",
+    "dict": "python dicts",
+    "dicts": "python dicts",
+    "dictionary": "python dicts",
+    "dictionaries": "python dicts",
+    "python dict": "python dicts",
+    "python dicts": "python dicts",
+    "function": "python functions",
+    "functions": "python functions",
+    "python function": "python functions",
+    "python functions": "python functions",
+    "sql": "sql basics",
+    "sql basics": "sql basics",
+}
+
+_NGRAM = 3
+_PADDING = " " * (_NGRAM - 1)
+_MIN_SELECTIVE_POSTINGS = 1024
+_MAX_VERIFIED_CANDIDATES = 32
+# A word shorter than this many characters per edit is only a typo target when
+# the query drops or swaps its letters: "pyhton" and "basic" are typos, while
+# "diets", "gists" or "basins" add letters and are real words of their own.
+_TOKEN_CHARS_PER_EDIT = 10
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"{_PADDING}{text}{_PADDING}"
+    return {padded[i : i + _NGRAM] for i in range(len(padded) - _NGRAM + 1)}
+
+
+def max_edit_distance(text: str) -> int:
+    # Short inputs are too ambiguous to correct: "lisp" is not a typo of "list".
+    if len(text) < 5:
+        return 0
+    if len(text) < 9:
+        return 1
+    return 2
+
+
+def edit_distance(left: str, right: str, limit: int) -> int:
+    """Optimal string alignment distance, or ``limit + 1`` once it exceeds ``limit``."""
+    if abs(len(left) - len(right)) > limit:
+        return limit + 1
+    previous_previous: list[int] = []
+    previous = list(range(len(right) + 1))
+    for i in range(1, len(left) + 1):
+        current = [i] + [0] * len(right)
+        row_minimum = i
+        for j in range(1, len(right) + 1):
+            cost = 0 if left[i - 1] == right[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (
+                i > 1
+                and j > 1
+                and left[i - 1] == right[j - 2]
+                and left[i - 2] == right[j - 1]
+            ):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_minimum = min(row_minimum, value)
+        if row_minimum > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+def _is_token_typo(query: str, key: str) -> bool:
+    """Check each differing word against its own budget, not the whole phrase's."""
+    query_tokens, key_tokens = query.split(), key.split()
+    if len(query_tokens) != len(key_tokens):
+        query_tokens, key_tokens = [query], [key]
+    for query_token, key_token in zip(query_tokens, key_tokens):
+        if query_token == key_token:
+            continue
+        limit = max_edit_distance(key_token)
+        distance = edit_distance(query_token, key_token, limit)
+        if distance > limit:
+            return False
+        if distance * _TOKEN_CHARS_PER_EDIT > len(key_token) and (
+            Counter(query_token) - Counter(key_token)
+        ):
+            return False
+    return True
+
+
+class _AliasIndex:
+    def __init__(self, aliases: Mapping[str, str]) -> None:
+        exact: dict[str, str] = {}
+        for alias, canonical in aliases.items():
+            canonical_key = " ".join(canonical.split()).lower()
+            exact[" ".join(alias.split()).lower()] = canonical_key
+            exact.setdefault(canonical_key, canonical_key)
+        self.exact = exact
+        self.keys = list(exact)
+        # Postings are partitioned by key length so a query only scans keys
+        # whose length is within its edit budget.
+        postings: dict[tuple[str, int], list[int]] = {}
+        for position, key in enumerate(self.keys):
+            for gram in _trigrams(key):
+                postings.setdefault((gram, len(key)), []).append(position)
+        self.postings = postings
+
+    def resolve(self, normalized: str) -> str | None:
+        canonical = self.exact.get(normalized)
+        if canonical is not None:
+            return canonical
+        limit = max_edit_distance(normalized)
+        if limit == 0:
+            return None
+
+        lengths = range(len(normalized) - limit, len(normalized) + limit + 1)
+        gram_postings = sorted(
+            (
+                [
+                    self.postings[(gram, length)]
+                    for length in lengths
+                    if (gram, length) in self.postings
+                ]
+                for gram in _trigrams(normalized)
+            ),
+            key=lambda lists: sum(map(len, lists)),
+        )
+        # An edit touches at most _NGRAM grams (a transposition _NGRAM + 1), so
+        # any key within the budget appears in one of the ``must_scan`` rarest
+        # posting lists. Further lists are only counted while they stay
+        # selective; the best-scoring candidates are then verified.
+        must_scan = limit * (_NGRAM + 1) + 1
+        selective = max(_MIN_SELECTIVE_POSTINGS, len(self.keys) // 50)
+        shared: Counter[int] = Counter()
+        for scanned, lists in enumerate(gram_postings):
+            if scanned >= must_scan and sum(map(len, lists)) > selective:
+                break
+            for positions in lists:
+                shared.update(positions)
+
+        best: tuple[int, str] | None = None
+        for position, _ in shared.most_common(_MAX_VERIFIED_CANDIDATES):
+            key = self.keys[position]
+            distance = edit_distance(normalized, key, limit)
+            if distance > limit or (best is not None and (distance, key) >= best):
+                continue
+            if _is_token_typo(normalized, key):
+                best = (distance, key)
+        return None if best is None else self.exact[best[1]]
+
+
+class TopicNormalizer:
+    """Maps free-form topics onto canonical bank topics.
+
+    Lookups try an exact alias match first and fall back to a trigram
+    candidate search verified by edit distance. Results are cached per raw
+    input; ``reload`` swaps in a new alias table and drops the cache.
+    """
+
+    def __init__(self, aliases: Mapping[str, str] = DEFAULT_ALIASES, cache_size: int = 8192) -> None:
+        self._cache_size = cache_size
+        self._normalize = self._build(aliases)
+
+    def normalize(self, raw_topic: str) -> str:
+        return self._normalize(raw_topic)
+
+    def reload(self, aliases: Mapping[str, str]) -> None:
+        self._normalize = self._build(aliases)
+
+    def _build(self, aliases: Mapping[str, str]) -> Callable[[str], str]:
+        index = _AliasIndex(aliases)
+
+        @lru_cache(maxsize=self._cache_size)
+        def normalize(raw_topic: str) -> str:
+            cleaned = " ".join(raw_topic.split())
+            canonical = index.resolve(cleaned.lower())
+            return cleaned if canonical is None else canonical
+
+        return normalize
+
+
+_default_normalizer = TopicNormalizer()
+
+
 def normalize_topic(raw_topic: str) -> str:
-    cleaned = " ".join(raw_topic.split())
-    normalized = cleaned.lower()
-    aliases = {
-        "lists": "python lists",
-        "list": "python lists",
-        "python list": "python lists",
-        "python lists": "python lists",
-        "dict": "python dicts",
-        "dicts": "python dicts",
-        "dictionary": "python dicts",
-        "dictionaries": "python dicts",
-        "python dict": "python dicts",
-        "python dicts": "python dicts",
-        "function": "python functions",
-        "functions": "python functions",
-        "python function": "python functions",
-        "python functions": "python functions",
-        "sql": "sql basics",
-        "sql basics": "sql basics",
-    }
-    return aliases.get(normalized, cleaned)
+    return _default_normalizer.normalize(raw_topic)
+
+
+def reload_aliases(aliases: Mapping[str, str]) -> None:
+    _default_normalizer.reload(aliases)
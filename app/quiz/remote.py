@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterator
+
+import httpx
+from pydantic import TypeAdapter, ValidationError
+
+from app.metrics import registry
+from app.quiz.generator import QuizGenerator, UncacheableQuestions
+from app.quiz.models import QuizQuestion
+
+logger = logging.getLogger(__name__)
+
+REMOTE_GENERATIONS = registry.counter(
+    "examifyr_remote_generations_total",
+    "Remote generator calls by outcome: remote, or the fallback reason (error, circuit_open).",
+    ("outcome",),
+)
+REMOTE_HEDGES = registry.counter(
+    "examifyr_remote_hedged_requests_total",
+    "Duplicate requests sent because the first attempt exceeded the hedge delay.",
+)
+
+_QUESTIONS = TypeAdapter(list[QuizQuestion])
+
+
+class RemoteGenerationError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures.
+
+    While open every call is refused until ``reset_timeout`` has passed;
+    then a single trial call is let through, and its outcome either closes
+    the circuit or opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._clock() - self._opened_at >= self._reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_in_flight or self._clock() - self._opened_at < self._reset_timeout:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self._failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+
+class LatencyWindow:
+    """Rolling window of recent call latencies."""
+
+    def __init__(self, size: int = 256, min_samples: int = 20) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self._min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, fraction: float, default: float) -> float:
+        with self._lock:
+            if len(self._samples) < self._min_samples:
+                return default
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class RemoteQuizGenerator:
+    """Generates quizzes through a remote model server over pooled HTTP.
+
+    One long-lived ``httpx.Client`` keeps connections alive across calls.
+    Every call has a deadline, and the number of requests in flight is
+    bounded. If the first attempt is still pending after the recent p95
+    latency, a duplicate is sent and whichever answers first wins. When
+    the remote fails, times out, is saturated or the circuit is open, the
+    call is answered by ``fallback``, marked as uncacheable.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        fallback: QuizGenerator,
+        timeout_seconds: float = 5.0,
+        max_concurrency: int = 16,
+        hedge_quantile: float = 0.95,
+        initial_hedge_delay: float = 0.5,
+        breaker: CircuitBreaker | None = None,
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if timeout_seconds <= 0:
+            raise ValueError("timeout_seconds must be positive")
+        self._fallback = fallback
+        self._timeout_seconds = timeout_seconds
+        self._hedge_quantile = hedge_quantile
+        self._initial_hedge_delay = initial_hedge_delay
+        self._breaker = breaker or CircuitBreaker()
+        self._latencies = LatencyWindow()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="remote-gen")
+        self._client = httpx.Client(
+            base_url=base_url,
+            transport=transport,
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+                keepalive_expiry=60.0,
+            ),
+        )
+        digest = hashlib.sha256(base_url.encode("utf-8")).hexdigest()[:16]
+        self._version = f"remote-{digest}"
+
+    @property
+    def version(self) -> str:
+        return self._version
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    def generate(self, topic: str, difficulty: str, num_questions: int) -> list[QuizQuestion]:
+        if not self._breaker.allow():
+            return self._fall_back("circuit_open", topic, difficulty, num_questions)
+        try:
+            questions = self._call(topic, difficulty, num_questions)
+        except RemoteGenerationError as exc:
+            self._breaker.record_failure()
+            logger.warning(
+                "Remote quiz generation failed",
+                extra={"topic": topic, "error": str(exc)},
+            )
+            return self._fall_back("error", topic, difficulty, num_questions)
+        self._breaker.record_success()
+        REMOTE_GENERATIONS.inc("remote")
+        return questions
+
+    def iter_questions(
+        self, topic: str, difficulty: str, num_questions: int
+    ) -> Iterator[QuizQuestion]:
+        # The remote answers with a whole quiz, so there is nothing to stream.
+        return iter(self.generate(topic, difficulty, num_questions))
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._client.close()
+
+    def _fall_back(
+        self, reason: str, topic: str, difficulty: str, num_questions: int
+    ) -> list[QuizQuestion]:
+        REMOTE_GENERATIONS.inc(reason)
+        return UncacheableQuestions(self._fallback.generate(topic, difficulty, num_questions))
+
+    def _call(self, topic: str, difficulty: str, num_questions: int) -> list[QuizQuestion]:
+        deadline = time.monotonic() + self._timeout_seconds
+        payload = {"topic": topic, "difficulty": difficulty, "num_questions": num_questions}
+        attempts = [self._submit(payload, deadline)]
+        if attempts[0] is None:
+            raise RemoteGenerationError("no free connection slot before the deadline")
+
+        hedge_delay = self._latencies.percentile(self._hedge_quantile, self._initial_hedge_delay)
+        done, _ = wait(attempts, timeout=min(hedge_delay, self._remaining(deadline)))
+        if not done:
+            hedge = self._submit(payload, deadline, block=False)
+            if hedge is not None:
+                REMOTE_HEDGES.inc()
+                attempts.append(hedge)
+
+        pending = set(attempts)
+        last_error: Exception | None = None
+        while pending:
+            done, pending = wait(
+                pending, timeout=self._remaining(deadline), return_when=FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for attempt in done:
+                try:
+                    return attempt.result()
+                except Exception as exc:
+                    last_error = exc
+        if last_error is not None:
+            raise RemoteGenerationError(str(last_error)) from last_error
+        raise RemoteGenerationError(f"remote generation exceeded {self._timeout_seconds:g}s")
+
+    def _submit(
+        self, payload: dict[str, object], deadline: float, block: bool = True
+    ) -> Future[list[QuizQuestion]] | None:
+        if block:
+            acquired = self._slots.acquire(timeout=self._remaining(deadline))
+        else:
+            acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            return None
+        try:
+            attempt = self._pool.submit(self._request, payload, deadline)
+        except RuntimeError:
+            self._slots.release()
+            raise
+        attempt.add_done_callback(lambda _: self._slots.release())
+        return attempt
+
+    def _request(self, payload: dict[str, object], deadline: float) -> list[QuizQuestion]:
+        started = time.monotonic()
+        try:
+            response = self._client.post(
+                "/v1/generate",
+                json=payload,
+                timeout=max(0.001, deadline - started),
+            )
+            response.raise_for_status()
+            questions = _QUESTIONS.validate_python(response.json()["questions"])
+        except (httpx.HTTPError, ValidationError, KeyError, TypeError, ValueError) as exc:
+            raise RemoteGenerationError(f"{type(exc).__name__}: {exc}") from exc
+        self._latencies.observe(time.monotonic() - started)
+        return questions
+
+    @staticmethod
+    def _remaining(deadline: float) -> float:
+        return max(0.0, deadline - time.monotonic())
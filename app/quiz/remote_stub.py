@@ -0,0 +1,89 @@
+"""Local stand-in for the remote model server, for tests and benchmarks.
+
+Serves ``POST /v1/generate`` from an in-process generator. Use
+``httpx.WSGITransport(app=StubGeneratorServer(...))`` to call it without
+a network, or ``python -m app.quiz.remote_stub --port 8001`` to serve it
+over real sockets.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from socketserver import ThreadingMixIn
+from typing import Callable, Iterable, Sequence
+from wsgiref.simple_server import WSGIServer, make_server
+
+from app.quiz.generator import DeterministicQuizGenerator, QuizGenerator
+
+StartResponse = Callable[[str, list[tuple[str, str]]], object]
+
+
+class StubGeneratorServer:
+    """WSGI app with injectable latency and failures."""
+
+    def __init__(
+        self,
+        generator: QuizGenerator | None = None,
+        latency: Callable[[], float] = lambda: 0.0,
+        fail: Callable[[], bool] = lambda: False,
+    ) -> None:
+        self._generator = DeterministicQuizGenerator() if generator is None else generator
+        self.latency = latency
+        self.fail = fail
+        self.requests = 0
+
+    def __call__(self, environ: dict, start_response: StartResponse) -> Iterable[bytes]:
+        self.requests += 1
+        if environ["REQUEST_METHOD"] != "POST" or environ["PATH_INFO"] != "/v1/generate":
+            return self._respond(start_response, "404 Not Found", {"detail": "Not Found"})
+        delay = self.latency()
+        if delay > 0:
+            time.sleep(delay)
+        if self.fail():
+            return self._respond(start_response, "503 Service Unavailable", {"detail": "down"})
+
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        payload = json.loads(environ["wsgi.input"].read(length))
+        questions = self._generator.generate(
+            payload["topic"], payload["difficulty"], payload["num_questions"]
+        )
+        body = {"questions": [question.model_dump() for question in questions]}
+        return self._respond(start_response, "200 OK", body)
+
+    @staticmethod
+    def _respond(start_response: StartResponse, status: str, body: dict) -> list[bytes]:
+        encoded = json.dumps(body).encode("utf-8")
+        start_response(
+            status,
+            [("Content-Type", "application/json"), ("Content-Length", str(len(encoded)))],
+        )
+        return [encoded]
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    # Hedged requests only help if the stub can answer them concurrently.
+    daemon_threads = True
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a stub quiz generator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="fixed delay per request")
+    args = parser.parse_args(argv)
+
+    delay = args.latency_ms / 1000
+    server = make_server(
+        args.host,
+        args.port,
+        StubGeneratorServer(latency=lambda: delay),
+        server_class=_ThreadingWSGIServer,
+    )
+    print(f"Stub generator listening on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,312 @@
-from typing import Protocol
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, Protocol
 from uuid import UUID
 
-from app.quiz.models import QuizGenerateResponse
+from app.quiz.generator import QuizGenerator
+from app.quiz.listing import ListingKey, QuizIndex
+from app.quiz.models import (
+    QuizGenerateResponse,
+    QuizSummary,
+    estimate_quiz_size,
+    serialize_quiz,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class QuizRepository(Protocol):
     def save(self, quiz: QuizGenerateResponse) -> None:
         ...
 
+    def save_many(self, quizzes: Iterable[QuizGenerateResponse]) -> None:
+        ...
+
     def get(self, quiz_id: UUID) -> QuizGenerateResponse | None:
         ...
 
+    def get_json(self, quiz_id: UUID) -> bytes | None:
+        ...
+
+    def list_quizzes(
+        self,
+        topic: str | None,
+        difficulty: str | None,
+        limit: int,
+        before: ListingKey | None = None,
+    ) -> list[QuizSummary]:
+        """Newest-first summaries strictly older than ``before``."""
+        ...
+
+
+@dataclass(frozen=True)
+class RepositoryStats:
+    entries: int
+    size_bytes: int
+    evictions: int
+    expirations: int
+
 
 class InMemoryQuizRepository:
     def __init__(self) -> None:
         self._quizzes: dict[UUID, QuizGenerateResponse] = {}
+        self._payloads: dict[UUID, bytes] = {}
+        self._index = QuizIndex()
 
     def save(self, quiz: QuizGenerateResponse) -> None:
+        self._payloads[quiz.quiz_id] = serialize_quiz(quiz)
         self._quizzes[quiz.quiz_id] = quiz
+        self._index.add(QuizSummary.from_quiz(quiz))
+
+    def save_many(self, quizzes: Iterable[QuizGenerateResponse]) -> None:
+        for quiz in quizzes:
+            self.save(quiz)
 
     def get(self, quiz_id: UUID) -> QuizGenerateResponse | None:
         return self._quizzes.get(quiz_id)
+
+    def get_json(self, quiz_id: UUID) -> bytes | None:
+        return self._payloads.get(quiz_id)
+
+    def list_quizzes(
+        self,
+        topic: str | None,
+        difficulty: str | None,
+        limit: int,
+        before: ListingKey | None = None,
+    ) -> list[QuizSummary]:
+        return self._index.page(topic, difficulty, limit, before)
+
+    def __len__(self) -> int:
+        return len(self._quizzes)
+
+
+@dataclass
+class _BoundedEntry:
+    quiz: QuizGenerateResponse
+    payload: bytes
+    size: int
+    expires_at: float
+
+
+class BoundedInMemoryQuizRepository:
+    """In-memory repository with entry, byte and TTL limits.
+
+    Eviction is least-recently-used; expired entries are dropped lazily on
+    access and swept from the oldest end on every save. The newest entry is
+    always kept, even when it alone exceeds ``max_bytes``, so a saved quiz can
+    be read back.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 24 * 60 * 60,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[UUID, _BoundedEntry] = OrderedDict()
+        self._expiry_queue: deque[tuple[float, UUID]] = deque()
+        self._size_bytes = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._index = QuizIndex()
+        self._lock = threading.Lock()
+
+    def save(self, quiz: QuizGenerateResponse) -> None:
+        self.save_many([quiz])
+
+    def save_many(self, quizzes: Iterable[QuizGenerateResponse]) -> None:
+        serialized = [(quiz, serialize_quiz(quiz)) for quiz in quizzes]
+        with self._lock:
+            now = self._clock()
+            self._sweep_expired(now)
+            for quiz, payload in serialized:
+                self._insert(quiz, payload, now)
+
+    def get(self, quiz_id: UUID) -> QuizGenerateResponse | None:
+        entry = self._lookup(quiz_id)
+        return None if entry is None else entry.quiz
+
+    def get_json(self, quiz_id: UUID) -> bytes | None:
+        entry = self._lookup(quiz_id)
+        return None if entry is None else entry.payload
+
+    def contains(self, quiz_id: UUID) -> bool:
+        return self._lookup(quiz_id) is not None
+
+    def list_quizzes(
+        self,
+        topic: str | None,
+        difficulty: str | None,
+        limit: int,
+        before: ListingKey | None = None,
+    ) -> list[QuizSummary]:
+        with self._lock:
+            self._sweep_expired(self._clock())
+            return self._index.page(topic, difficulty, limit, before)
+
+    def stats(self) -> RepositoryStats:
+        with self._lock:
+            return RepositoryStats(
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, quiz_id: UUID) -> _BoundedEntry | None:
+        with self._lock:
+            entry = self._entries.get(quiz_id)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock():
+                self._discard(quiz_id)
+                self._expirations += 1
+                return None
+            self._entries.move_to_end(quiz_id)
+            return entry
+
+    def _insert(self, quiz: QuizGenerateResponse, payload: bytes, now: float) -> None:
+        self._discard(quiz.quiz_id)
+        size = estimate_quiz_size(quiz) + len(payload)
+        entry = _BoundedEntry(
+            quiz=quiz,
+            payload=payload,
+            size=size,
+            expires_at=now + self._ttl_seconds,
+        )
+        self._entries[quiz.quiz_id] = entry
+        self._expiry_queue.append((entry.expires_at, quiz.quiz_id))
+        if len(self._expiry_queue) > 2 * self._max_entries:
+            self._compact_expiry_queue()
+        self._size_bytes += size
+        self._index.add(QuizSummary.from_quiz(quiz))
+        while len(self._entries) > 1 and (
+            len(self._entries) > self._max_entries or self._size_bytes > self._max_bytes
+        ):
+            self._discard(next(iter(self._entries)))
+            self._evictions += 1
+
+    def _discard(self, quiz_id: UUID) -> None:
+        entry = self._entries.pop(quiz_id, None)
+        if entry is not None:
+            self._size_bytes -= entry.size
+            self._index.remove(quiz_id)
+
+    def _sweep_expired(self, now: float) -> None:
+        # The queue may hold stale pairs for entries already evicted or
+        # replaced; only drop an entry if its expiry still matches.
+        while self._expiry_queue and self._expiry_queue[0][0] <= now:
+            expires_at, quiz_id = self._expiry_queue.popleft()
+            entry = self._entries.get(quiz_id)
+            if entry is not None and entry.expires_at == expires_at:
+                self._discard(quiz_id)
+                self._expirations += 1
+
+    def _compact_expiry_queue(self) -> None:
+        self._expiry_queue = deque(
+            (expires_at, quiz_id)
+            for expires_at, quiz_id in self._expiry_queue
+            if (entry := self._entries.get(quiz_id)) is not None and entry.expires_at == expires_at
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class QuizSeedRecord:
+    topic: str
+    difficulty: str
+    num_questions: int
+    generator_version: str
+    created_at: datetime
+
+
+class SeedQuizRepository:
+    """Stores only the generator inputs of each quiz and rebuilds it on read.
+
+    Records carry the version of the generator that produced them; reads are
+    served by the generator registered for that version, so quizzes saved
+    before a bank change keep resolving to identical content as long as the
+    previous generator stays registered.
+    """
+
+    def __init__(
+        self,
+        generator: QuizGenerator,
+        previous_generators: Iterable[QuizGenerator] = (),
+    ) -> None:
+        self._generator = generator
+        self._generators = {previous.version: previous for previous in previous_generators}
+        self._generators[generator.version] = generator
+        self._records: dict[UUID, QuizSeedRecord] = {}
+        self._index = QuizIndex()
+
+    def save(self, quiz: QuizGenerateResponse) -> None:
+        self._records[quiz.quiz_id] = QuizSeedRecord(
+            topic=sys.intern(quiz.topic),
+            difficulty=sys.intern(quiz.difficulty),
+            num_questions=len(quiz.questions),
+            generator_version=self._generator.version,
+            created_at=quiz.created_at,
+        )
+        self._index.add(QuizSummary.from_quiz(quiz))
+
+    def save_many(self, quizzes: Iterable[QuizGenerateResponse]) -> None:
+        for quiz in quizzes:
+            self.save(quiz)
+
+    def get(self, quiz_id: UUID) -> QuizGenerateResponse | None:
+        record = self._records.get(quiz_id)
+        if record is None:
+            return None
+        generator = self._generators.get(record.generator_version)
+        if generator is None:
+            logger.warning(
+                "No generator registered for stored quiz version",
+                extra={"quiz_id": str(quiz_id), "generator_version": record.generator_version},
+            )
+            return None
+        return QuizGenerateResponse(
+            quiz_id=quiz_id,
+            topic=record.topic,
+            difficulty=record.difficulty,
+            questions=generator.generate(record.topic, record.difficulty, record.num_questions),
+            created_at=record.created_at,
+        )
+
+    def get_json(self, quiz_id: UUID) -> bytes | None:
+        # Seed records trade CPU for memory, so the payload is rebuilt on read.
+        quiz = self.get(quiz_id)
+        return None if quiz is None else serialize_quiz(quiz)
+
+    def list_quizzes(
+        self,
+        topic: str | None,
+        difficulty: str | None,
+        limit: int,
+        before: ListingKey | None = None,
+    ) -> list[QuizSummary]:
+        return self._index.page(topic, difficulty, limit, before)
+
+    def __len__(self) -> int:
+        return len(self._records)
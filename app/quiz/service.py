@@ -1,20 +1,38 @@
 import logging
+from typing import Sequence
 from uuid import UUID, uuid4
 
-from app.quiz.generator import QuizGenerator
-from app.quiz.models import QuizGenerateResponse
+from app.quiz.generator import QuizGenerator, QuizSpec
+from app.quiz.listing import decode_cursor, encode_cursor, listing_key
+from app.quiz.models import (
+    QuizGenerateResponse,
+    QuizListResponse,
+    QuizQuestion,
+    serialize_quiz_sheet,
+)
 from app.quiz.repo import QuizRepository
+from app.quiz.stats import DecayingTopK, TopicKey
 
 logger = logging.getLogger(__name__)
 
 
 class QuizService:
-    def __init__(self, generator: QuizGenerator, repository: QuizRepository) -> None:
+    def __init__(
+        self,
+        generator: QuizGenerator,
+        repository: QuizRepository,
+        topic_stats: DecayingTopK[TopicKey] | None = None,
+    ) -> None:
         self._generator = generator
         self._repository = repository
+        self._topic_stats = topic_stats
 
     def generate_quiz(
-        self, topic: str, difficulty: str, num_questions: int
+        self,
+        topic: str,
+        difficulty: str,
+        num_questions: int,
+        questions: list[QuizQuestion] | None = None,
     ) -> QuizGenerateResponse:
         logger.info(
             "Generating quiz",
@@ -24,8 +42,10 @@ class QuizService:
                 "num_questions": num_questions,
             },
         )
+        self.record_topic(topic, difficulty)
         quiz_id = uuid4()
-        questions = self._generator.generate(topic, difficulty, num_questions)
+        if questions is None:
+            questions = self._generator.generate(topic, difficulty, num_questions)
         quiz = QuizGenerateResponse(
             quiz_id=quiz_id,
             topic=topic,
@@ -36,10 +56,94 @@ class QuizService:
         logger.info("Quiz generated successfully", extra={"quiz_id": str(quiz_id)})
         return quiz
 
+    def generate_quizzes(self, specs: Sequence[QuizSpec]) -> list[QuizGenerateResponse | None]:
+        """Generate one quiz per spec, running the generator once per distinct spec.
+
+        Items whose generation failed are returned as ``None``; every other quiz
+        is persisted with a single ``save_many`` call.
+        """
+        logger.info(
+            "Generating quiz batch",
+            extra={"batch_size": len(specs), "distinct_specs": len(set(specs))},
+        )
+        for topic, difficulty, _ in specs:
+            self.record_topic(topic, difficulty)
+        questions_by_spec: dict[QuizSpec, list[QuizQuestion]] = {}
+        for spec in dict.fromkeys(specs):
+            try:
+                questions_by_spec[spec] = self._generator.generate(*spec)
+            except Exception:
+                logger.exception(
+                    "Quiz generation failed",
+                    extra={"topic": spec[0], "difficulty": spec[1], "num_questions": spec[2]},
+                )
+
+        quizzes: list[QuizGenerateResponse | None] = []
+        for topic, difficulty, num_questions in specs:
+            questions = questions_by_spec.get((topic, difficulty, num_questions))
+            if questions is None:
+                quizzes.append(None)
+                continue
+            quizzes.append(
+                QuizGenerateResponse(
+                    quiz_id=uuid4(),
+                    topic=topic,
+                    difficulty=difficulty,
+                    questions=questions,
+                )
+            )
+        self._repository.save_many(quiz for quiz in quizzes if quiz is not None)
+        logger.info("Quiz batch generated successfully", extra={"batch_size": len(specs)})
+        return quizzes
+
+    def record_topic(self, topic: str, difficulty: str) -> None:
+        if self._topic_stats is not None:
+            self._topic_stats.record((topic, difficulty))
+
+    def prewarm(self, specs: Sequence[QuizSpec]) -> int:
+        """Run the generator for each spec so its caches hold the output."""
+        warmed = 0
+        for spec in specs:
+            try:
+                self._generator.generate(*spec)
+            except Exception:
+                logger.exception("Quiz prewarm failed", extra={"topic": spec[0]})
+                continue
+            warmed += 1
+        return warmed
+
     def get_quiz(self, quiz_id: UUID) -> QuizGenerateResponse | None:
         quiz = self._repository.get(quiz_id)
-        if quiz is None:
-            logger.warning("Quiz not found", extra={"quiz_id": str(quiz_id)})
-        else:
-            logger.info("Quiz retrieved successfully", extra={"quiz_id": str(quiz_id)})
+        self._log_retrieval(quiz_id, found=quiz is not None)
         return quiz
+
+    def get_quiz_json(self, quiz_id: UUID) -> bytes | None:
+        payload = self._repository.get_json(quiz_id)
+        self._log_retrieval(quiz_id, found=payload is not None)
+        return payload
+
+    def get_quiz_sheet_json(self, quiz_id: UUID) -> bytes | None:
+        quiz = self.get_quiz(quiz_id)
+        return None if quiz is None else serialize_quiz_sheet(quiz)
+
+    def list_quizzes(
+        self,
+        topic: str | None = None,
+        difficulty: str | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> QuizListResponse:
+        before = None if cursor is None else decode_cursor(cursor)
+        # One extra row tells whether another page exists.
+        items = self._repository.list_quizzes(topic, difficulty, limit + 1, before)
+        if len(items) <= limit:
+            return QuizListResponse(items=items)
+        items = items[:limit]
+        return QuizListResponse(items=items, next_cursor=encode_cursor(listing_key(items[-1])))
+
+    @staticmethod
+    def _log_retrieval(quiz_id: UUID, found: bool) -> None:
+        if found:
+            logger.info("Quiz retrieved successfully", extra={"quiz_id": str(quiz_id)})
+        else:
+            logger.warning("Quiz not found", extra={"quiz_id": str(quiz_id)})
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Iterable
+from uuid import UUID
+
+from app.quiz.listing import ListingKey, from_micros, to_micros
+from app.quiz.models import QuizGenerateResponse, QuizSummary, serialize_quiz, utc_now
+
+SCHEMA_VERSION = 2
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS quizzes (
+    quiz_id BLOB PRIMARY KEY,
+    payload BLOB NOT NULL,
+    topic TEXT NOT NULL DEFAULT '',
+    difficulty TEXT NOT NULL DEFAULT '',
+    num_questions INTEGER NOT NULL DEFAULT 0,
+    created_at INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID
+"""
+# One index per listing filter, each ending in the (created_at, quiz_id)
+# keyset so a page is a single index range scan.
+_CREATE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS quizzes_by_created ON quizzes (created_at, quiz_id)",
+    "CREATE INDEX IF NOT EXISTS quizzes_by_topic ON quizzes (topic, created_at, quiz_id)",
+    "CREATE INDEX IF NOT EXISTS quizzes_by_difficulty"
+    " ON quizzes (difficulty, created_at, quiz_id)",
+    "CREATE INDEX IF NOT EXISTS quizzes_by_topic_difficulty"
+    " ON quizzes (topic, difficulty, created_at, quiz_id)",
+)
+_V1_COLUMNS = (
+    "ALTER TABLE quizzes ADD COLUMN topic TEXT NOT NULL DEFAULT ''",
+    "ALTER TABLE quizzes ADD COLUMN difficulty TEXT NOT NULL DEFAULT ''",
+    "ALTER TABLE quizzes ADD COLUMN num_questions INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE quizzes ADD COLUMN created_at INTEGER NOT NULL DEFAULT 0",
+)
+_INSERT = (
+    "INSERT OR REPLACE INTO quizzes"
+    " (quiz_id, payload, topic, difficulty, num_questions, created_at)"
+    " VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SELECT = "SELECT payload FROM quizzes WHERE quiz_id = ?"
+_COUNT = "SELECT COUNT(*) FROM quizzes"
+
+QuizRow = tuple[bytes, bytes, str, str, int, int]
+
+
+def encode_quiz(quiz: QuizGenerateResponse) -> QuizRow:
+    return (
+        quiz.quiz_id.bytes,
+        zlib.compress(serialize_quiz(quiz)),
+        quiz.topic,
+        quiz.difficulty,
+        len(quiz.questions),
+        to_micros(quiz.created_at),
+    )
+
+
+def _list_query(topic: str | None, difficulty: str | None, before: ListingKey | None) -> str:
+    conditions = []
+    if topic is not None:
+        conditions.append("topic = ?")
+    if difficulty is not None:
+        conditions.append("difficulty = ?")
+    if before is not None:
+        conditions.append("(created_at, quiz_id) < (?, ?)")
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return (
+        "SELECT quiz_id, topic, difficulty, num_questions, created_at FROM quizzes"
+        f"{where} ORDER BY created_at DESC, quiz_id DESC LIMIT ?"
+    )
+
+
+class SqliteQuizRepository:
+    """File-backed repository shared by every worker process on a node.
+
+    Each thread keeps its own connection, so sqlite's per-connection statement
+    cache keeps the fixed queries below prepared. The database runs in WAL mode
+    so readers never block the single writer.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000) -> None:
+        self._path = path
+        self._busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._cached_count = 0
+        self._counted_at: float | None = None
+        self._initialize()
+
+    def save(self, quiz: QuizGenerateResponse) -> None:
+        self._write([encode_quiz(quiz)])
+
+    def save_many(self, quizzes: Iterable[QuizGenerateResponse]) -> None:
+        self._write([encode_quiz(quiz) for quiz in quizzes])
+
+    def get(self, quiz_id: UUID) -> QuizGenerateResponse | None:
+        payload = self.get_json(quiz_id)
+        if payload is None:
+            return None
+        return QuizGenerateResponse.model_validate_json(payload)
+
+    def get_json(self, quiz_id: UUID) -> bytes | None:
+        row = self._connection().execute(_SELECT, (quiz_id.bytes,)).fetchone()
+        if row is None:
+            return None
+        return zlib.decompress(row[0])
+
+    def list_quizzes(
+        self,
+        topic: str | None,
+        difficulty: str | None,
+        limit: int,
+        before: ListingKey | None = None,
+    ) -> list[QuizSummary]:
+        parameters: list[object] = [value for value in (topic, difficulty) if value is not None]
+        if before is not None:
+            parameters.extend(before)
+        parameters.append(limit)
+        rows = self._connection().execute(_list_query(topic, difficulty, before), parameters)
+        return [
+            QuizSummary(
+                quiz_id=UUID(bytes=quiz_id),
+                topic=row_topic,
+                difficulty=row_difficulty,
+                num_questions=num_questions,
+                created_at=from_micros(created_at),
+            )
+            for quiz_id, row_topic, row_difficulty, num_questions, created_at in rows
+        ]
+
+    def __len__(self) -> int:
+        return self._connection().execute(_COUNT).fetchone()[0]
+
+    def cached_len(self, max_age_seconds: float = 30.0) -> int:
+        """``len`` recounted at most every ``max_age_seconds``.
+
+        COUNT(*) walks the whole table, so gauges read this instead.
+        """
+        now = time.monotonic()
+        if self._counted_at is None or now - self._counted_at >= max_age_seconds:
+            self._cached_count = len(self)
+            self._counted_at = now
+        return self._cached_count
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _write(self, rows: list[QuizRow]) -> None:
+        if not rows:
+            return
+        connection = self._connection()
+        with connection:
+            connection.executemany(_INSERT, rows)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections are only used by the thread that opened them; the flag
+        # is relaxed so close() can shut every connection down from one place.
+        connection = sqlite3.connect(
+            self._path,
+            timeout=self._busy_timeout_ms / 1000,
+            check_same_thread=False,
+        )
+        connection.execute(f"PRAGMA busy_timeout = {int(self._busy_timeout_ms)}")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        return connection
+
+    def _initialize(self) -> None:
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode = WAL")
+            with connection:
+                # Serializes workers that start at the same time, so only one
+                # of them runs a migration.
+                connection.execute("BEGIN IMMEDIATE")
+                version = connection.execute("PRAGMA user_version").fetchone()[0]
+                if version == 1:
+                    self._migrate_from_v1(connection)
+                connection.execute(_CREATE_TABLE)
+                for statement in _CREATE_INDEXES:
+                    connection.execute(statement)
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _migrate_from_v1(connection: sqlite3.Connection) -> None:
+        # Version 1 stored only the payload and had no creation time; existing
+        # quizzes are stamped with the migration time.
+        for statement in _V1_COLUMNS:
+            connection.execute(statement)
+        migrated_at = utc_now()
+        rows = connection.execute("SELECT quiz_id, payload FROM quizzes").fetchall()
+        for quiz_id, payload in rows:
+            data = json.loads(zlib.decompress(payload))
+            data.setdefault("created_at", migrated_at.isoformat())
+            quiz = QuizGenerateResponse.model_validate(data)
+            connection.execute(_INSERT, encode_quiz(quiz))
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import contextlib
+import heapq
+import itertools
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Iterable, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+K = TypeVar("K", bound=Hashable)
+
+# Counters are rescaled before the forward-decay weight grows past this.
+_MAX_WEIGHT = 2.0**40
+
+
+@dataclass(frozen=True)
+class HeavyHitter(Generic[K]):
+    key: K
+    count: float
+    # Upper bound on how much of ``count`` may belong to keys it replaced.
+    error: float
+
+
+class DecayingTopK(Generic[K]):
+    """Space-Saving top-K counter with exponential time decay.
+
+    At most ``capacity`` keys are tracked no matter how many distinct keys
+    are seen. An untracked key takes over the smallest counter and inherits
+    its count as error. Decay uses forward weighting: later observations
+    weigh more, which is the same as halving every count each half-life
+    without touching them.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 256,
+        half_life_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if half_life_seconds <= 0:
+            raise ValueError("half_life_seconds must be positive")
+        self.capacity = capacity
+        self.half_life_seconds = half_life_seconds
+        self._clock = clock
+        self._landmark = clock()
+        self._counters: dict[K, list[float]] = {}
+        # (count when pushed, tiebreak, key); a count may be lower than the key's current one.
+        self._heap: list[tuple[float, int, K]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def record(self, key: K, amount: float = 1.0) -> None:
+        with self._lock:
+            weight = self._weight(self._clock()) * amount
+            counter = self._counters.get(key)
+            if counter is not None:
+                counter[0] += weight
+                return
+            if len(self._counters) < self.capacity:
+                self._track(key, weight, 0.0)
+                return
+            floor = self._counters.pop(self._pop_smallest())[0]
+            self._track(key, floor + weight, floor)
+
+    def top(self, limit: int) -> list[HeavyHitter[K]]:
+        with self._lock:
+            scale = self._weight(self._clock())
+            ranked = sorted(self._counters.items(), key=lambda item: item[1][0], reverse=True)
+            return [
+                HeavyHitter(key=key, count=count / scale, error=error / scale)
+                for key, (count, error) in ranked[:limit]
+            ]
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def _track(self, key: K, count: float, error: float) -> None:
+        self._counters[key] = [count, error]
+        heapq.heappush(self._heap, (count, next(self._sequence), key))
+
+    def _pop_smallest(self) -> K:
+        while True:
+            count, _, key = heapq.heappop(self._heap)
+            current = self._counters[key][0]
+            if current == count:
+                return key
+            heapq.heappush(self._heap, (current, next(self._sequence), key))
+
+    def _weight(self, now: float) -> float:
+        weight = math.exp2((now - self._landmark) / self.half_life_seconds)
+        if weight > _MAX_WEIGHT:
+            for counter in self._counters.values():
+                counter[0] /= weight
+                counter[1] /= weight
+            self._heap = [
+                (counter[0], next(self._sequence), key) for key, counter in self._counters.items()
+            ]
+            heapq.heapify(self._heap)
+            self._landmark = now
+            weight = 1.0
+        return weight
+
+
+TopicKey = tuple[str, str]
+
+
+# Snapshot path -> lock file descriptor held by this process while it writes.
+_snapshot_claims: dict[str, int] = {}
+_snapshot_claims_lock = threading.Lock()
+
+
+def _claim_snapshot(path: str) -> bool:
+    """Let one process write ``path``: the first to lock ``path.lock`` keeps it.
+
+    The lock is released when that process exits, so the next worker to save
+    takes over. Workers see the same mix of traffic, so one worker's counts
+    rank topics as well as the sum would, without counting the shared startup
+    snapshot once per worker.
+    """
+    if fcntl is None:
+        return True
+    with _snapshot_claims_lock:
+        if path in _snapshot_claims:
+            return True
+        descriptor = os.open(f"{path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(descriptor)
+            return False
+        _snapshot_claims[path] = descriptor
+        return True
+
+
+def save_topic_snapshot(path: str, hitters: Iterable[HeavyHitter[TopicKey]]) -> bool:
+    """Write the snapshot unless another process owns it; returns whether it wrote."""
+    if not _claim_snapshot(path):
+        return False
+    rows = [[*hitter.key, hitter.count] for hitter in hitters]
+    directory, name = os.path.split(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+            json.dump(rows, handle)
+        os.replace(temporary, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temporary)
+        raise
+    return True
+
+
+def load_topic_snapshot(path: str, tracker: DecayingTopK[TopicKey]) -> None:
+    """Seed ``tracker`` from a snapshot; a missing or unreadable file is ignored."""
+    try:
+        with open(path, encoding="utf-8") as handle:
+            rows = [
+                (str(topic), str(difficulty), float(count))
+                for topic, difficulty, count in json.load(handle)
+            ]
+    except (OSError, TypeError, ValueError):
+        return
+    for topic, difficulty, count in rows:
+        tracker.record((topic, difficulty), count)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+from typing import Iterator, Literal
+
+from app.quiz.generator import QuizGenerator
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+StreamFormat = Literal["ndjson", "sse"]
+
+
+def negotiate_stream_format(accept: str | None) -> StreamFormat:
+    if accept and SSE_MEDIA_TYPE in accept.lower():
+        return "sse"
+    return "ndjson"
+
+
+def _frame(event: str, data: str, stream_format: StreamFormat) -> bytes:
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {data}\n\n".encode("utf-8")
+    return f'{{"type":"{event}","data":{data}}}\n'.encode("utf-8")
+
+
+def iter_quiz_stream(
+    generator: QuizGenerator,
+    topic: str,
+    difficulty: str,
+    num_questions: int,
+    stream_format: StreamFormat = "ndjson",
+) -> Iterator[bytes]:
+    """Yield a header frame, one frame per question and an end frame.
+
+    Questions are serialized as the generator produces them, so memory use
+    does not grow with ``num_questions``. Streamed quizzes are not stored, so
+    the header carries no ``quiz_id``.
+    """
+    header = json.dumps(
+        {
+            "topic": topic,
+            "difficulty": difficulty,
+            "num_questions": num_questions,
+        },
+        separators=(",", ":"),
+    )
+    yield _frame("header", header, stream_format)
+    count = 0
+    for question in generator.iter_questions(topic, difficulty, num_questions):
+        count += 1
+        yield _frame("question", question.model_dump_json(), stream_format)
+    yield _frame("end", json.dumps({"count": count}), stream_format)
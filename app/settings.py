@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Literal, Mapping
+
+LogMode = Literal["default", "async"]
+RepositoryBackend = Literal["memory", "bounded", "sqlite", "seed"]
+GenerationEngine = Literal["sequential", "counter"]
+GeneratorBackend = Literal["local", "remote"]
+
+REPOSITORY_BACKENDS: tuple[str, ...] = ("memory", "bounded", "sqlite", "seed")
+GENERATION_ENGINES: tuple[str, ...] = ("sequential", "counter")
+
+
+@dataclass(frozen=True)
+class Settings:
+    repository_backend: RepositoryBackend = "memory"
+    repository_max_entries: int = 10_000
+    repository_max_bytes: int = 64 * 1024 * 1024
+    repository_ttl_seconds: float = 24 * 60 * 60
+    sqlite_path: str = "examifyr-quizzes.sqlite3"
+    question_bank_path: str | None = None
+    generation_engine: GenerationEngine = "sequential"
+    generator_backend: GeneratorBackend = "local"
+    remote_generator_url: str | None = None
+    remote_generator_timeout_seconds: float = 5.0
+    remote_generator_max_concurrency: int = 16
+    generation_workers: int = 4
+    generation_timeout_seconds: float = 10.0
+    idempotency_ttl_seconds: float = 24 * 60 * 60
+    idempotency_max_keys: int = 10_000
+    admission_enabled: bool = True
+    admission_heavy_max_concurrency: int = 32
+    admission_light_max_concurrency: int = 256
+    admission_stream_max_concurrency: int = 16
+    admission_queue_size: int = 100
+    admission_queue_timeout_seconds: float = 2.0
+    topic_stats_capacity: int = 256
+    topic_stats_half_life_seconds: float = 60 * 60
+    topic_stats_path: str | None = None
+    prewarm_top_topics: int = 16
+    prewarm_interval_seconds: float = 5 * 60
+    precompute_max_topics: int = 256
+    metrics_dir: str | None = None
+    tracing_enabled: bool = False
+    trace_buffer_size: int = 50
+    admin_token: str | None = None
+    log_mode: LogMode = "default"
+    log_sample_rates: str = "Quiz retrieved successfully=0.1"
+    log_max_per_second: float = 0.0
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] | None = None) -> Settings:
+        env = os.environ if environ is None else environ
+        defaults = cls()
+        backend = env.get("EXAMIFYR_REPOSITORY_BACKEND", defaults.repository_backend)
+        if backend not in REPOSITORY_BACKENDS:
+            raise ValueError(
+                f"EXAMIFYR_REPOSITORY_BACKEND must be one of {', '.join(REPOSITORY_BACKENDS)}"
+            )
+        engine = env.get("EXAMIFYR_GENERATION_ENGINE", defaults.generation_engine)
+        if engine not in GENERATION_ENGINES:
+            raise ValueError(
+                f"EXAMIFYR_GENERATION_ENGINE must be one of {', '.join(GENERATION_ENGINES)}"
+            )
+        generator_backend = env.get("EXAMIFYR_GENERATOR_BACKEND", defaults.generator_backend)
+        if generator_backend not in ("local", "remote"):
+            raise ValueError("EXAMIFYR_GENERATOR_BACKEND must be one of local, remote")
+        remote_generator_url = env.get("EXAMIFYR_REMOTE_GENERATOR_URL") or None
+        if generator_backend == "remote" and remote_generator_url is None:
+            raise ValueError("EXAMIFYR_REMOTE_GENERATOR_URL is required for the remote backend")
+        if backend == "seed" and generator_backend == "remote":
+            # The seed repository regenerates quizzes on every read.
+            raise ValueError(
+                "EXAMIFYR_REPOSITORY_BACKEND=seed needs a deterministic generator "
+                "and cannot be combined with EXAMIFYR_GENERATOR_BACKEND=remote"
+            )
+        prewarm_interval_seconds = float(
+            env.get("EXAMIFYR_PREWARM_INTERVAL_SECONDS", defaults.prewarm_interval_seconds)
+        )
+        if prewarm_interval_seconds <= 0:
+            raise ValueError("EXAMIFYR_PREWARM_INTERVAL_SECONDS must be positive")
+        log_mode = env.get("EXAMIFYR_LOG_MODE", defaults.log_mode)
+        if log_mode not in ("default", "async"):
+            raise ValueError("EXAMIFYR_LOG_MODE must be one of default, async")
+        return cls(
+            repository_backend=backend,
+            repository_max_entries=int(
+                env.get("EXAMIFYR_REPOSITORY_MAX_ENTRIES", defaults.repository_max_entries)
+            ),
+            repository_max_bytes=int(
+                env.get("EXAMIFYR_REPOSITORY_MAX_BYTES", defaults.repository_max_bytes)
+            ),
+            repository_ttl_seconds=float(
+                env.get("EXAMIFYR_REPOSITORY_TTL_SECONDS", defaults.repository_ttl_seconds)
+            ),
+            sqlite_path=env.get("EXAMIFYR_SQLITE_PATH", defaults.sqlite_path),
+            question_bank_path=env.get("EXAMIFYR_QUESTION_BANK_PATH") or None,
+            generation_engine=engine,
+            generator_backend=generator_backend,
+            remote_generator_url=remote_generator_url,
+            remote_generator_timeout_seconds=float(
+                env.get(
+                    "EXAMIFYR_REMOTE_GENERATOR_TIMEOUT_SECONDS",
+                    defaults.remote_generator_timeout_seconds,
+                )
+            ),
+            remote_generator_max_concurrency=int(
+                env.get(
+                    "EXAMIFYR_REMOTE_GENERATOR_MAX_CONCURRENCY",
+                    defaults.remote_generator_max_concurrency,
+                )
+            ),
+            generation_workers=int(
+                env.get("EXAMIFYR_GENERATION_WORKERS", defaults.generation_workers)
+            ),
+            generation_timeout_seconds=float(
+                env.get("EXAMIFYR_GENERATION_TIMEOUT_SECONDS", defaults.generation_timeout_seconds)
+            ),
+            idempotency_ttl_seconds=float(
+                env.get("EXAMIFYR_IDEMPOTENCY_TTL_SECONDS", defaults.idempotency_ttl_seconds)
+            ),
+            idempotency_max_keys=int(
+                env.get("EXAMIFYR_IDEMPOTENCY_MAX_KEYS", defaults.idempotency_max_keys)
+            ),
+            admission_enabled=_parse_flag(
+                env.get("EXAMIFYR_ADMISSION_ENABLED"), defaults.admission_enabled
+            ),
+            admission_heavy_max_concurrency=int(
+                env.get(
+                    "EXAMIFYR_ADMISSION_HEAVY_MAX_CONCURRENCY",
+                    defaults.admission_heavy_max_concurrency,
+                )
+            ),
+            admission_light_max_concurrency=int(
+                env.get(
+                    "EXAMIFYR_ADMISSION_LIGHT_MAX_CONCURRENCY",
+                    defaults.admission_light_max_concurrency,
+                )
+            ),
+            admission_stream_max_concurrency=int(
+                env.get(
+                    "EXAMIFYR_ADMISSION_STREAM_MAX_CONCURRENCY",
+                    defaults.admission_stream_max_concurrency,
+                )
+            ),
+            admission_queue_size=int(
+                env.get("EXAMIFYR_ADMISSION_QUEUE_SIZE", defaults.admission_queue_size)
+            ),
+            admission_queue_timeout_seconds=float(
+                env.get(
+                    "EXAMIFYR_ADMISSION_QUEUE_TIMEOUT_SECONDS",
+                    defaults.admission_queue_timeout_seconds,
+                )
+            ),
+            topic_stats_capacity=int(
+                env.get("EXAMIFYR_TOPIC_STATS_CAPACITY", defaults.topic_stats_capacity)
+            ),
+            topic_stats_half_life_seconds=float(
+                env.get(
+                    "EXAMIFYR_TOPIC_STATS_HALF_LIFE_SECONDS",
+                    defaults.topic_stats_half_life_seconds,
+                )
+            ),
+            topic_stats_path=env.get("EXAMIFYR_TOPIC_STATS_PATH") or None,
+            prewarm_top_topics=int(
+                env.get("EXAMIFYR_PREWARM_TOP_TOPICS", defaults.prewarm_top_topics)
+            ),
+            prewarm_interval_seconds=prewarm_interval_seconds,
+            precompute_max_topics=int(
+                env.get("EXAMIFYR_PRECOMPUTE_MAX_TOPICS", defaults.precompute_max_topics)
+            ),
+            metrics_dir=env.get("EXAMIFYR_METRICS_DIR") or None,
+            tracing_enabled=_parse_flag(
+                env.get("EXAMIFYR_TRACING_ENABLED"), defaults.tracing_enabled
+            ),
+            trace_buffer_size=int(
+                env.get("EXAMIFYR_TRACE_BUFFER_SIZE", defaults.trace_buffer_size)
+            ),
+            admin_token=env.get("EXAMIFYR_ADMIN_TOKEN") or None,
+            log_mode=log_mode,
+            log_sample_rates=env.get("EXAMIFYR_LOG_SAMPLE_RATES", defaults.log_sample_rates),
+            log_max_per_second=float(
+                env.get("EXAMIFYR_LOG_MAX_PER_SECOND", defaults.log_max_per_second)
+            ),
+        )
+
+
+def _parse_flag(raw: str | None, default: bool) -> bool:
+    if raw is None or not raw.strip():
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import heapq
+import hmac
+import itertools
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, Coroutine, Iterator
+from uuid import uuid4
+
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROFILE_HEADER = b"x-profile"
+ADMIN_TOKEN_HEADER = b"x-admin-token"
+TRACE_ID_HEADER = b"x-trace-id"
+
+# Keeps a runaway request (say a 500-question stream) from growing its trace.
+MAX_SPANS_PER_TRACE = 256
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    start_ms: float
+    duration_ms: float
+
+
+@dataclass
+class Trace:
+    method: str
+    path: str
+    started: float = field(default_factory=time.perf_counter)
+    trace_id: str = field(default_factory=lambda: uuid4().hex)
+    spans: list[Span] = field(default_factory=list)
+    duration_ms: float = 0.0
+    status: int = 0
+    # Folded stacks ("frame;frame;frame" -> samples) when the request was profiled.
+    profile: dict[str, int] | None = None
+    checkpoint: float | None = None
+    # When routing handed the request to FastAPI, which reads and validates the body.
+    route_entered: float | None = None
+
+    def add_span(self, name: str, started: float, ended: float) -> None:
+        if len(self.spans) < MAX_SPANS_PER_TRACE:
+            self.spans.append(
+                Span(
+                    name=name,
+                    start_ms=round((started - self.started) * 1000, 3),
+                    duration_ms=round((ended - started) * 1000, 3),
+                )
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "duration_ms": self.duration_ms,
+            "spans": [
+                {"name": s.name, "start_ms": s.start_ms, "duration_ms": s.duration_ms}
+                for s in self.spans
+            ],
+            "profile": self.profile,
+        }
+
+
+_current_trace: contextvars.ContextVar[Trace | None] = contextvars.ContextVar(
+    "examifyr_trace", default=None
+)
+_NO_SPAN = contextlib.nullcontext()
+
+
+class _SpanTimer:
+    __slots__ = ("_trace", "_name", "_started")
+
+    def __init__(self, trace: Trace, name: str) -> None:
+        self._trace = trace
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._trace.add_span(self._name, self._started, time.perf_counter())
+
+
+def span(name: str) -> ContextManager[None]:
+    """Time a block as a span of the current trace; a no-op outside traced requests."""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NO_SPAN
+    return _SpanTimer(trace, name)
+
+
+def span_since_route_entry(name: str) -> None:
+    """Record a span from the route's entry (see ``TracedRoute``) until now.
+
+    Admission queueing and middleware time come before the route is entered,
+    so they are not part of the span.
+    """
+    trace = _current_trace.get()
+    if trace is not None:
+        started = trace.started if trace.route_entered is None else trace.route_entered
+        trace.add_span(name, started, time.perf_counter())
+
+
+def checkpoint() -> None:
+    """Mark the point where the handler returned; response serialization follows."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.checkpoint = time.perf_counter()
+
+
+class TracedRoute(APIRoute):
+    """Route that marks when FastAPI starts parsing and validating the request."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def traced_handler(request: Request) -> Response:
+            trace = _current_trace.get()
+            if trace is not None:
+                trace.route_entered = time.perf_counter()
+            return await handler(request)
+
+        return traced_handler
+
+
+class TracingSwitch(BaseModel):
+    enabled: bool
+    clear: bool = False
+
+
+class TraceStore:
+    """Keeps the slowest ``max_traces`` traces plus the most recent profiled ones."""
+
+    def __init__(self, max_traces: int = 50, max_profiles: int = 16) -> None:
+        self._max_traces = max_traces
+        self._slowest: list[tuple[float, int, Trace]] = []
+        self._profiles: deque[Trace] = deque(maxlen=max_profiles)
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def add(self, trace: Trace) -> None:
+        with self._lock:
+            if trace.profile is not None:
+                self._profiles.append(trace)
+            entry = (trace.duration_ms, next(self._sequence), trace)
+            if len(self._slowest) < self._max_traces:
+                heapq.heappush(self._slowest, entry)
+            elif entry[0] > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self) -> list[Trace]:
+        with self._lock:
+            return [trace for _, _, trace in sorted(self._slowest, reverse=True)]
+
+    def get(self, trace_id: str) -> Trace | None:
+        with self._lock:
+            for trace in itertools.chain(self._profiles, (entry[2] for entry in self._slowest)):
+                if trace.trace_id == trace_id:
+                    return trace
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slowest.clear()
+            self._profiles.clear()
+
+
+class StackSampler:
+    """Statistical profiler that samples every thread's stack on an interval.
+
+    Sampling all threads catches work handed to thread pools, at the cost of
+    also counting whatever else the process runs meanwhile.
+    """
+
+    def __init__(self, interval: float = 0.001, max_depth: int = 48) -> None:
+        self._interval = interval
+        self._max_depth = max_depth
+        self._samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> dict[str, int]:
+        self._stop.set()
+        self._thread.join()
+        return dict(self._samples.most_common(50))
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self._interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self._max_depth:
+                    code = frame.f_code
+                    stack.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                    frame = frame.f_back
+                self._samples[";".join(reversed(stack))] += 1
+
+
+class Tracer:
+    """Runtime switch and storage for request tracing."""
+
+    def __init__(self, enabled: bool = False, admin_token: str | None = None, max_traces: int = 50):
+        self.enabled = enabled
+        self.admin_token = admin_token
+        self.store = TraceStore(max_traces)
+        self._profiling = threading.Lock()
+
+    def is_admin(self, token: str | None) -> bool:
+        if not self.admin_token or token is None:
+            return False
+        return hmac.compare_digest(token.encode("utf-8"), self.admin_token.encode("utf-8"))
+
+    @contextlib.contextmanager
+    def profiling(self, trace: Trace) -> Iterator[None]:
+        # One sampler at a time; concurrent profile requests are traced only.
+        if not self._profiling.acquire(blocking=False):
+            yield
+            return
+        sampler = StackSampler()
+        sampler.start()
+        try:
+            yield
+        finally:
+            trace.profile = sampler.stop()
+            self._profiling.release()
+
+
+class TracingMiddleware:
+    """Traces requests while the switch is on, and profiles authorized requests.
+
+    With tracing off and no ``X-Profile`` header, a request costs one
+    attribute check and a scan of its headers.
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer) -> None:
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        profile = self._profile_requested(scope)
+        if not self.tracer.enabled and not profile:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(method=scope["method"], path=scope["path"])
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                trace.status = message["status"]
+                if trace.checkpoint is not None:
+                    trace.add_span("serialize_response", trace.checkpoint, time.perf_counter())
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (TRACE_ID_HEADER, trace.trace_id.encode("ascii")),
+                ]
+            await send(message)
+
+        token = _current_trace.set(trace)
+        try:
+            if profile:
+                with self.tracer.profiling(trace):
+                    await self.app(scope, receive, send_wrapper)
+            else:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(token)
+            trace.duration_ms = round((time.perf_counter() - trace.started) * 1000, 3)
+            self.tracer.store.add(trace)
+
+    def _profile_requested(self, scope: Scope) -> bool:
+        requested = False
+        admin_token = None
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                requested = True
+            elif name == ADMIN_TOKEN_HEADER:
+                admin_token = value.decode("latin-1")
+        return requested and self.tracer.is_admin(admin_token)
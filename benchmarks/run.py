@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Sequence
+from uuid import uuid4
+
+from httpx import ASGITransport, AsyncClient, WSGITransport
+
+from app.quiz.generator import DeterministicQuizGenerator
+from app.quiz.models import QuizGenerateResponse
+from app.quiz.normalizer import normalize_topic
+from app.quiz.remote import RemoteQuizGenerator
+from app.quiz.remote_stub import StubGeneratorServer
+from app.quiz.repo import InMemoryQuizRepository
+
+DEFAULT_BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+_TOPICS = ("python lists", "python dicts", "sql basics", "Linear Algebra")
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict[str, float]:
+    latencies.sort()
+    return {
+        "operations": len(latencies),
+        "ops_per_sec": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+    }
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 2)
+
+
+def time_calls(operation: Callable[[int], object], iterations: int) -> dict[str, float]:
+    latencies = []
+    started = time.perf_counter()
+    for iteration in range(iterations):
+        call_started = time.perf_counter()
+        operation(iteration)
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def run_micro_benchmarks(iterations: int) -> dict[str, dict[str, float]]:
+    generator = DeterministicQuizGenerator()
+    rng = random.Random(0)
+    item = generator._bank.get("python lists")[0]
+    raw_topics = ["  Python   LISTS ", "sql", "Linear Algebra", "pyhton lists"]
+    repository = InMemoryQuizRepository()
+    quizzes = [
+        QuizGenerateResponse(
+            quiz_id=uuid4(),
+            topic=topic,
+            difficulty="easy",
+            questions=generator.generate(topic, "easy", 5),
+        )
+        for topic in _TOPICS
+    ]
+    for quiz in quizzes:
+        repository.save(quiz)
+    # In-process stub: measures client, pooling and hedging overhead only.
+    remote = RemoteQuizGenerator(
+        "http://stub-generator",
+        fallback=generator,
+        transport=WSGITransport(app=StubGeneratorServer(generator)),
+    )
+
+    results = {
+        "generator.generate": time_calls(
+            lambda i: generator.generate(_TOPICS[i % len(_TOPICS)], "medium", 10), iterations
+        ),
+        "generator.build_choices": time_calls(
+            lambda i: generator._build_choices(item.correct, item.distractors, rng), iterations
+        ),
+        "normalize_topic": time_calls(
+            lambda i: normalize_topic(raw_topics[i % len(raw_topics)]), iterations
+        ),
+        "repository.save": time_calls(
+            lambda i: repository.save(quizzes[i % len(quizzes)]), iterations
+        ),
+        "repository.get": time_calls(
+            lambda i: repository.get(quizzes[i % len(quizzes)].quiz_id), iterations
+        ),
+        "remote.generate": time_calls(
+            lambda i: remote.generate(_TOPICS[i % len(_TOPICS)], "medium", 10), iterations
+        ),
+    }
+    remote.close()
+    return results
+
+
+async def _drive(
+    requests: int,
+    concurrency: int,
+    send: Callable[[int], Awaitable[int]],
+) -> dict[str, float]:
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in counter:
+            started = time.perf_counter()
+            status = await send(index)
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result = summarize(latencies, time.perf_counter() - started)
+    result["errors"] = errors
+    return result
+
+
+async def run_load_benchmarks(requests: int, concurrency: int) -> dict[str, dict[str, float]]:
+    from app.main import app
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def generate(index: int) -> int:
+            payload = {
+                "topic": _TOPICS[index % len(_TOPICS)],
+                "difficulty": "medium",
+                "num_questions": 5,
+            }
+            response = await client.post("/api/v1/quizzes/generate", json=payload)
+            return response.status_code
+
+        seeded = [
+            (
+                await client.post(
+                    "/api/v1/quizzes/generate",
+                    json={"topic": topic, "difficulty": "easy", "num_questions": 5},
+                )
+            ).json()["quiz_id"]
+            for topic in _TOPICS
+        ]
+
+        async def get(index: int) -> int:
+            response = await client.get(f"/api/v1/quizzes/{seeded[index % len(seeded)]}")
+            return response.status_code
+
+        return {
+            "http.generate": await _drive(requests, concurrency, generate),
+            "http.get_quiz": await _drive(requests, concurrency, get),
+        }
+
+
+def run_benchmarks(iterations: int, requests: int, concurrency: int) -> dict[str, Any]:
+    results: dict[str, Any] = run_micro_benchmarks(iterations)
+    results.update(asyncio.run(run_load_benchmarks(requests, concurrency)))
+    return {
+        "config": {"iterations": iterations, "requests": requests, "concurrency": concurrency},
+        "results": results,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def check_regressions(report: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    failures = []
+    for name, limits in baseline.get("results", {}).items():
+        measured = report["results"].get(name)
+        if measured is None:
+            failures.append(f"{name}: missing from report")
+            continue
+        if "min_ops_per_sec" in limits and measured["ops_per_sec"] < limits["min_ops_per_sec"]:
+            failures.append(
+                f"{name}: {measured['ops_per_sec']} ops/s below {limits['min_ops_per_sec']}"
+            )
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            limit = limits.get(f"max_{key}")
+            if limit is not None and measured[key] > limit:
+                failures.append(f"{name}: {key} {measured[key]} above {limit}")
+        if "max_errors" in limits and measured.get("errors", 0) > limits["max_errors"]:
+            failures.append(f"{name}: {measured['errors']} errors above {limits['max_errors']}")
+    max_rss = baseline.get("max_peak_rss_mb")
+    if max_rss is not None and report["peak_rss_mb"] > max_rss:
+        failures.append(f"peak_rss_mb: {report['peak_rss_mb']} above {max_rss}")
+    return failures
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Examifyr backend benchmarks")
+    parser.add_argument("--iterations", type=int, default=2000, help="calls per micro-benchmark")
+    parser.add_argument("--requests", type=int, default=500, help="HTTP requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent HTTP clients")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument(
+        "--baseline",
+        default=str(DEFAULT_BASELINE_PATH),
+        help="thresholds to enforce (pass an empty string to skip)",
+    )
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.iterations, args.requests, args.concurrency)
+    failures: list[str] = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        failures = check_regressions(report, baseline)
+    report["regressions"] = failures
+
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(rendered + "\n", encoding="utf-8")
+    print(rendered)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+"""Gunicorn hooks; gunicorn loads this file from the working directory."""
+
+from app.metrics import wipe_multiprocess_directory
+from app.settings import Settings
+
+
+def on_starting(server) -> None:
+    settings = Settings.from_env()
+    # Runs once in the master before any worker exists, so snapshots left by
+    # the previous run's workers cannot leak into this run's totals.
+    if settings.metrics_dir:
+        wipe_multiprocess_directory(settings.metrics_dir)
+    if server.cfg.workers > 1 and settings.repository_backend != "sqlite":
+        server.log.warning(
+            "Idempotency-Key is remembered per worker with the %s repository; "
+            "a retry that reaches another worker generates a new quiz. "
+            "Use EXAMIFYR_REPOSITORY_BACKEND=sqlite to share keys between workers.",
+            settings.repository_backend,
+        )
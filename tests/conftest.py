@@ -1,7 +1,40 @@
 import os
 import sys
+from datetime import datetime
+from uuid import uuid4
 
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
+
+from app.quiz.generator import DeterministicQuizGenerator  # noqa: E402
+from app.quiz.models import QuizGenerateResponse  # noqa: E402
+
+_GENERATOR = DeterministicQuizGenerator()
+
+
+class FakeClock:
+    """Stands in for ``time.monotonic``-style clocks; tests move ``now`` by hand."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_quiz(
+    topic: str = "python lists",
+    difficulty: str = "easy",
+    num_questions: int = 2,
+    created_at: datetime | None = None,
+) -> QuizGenerateResponse:
+    extra = {} if created_at is None else {"created_at": created_at}
+    return QuizGenerateResponse(
+        quiz_id=uuid4(),
+        topic=topic,
+        difficulty=difficulty,
+        questions=_GENERATOR.generate(topic, difficulty, num_questions),
+        **extra,
+    )
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.admission import AdaptiveLimit, AdmissionMiddleware, AdmissionQueue, OverloadedError
+from app.main import classify_route
+
+from conftest import FakeClock
+
+
+def test_adaptive_limit_grows_when_fast_and_backs_off_once_per_window() -> None:
+    clock = FakeClock()
+    limit = AdaptiveLimit(initial=4, max_limit=8, target_latency=1.0, backoff=0.5, clock=clock)
+
+    limit.record(2.0)
+    limit.record(2.0)
+    assert limit.value == 2
+    clock.now = 1.0
+    limit.record(2.0)
+    assert limit.value == 1
+
+    for _ in range(100):
+        limit.record(0.01)
+    assert limit.value == 8
+
+
+@pytest.mark.asyncio
+async def test_queue_hands_slots_to_waiters_and_sheds_when_full() -> None:
+    queue = AdmissionQueue(
+        AdaptiveLimit(initial=1, max_limit=1, target_latency=1.0), max_queue=1, queue_timeout=5
+    )
+    await queue.acquire()
+    waiter = asyncio.create_task(queue.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(OverloadedError) as excinfo:
+        await queue.acquire()
+    assert excinfo.value.reason == "queue_full"
+    assert queue.depth == 1
+
+    queue.release(0.01)
+    await waiter
+    assert (queue.in_flight, queue.depth) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_has_a_deadline() -> None:
+    queue = AdmissionQueue(
+        AdaptiveLimit(initial=1, max_limit=1, target_latency=1.0), max_queue=4, queue_timeout=0.01
+    )
+    await queue.acquire()
+
+    with pytest.raises(OverloadedError) as excinfo:
+        await queue.acquire()
+    assert excinfo.value.reason == "queue_timeout"
+    assert (queue.in_flight, queue.depth) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_middleware_returns_fast_503_and_never_sheds_exempt_routes() -> None:
+    release = asyncio.Event()
+
+    async def slow_app(scope, receive, send):
+        if scope["path"] == "/slow":
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    queue = AdmissionQueue(
+        AdaptiveLimit(initial=1, max_limit=1, target_latency=1.0), max_queue=0, queue_timeout=1
+    )
+    app = AdmissionMiddleware(
+        slow_app,
+        queues={"heavy": queue},
+        classify=lambda method, path: None if path == "/health" else "heavy",
+    )
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.01)
+        shed = await client.get("/slow")
+        health = await client.get("/health")
+        release.set()
+        admitted = await first
+
+    assert admitted.status_code == 200
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == "1"
+    assert health.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_latency_stops_at_response_start_so_slow_bodies_do_not_back_off() -> None:
+    async def streaming_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await asyncio.sleep(0.05)
+        await send({"type": "http.response.body", "body": b"chunk", "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    limit = AdaptiveLimit(initial=4, max_limit=8, target_latency=0.02)
+    queue = AdmissionQueue(limit, max_queue=0, queue_timeout=1)
+    app = AdmissionMiddleware(
+        streaming_app, queues={"stream": queue}, classify=lambda method, path: "stream"
+    )
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/v1/quizzes/generate:stream")
+
+    assert response.status_code == 200
+    assert limit.value == 4  # a full-duration 50ms sample would have cut it to 3
+    assert queue.in_flight == 0
+
+
+def test_route_classes() -> None:
+    assert classify_route("GET", "/health") is None
+    assert classify_route("GET", "/version") is None
+    assert classify_route("POST", "/api/v1/quizzes/generate") == "heavy"
+    assert classify_route("POST", "/api/v1/quizzes/generate:batch") == "heavy"
+    assert classify_route("POST", "/api/v1/quizzes/generate:stream") == "stream"
+    assert classify_route("GET", "/api/v1/quizzes/abc") == "light"
@@ -0,0 +1,183 @@
+import itertools
+import logging
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+
+from app.logging_config import EnqueueOnlyHandler
+import app.main as main
+from app.main import create_app, precompute_specs
+from app.quiz.bank import InMemoryQuestionBank
+from app.quiz.stats import DecayingTopK
+from app.settings import Settings
+
+PAYLOAD = {"topic": "python lists", "difficulty": "easy", "num_questions": 3}
+
+
+def _wait_until_ready(client: TestClient) -> int:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        status = client.get("/ready").status_code
+        if status == 200:
+            return status
+        time.sleep(0.01)
+    return status
+
+
+@pytest.mark.asyncio
+async def test_apps_do_not_share_state() -> None:
+    first = create_app(Settings(prewarm_top_topics=0))
+    second = create_app(Settings(prewarm_top_topics=0, repository_backend="bounded"))
+
+    async with AsyncClient(transport=ASGITransport(app=first), base_url="http://test") as client:
+        created = await client.post("/api/v1/quizzes/generate", json=PAYLOAD)
+    quiz_id = created.json()["quiz_id"]
+    async with AsyncClient(transport=ASGITransport(app=second), base_url="http://test") as client:
+        missing = await client.get(f"/api/v1/quizzes/{quiz_id}")
+        second_metrics = (await client.get("/metrics")).text
+    async with AsyncClient(transport=ASGITransport(app=first), base_url="http://test") as client:
+        first_metrics = (await client.get("/metrics")).text
+
+    assert created.status_code == 200
+    assert missing.status_code == 404
+    assert "examifyr_repository_quizzes 1" in first_metrics
+    assert "examifyr_repository_quizzes 0" in second_metrics
+
+
+@pytest.mark.asyncio
+async def test_sqlite_repository_calls_run_in_the_threadpool(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = Settings(
+        prewarm_top_topics=0,
+        repository_backend="sqlite",
+        sqlite_path=str(tmp_path / "quizzes.sqlite3"),
+    )
+    app = create_app(settings)
+    offloaded = []
+
+    async def recording_threadpool(func, *args, **kwargs):
+        offloaded.append(func.__name__)
+        return func(*args, **kwargs)
+
+    monkeypatch.setattr(main, "run_in_threadpool", recording_threadpool)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        created = await client.post("/api/v1/quizzes/generate", json=PAYLOAD)
+        fetched = await client.get(f"/api/v1/quizzes/{created.json()['quiz_id']}")
+
+    assert app.state.services.offload_repository is True
+    assert fetched.status_code == 200
+    assert offloaded == ["generate_quiz", "get_or_load"]
+
+
+def test_ready_waits_for_warm_up() -> None:
+    app = create_app(Settings(prewarm_top_topics=4))
+
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+        assert _wait_until_ready(client) == 200
+        assert client.get("/ready").json() == {"status": "ready"}
+
+    assert app.state.ready is False
+
+
+@pytest.mark.asyncio
+async def test_ready_reports_warming_up_before_startup() -> None:
+    app = create_app(Settings(prewarm_top_topics=0))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json() == {"status": "warming_up"}
+
+
+def test_precompute_specs_put_hot_topics_first() -> None:
+    bank = InMemoryQuestionBank.default()
+    stats = DecayingTopK()
+    stats.record(("rust ownership", "hard"))
+    settings = Settings(precompute_max_topics=2)
+
+    specs = precompute_specs(settings, bank, stats)
+
+    topics = list(dict.fromkeys(topic for topic, _, _ in specs))
+    assert topics == ["rust ownership", next(iter(bank.topics()))]
+    assert len(specs) == 2 * 3 * 2
+
+
+def test_precompute_specs_stop_reading_bank_topics_at_the_cap() -> None:
+    read = []
+
+    class EndlessBank:
+        def topics(self):
+            for index in itertools.count():
+                read.append(index)
+                yield f"topic {index // 2}"
+
+    specs = precompute_specs(Settings(precompute_max_topics=3), EndlessBank(), DecayingTopK())
+
+    assert [topic for topic, _, _ in specs[::6]] == ["topic 0", "topic 1", "topic 2"]
+    assert len(read) == 5
+
+
+def test_async_log_listener_runs_only_inside_the_lifespan() -> None:
+    app_logger = logging.getLogger("app")
+    app = create_app(Settings(prewarm_top_topics=0, log_mode="async"))
+    assert not any(isinstance(h, EnqueueOnlyHandler) for h in app_logger.handlers)
+
+    with TestClient(app):
+        assert any(isinstance(h, EnqueueOnlyHandler) for h in app_logger.handlers)
+
+    assert not any(isinstance(h, EnqueueOnlyHandler) for h in app_logger.handlers)
+    assert app_logger.propagate is True
+
+
+def test_failing_snapshot_save_still_stops_the_log_listener(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    def failing_save(path: str, hitters: object) -> bool:
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(main, "save_topic_snapshot", failing_save)
+    app_logger = logging.getLogger("app")
+    settings = Settings(
+        prewarm_top_topics=0, log_mode="async", topic_stats_path=str(tmp_path / "topics.json")
+    )
+
+    with TestClient(create_app(settings)):
+        pass
+
+    assert not any(isinstance(h, EnqueueOnlyHandler) for h in app_logger.handlers)
+    assert app_logger.propagate is True
+
+
+def test_failing_prewarm_keeps_running_and_shutdown_completes(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    calls = 0
+
+    def failing_prewarm(services: object) -> int:
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("bank unavailable")
+
+    monkeypatch.setattr(main, "prewarm_hot_topics", failing_prewarm)
+    snapshot = tmp_path / "topics.json"
+    app = create_app(Settings(prewarm_interval_seconds=0.01, topic_stats_path=str(snapshot)))
+
+    with TestClient(app) as client:
+        assert _wait_until_ready(client) == 200
+        deadline = time.monotonic() + 5
+        while calls < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert calls >= 3
+    assert snapshot.exists()
+
+
+def test_settings_reject_non_positive_prewarm_interval() -> None:
+    with pytest.raises(ValueError):
+        Settings.from_env({"EXAMIFYR_PREWARM_INTERVAL_SECONDS": "0"})
@@ -0,0 +1,48 @@
+from benchmarks.run import check_regressions, percentile, run_benchmarks
+
+
+def test_benchmark_report_shape() -> None:
+    report = run_benchmarks(iterations=20, requests=8, concurrency=2)
+
+    assert set(report["results"]) == {
+        "generator.generate",
+        "generator.build_choices",
+        "normalize_topic",
+        "repository.save",
+        "repository.get",
+        "remote.generate",
+        "http.generate",
+        "http.get_quiz",
+    }
+    for result in report["results"].values():
+        assert result["ops_per_sec"] > 0
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+    assert report["results"]["http.get_quiz"]["errors"] == 0
+    assert report["peak_rss_mb"] > 0
+
+
+def test_check_regressions_flags_threshold_violations() -> None:
+    report = {
+        "results": {"http.get_quiz": {"ops_per_sec": 50, "p50_ms": 1, "p95_ms": 2, "p99_ms": 30}},
+        "peak_rss_mb": 500,
+    }
+    baseline = {
+        "results": {
+            "http.get_quiz": {"min_ops_per_sec": 100, "max_p99_ms": 10},
+            "repository.get": {"min_ops_per_sec": 1},
+        },
+        "max_peak_rss_mb": 400,
+    }
+
+    failures = check_regressions(report, baseline)
+
+    assert len(failures) == 4
+    assert check_regressions(report, {"results": {}}) == []
+
+
+def test_percentile_rounds_to_nearest_rank() -> None:
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 0.5) == 51.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) == 0.0
@@ -0,0 +1,67 @@
+import pytest
+
+from app.quiz.generator import DeterministicQuizGenerator
+from app.settings import Settings
+
+
+@pytest.mark.parametrize("topic", ["python lists", "Quantum Basket Weaving"])
+def test_counter_engine_supports_random_access(topic: str) -> None:
+    generator = DeterministicQuizGenerator(engine="counter")
+    quiz = generator.generate(topic, "medium", 40)
+
+    assert generator.generate(topic, "medium", 40) == quiz
+    assert generator.question_at(topic, "medium", 40, 27) == quiz[27]
+    assert list(generator.iter_range(topic, "medium", 40, 10, 15)) == quiz[10:15]
+    for question in quiz:
+        assert question.choices[question.answer_index] in question.choices
+        assert len(set(question.choices)) == 4
+
+
+def test_counter_engine_cycles_through_bank_before_repeating() -> None:
+    generator = DeterministicQuizGenerator(engine="counter")
+    bank_size = len(generator._bank.get("python lists"))
+    quiz = generator.generate("python lists", "easy", bank_size * 2)
+
+    first_cycle = [question.question for question in quiz[:bank_size]]
+    assert len(set(first_cycle)) == bank_size
+    assert [question.question for question in quiz[bank_size:]] == first_cycle
+
+
+def test_sequential_engine_is_the_compatible_default() -> None:
+    default = DeterministicQuizGenerator()
+    counter = DeterministicQuizGenerator(engine="counter")
+
+    assert default.engine == "sequential"
+    assert default.version != counter.version
+    quiz = default.generate("sql basics", "hard", 8)
+    assert default.question_at("sql basics", "hard", 8, 5) == quiz[5]
+    with pytest.raises(IndexError):
+        default.question_at("sql basics", "hard", 8, 8)
+
+
+def test_distinct_choices_dedupes_and_pads_with_fallbacks() -> None:
+    choices = DeterministicQuizGenerator._distinct_choices("a", ["b", "a", "b", "c"])
+
+    assert choices == ["a", "b", "c", "None of the above."]
+
+
+def test_settings_reject_unknown_generation_engine() -> None:
+    assert Settings.from_env({"EXAMIFYR_GENERATION_ENGINE": "counter"}).generation_engine == "counter"
+    with pytest.raises(ValueError):
+        Settings.from_env({"EXAMIFYR_GENERATION_ENGINE": "numpy"})
+
+
+@pytest.mark.parametrize("engine", ["sequential", "counter"])
+def test_precomputed_artifacts_do_not_change_output(engine: str) -> None:
+    specs = [
+        (topic, difficulty, num_questions)
+        for topic in ("python lists", "Quantum Basket Weaving")
+        for difficulty in ("easy", "hard")
+        for num_questions in (5, 13)
+    ]
+    cold = DeterministicQuizGenerator(engine=engine)
+    warm = DeterministicQuizGenerator(engine=engine)
+
+    assert warm.precompute(specs) == len(specs)
+    for spec in specs:
+        assert warm.generate(*spec) == cold.generate(*spec)
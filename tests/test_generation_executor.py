@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.quiz.executor import GenerationExecutor, GenerationTimeoutError
+from app.quiz.generator import DeterministicQuizGenerator
+
+
+class SlowGenerator(DeterministicQuizGenerator):
+    def __init__(self, delay_seconds: float) -> None:
+        super().__init__()
+        self.delay_seconds = delay_seconds
+        self.calls = 0
+        self._release = threading.Event()
+
+    def generate(self, topic, difficulty, num_questions):
+        self.calls += 1
+        self._release.wait(self.delay_seconds)
+        return super().generate(topic, difficulty, num_questions)
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_requests_share_one_generation() -> None:
+    generator = SlowGenerator(delay_seconds=0.05)
+    executor = GenerationExecutor(generator, max_workers=4)
+
+    results = await asyncio.gather(
+        *(executor.generate("python lists", "easy", 3) for _ in range(20)),
+        executor.generate("sql basics", "easy", 3),
+    )
+
+    assert generator.calls == 2
+    assert all(result == results[0] for result in results[:20])
+    assert results[0] is not results[1]
+    assert executor.in_flight == 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_generation_timeout_raises_without_cancelling_shared_work() -> None:
+    generator = SlowGenerator(delay_seconds=0.2)
+    executor = GenerationExecutor(generator, max_workers=1, timeout_seconds=0.01)
+
+    with pytest.raises(GenerationTimeoutError):
+        await executor.generate("python dicts", "hard", 2)
+
+    generator.delay_seconds = 0
+    executor._timeout_seconds = 1.0
+    questions = await executor.generate("python dicts", "hard", 2)
+
+    assert len(questions) == 2
+    assert generator.calls == 1
+    executor.shutdown()
@@ -0,0 +1,68 @@
+import gzip
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.http_cache import QuizRepresentation, negotiate_encoding
+from app.main import app
+
+
+def test_negotiate_encoding_honours_weights() -> None:
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("*") is not None
+
+
+def test_representation_compresses_once() -> None:
+    representation = QuizRepresentation(b'{"questions": "' + b"x" * 1024 + b'"}')
+
+    first, encoding = representation.encoded("gzip")
+    second, _ = representation.encoded("gzip")
+
+    assert encoding == "gzip"
+    assert first is second
+    assert gzip.decompress(first) == representation.body
+    assert representation.encoded(None) == (representation.body, None)
+
+
+@pytest.mark.asyncio
+async def test_get_quiz_sends_validators_and_honours_if_none_match() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        payload = {"topic": "python dicts", "difficulty": "easy", "num_questions": 3}
+        quiz_id = (await client.post("/api/v1/quizzes/generate", json=payload)).json()["quiz_id"]
+
+        first = await client.get(
+            f"/api/v1/quizzes/{quiz_id}", headers={"Accept-Encoding": "identity"}
+        )
+        etag = first.headers["etag"]
+        revalidated = await client.get(
+            f"/api/v1/quizzes/{quiz_id}",
+            headers={"Accept-Encoding": "identity", "If-None-Match": etag},
+        )
+
+    assert first.status_code == 200
+    assert "immutable" in first.headers["cache-control"]
+    assert "content-encoding" not in first.headers
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_get_quiz_serves_gzip_variant() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        payload = {"topic": "python functions", "difficulty": "hard", "num_questions": 5}
+        created = (await client.post("/api/v1/quizzes/generate", json=payload)).json()
+
+        response = await client.get(
+            f"/api/v1/quizzes/{created['quiz_id']}", headers={"Accept-Encoding": "gzip"}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == created
@@ -0,0 +1,165 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.idempotency import IdempotencyConflictError, IdempotencyStore, SqliteIdempotencyStore
+from app.main import app, create_app
+from app.settings import Settings
+
+from conftest import FakeClock
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_share_one_run() -> None:
+    store: IdempotencyStore[int] = IdempotencyStore()
+    calls = 0
+    release = asyncio.Event()
+
+    async def operation() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 42
+
+    first = asyncio.create_task(store.run("key", "a", operation))
+    second = asyncio.create_task(store.run("key", "a", operation))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first == (42, False)
+    assert await second == (42, True)
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_keys_expire_and_failures_are_forgotten() -> None:
+    clock = FakeClock()
+    store: IdempotencyStore[int] = IdempotencyStore(ttl_seconds=10, clock=clock)
+
+    async def fail() -> int:
+        raise RuntimeError("boom")
+
+    async def succeed() -> int:
+        return 1
+
+    with pytest.raises(RuntimeError):
+        await store.run("key", "a", fail)
+    assert await store.run("key", "a", succeed) == (1, False)
+    with pytest.raises(IdempotencyConflictError):
+        await store.run("key", "b", succeed)
+    clock.now = 10
+    assert await store.run("key", "b", succeed) == (1, False)
+
+
+def _shared_store(path: Path, clock: FakeClock) -> SqliteIdempotencyStore[int]:
+    return SqliteIdempotencyStore(
+        str(path),
+        encode=lambda value: str(value).encode("ascii"),
+        decode=int,
+        ttl_seconds=10,
+        abandoned_after_seconds=5,
+        poll_interval_seconds=0.001,
+        clock=clock,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sqlite_keys_are_shared_between_workers(tmp_path: Path) -> None:
+    clock = FakeClock()
+    first = _shared_store(tmp_path / "shared.sqlite3", clock)
+    second = _shared_store(tmp_path / "shared.sqlite3", clock)
+    calls = 0
+    release = asyncio.Event()
+
+    async def operation() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 42
+
+    running = asyncio.create_task(first.run("key", "a", operation))
+    await asyncio.sleep(0.01)
+    waiting = asyncio.create_task(second.run("key", "a", operation))
+    await asyncio.sleep(0.01)
+    release.set()
+
+    assert await running == (42, False)
+    assert await waiting == (42, True)
+    assert calls == 1
+    with pytest.raises(IdempotencyConflictError):
+        await second.run("key", "b", operation)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_keys_expire_and_failed_or_abandoned_runs_are_released(
+    tmp_path: Path,
+) -> None:
+    clock = FakeClock()
+    first = _shared_store(tmp_path / "shared.sqlite3", clock)
+    second = _shared_store(tmp_path / "shared.sqlite3", clock)
+
+    async def fail() -> int:
+        raise RuntimeError("boom")
+
+    async def succeed() -> int:
+        return 1
+
+    with pytest.raises(RuntimeError):
+        await first.run("failed", "a", fail)
+    assert await second.run("failed", "a", succeed) == (1, False)
+
+    clock.now = 10
+    assert await second.run("failed", "b", succeed) == (1, False)
+
+    # A worker that dies mid-request leaves its claim without a response.
+    assert first._claim("abandoned", "a") is None
+    clock.now = 15
+    assert await second.run("abandoned", "a", succeed) == (1, False)
+
+
+@pytest.mark.asyncio
+async def test_generate_replays_response_for_repeated_key() -> None:
+    transport = ASGITransport(app=app)
+    payload = {"topic": "python dicts", "difficulty": "medium", "num_questions": 2}
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        headers = {"Idempotency-Key": "retry-test-1"}
+        first, second = await asyncio.gather(
+            client.post("/api/v1/quizzes/generate", json=payload, headers=headers),
+            client.post("/api/v1/quizzes/generate", json=payload, headers=headers),
+        )
+        conflict = await client.post(
+            "/api/v1/quizzes/generate",
+            json={**payload, "num_questions": 3},
+            headers=headers,
+        )
+        unkeyed = await client.post("/api/v1/quizzes/generate", json=payload)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    replayed = {response.headers.get("idempotent-replayed") for response in (first, second)}
+    assert replayed == {None, "true"}
+    assert conflict.status_code == 409
+    assert unkeyed.json()["quiz_id"] != first.json()["quiz_id"]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backed_workers_replay_each_others_keys(tmp_path: Path) -> None:
+    settings = Settings(
+        prewarm_top_topics=0,
+        repository_backend="sqlite",
+        sqlite_path=str(tmp_path / "quizzes.sqlite3"),
+    )
+    payload = {"topic": "python dicts", "difficulty": "medium", "num_questions": 2}
+    headers = {"Idempotency-Key": "retry-across-workers"}
+    responses = []
+    for worker in (create_app(settings), create_app(settings)):
+        transport = ASGITransport(app=worker)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            responses.append(
+                await client.post("/api/v1/quizzes/generate", json=payload, headers=headers)
+            )
+
+    assert responses[1].json() == responses[0].json()
+    assert responses[1].headers["idempotent-replayed"] == "true"
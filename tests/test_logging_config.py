@@ -0,0 +1,90 @@
+import io
+import json
+import logging
+import queue
+
+from app.logging_config import (
+    EnqueueOnlyHandler,
+    JsonLineFormatter,
+    SamplingFilter,
+    configure_async_logging,
+    parse_sample_rates,
+    stop_listener,
+)
+
+
+def _record(message: str, level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("app.quiz.service", level, __file__, 1, message, None, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def test_json_formatter_includes_extra_fields() -> None:
+    line = JsonLineFormatter().format(_record("Quiz generated successfully", quiz_id="abc"))
+
+    payload = json.loads(line)
+    assert payload["message"] == "Quiz generated successfully"
+    assert payload["level"] == "INFO"
+    assert payload["quiz_id"] == "abc"
+    assert "\n" not in line
+
+
+def test_sampling_filter_keeps_fraction_and_all_warnings() -> None:
+    sampling = SamplingFilter({"Quiz retrieved successfully": 0.25})
+
+    kept = [sampling.filter(_record("Quiz retrieved successfully")) for _ in range(8)]
+    warnings = [
+        sampling.filter(_record("Quiz retrieved successfully", logging.WARNING)) for _ in range(8)
+    ]
+
+    assert kept.count(True) == 2
+    assert all(warnings)
+    assert sampling.filter(_record("Generating quiz"))
+
+
+def test_rate_limit_applies_per_message() -> None:
+    sampling = SamplingFilter(max_per_second=3)
+
+    kept = [sampling.filter(_record("Generating quiz")) for _ in range(10)]
+
+    assert kept.count(True) == 3
+    assert sampling.filter(_record("Quiz not found", logging.WARNING))
+    assert sampling.dropped == 7
+
+
+def test_enqueue_only_handler_drops_info_when_full() -> None:
+    handler = EnqueueOnlyHandler(queue.Queue(maxsize=1))
+
+    handler.handle(_record("first"))
+    handler.handle(_record("second"))
+
+    assert handler.dropped == 1
+    assert handler.queue.get_nowait().getMessage() == "first"
+
+
+def test_configure_async_logging_writes_json_lines_from_background_thread() -> None:
+    stream = io.StringIO()
+    listener = configure_async_logging(
+        logger_name="app.tests.async_logging",
+        sample_rates={"Quiz retrieved successfully": 0},
+        stream=stream,
+    )
+    logger = logging.getLogger("app.tests.async_logging")
+
+    logger.info("Quiz retrieved successfully", extra={"quiz_id": "1"})
+    logger.warning("Quiz not found", extra={"quiz_id": "2"})
+    logger.info("Generating quiz", extra={"topic": "sql basics"})
+    stop_listener(listener)
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["message"] for line in lines] == ["Quiz not found", "Generating quiz"]
+    assert lines[1]["topic"] == "sql basics"
+
+
+def test_parse_sample_rates() -> None:
+    assert parse_sample_rates("Quiz retrieved successfully=0.1;Generating quiz=0.5") == {
+        "Quiz retrieved successfully": 0.1,
+        "Generating quiz": 0.5,
+    }
+    assert parse_sample_rates("") == {}
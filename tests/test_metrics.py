@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.metrics import MetricsRegistry, wipe_multiprocess_directory
+from app.quiz.generator import DeterministicQuizGenerator
+from app.quiz.models import QuizGenerateResponse
+from app.quiz.sqlite_repo import SqliteQuizRepository
+
+_GENERATED_QUIZ = QuizGenerateResponse(
+    quiz_id=uuid4(),
+    topic="sql basics",
+    difficulty="easy",
+    questions=DeterministicQuizGenerator().generate("sql basics", "easy", 2),
+)
+
+
+def test_registry_renders_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    requests = registry.counter("demo_requests_total", "Requests.", ("route",))
+    latency = registry.histogram("demo_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    in_flight = registry.gauge("demo_in_flight", "In flight.")
+
+    requests.inc("/a")
+    requests.inc("/a")
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+    in_flight.set_function(lambda: 3)
+
+    text = registry.render()
+
+    assert "# TYPE demo_requests_total counter" in text
+    assert 'demo_requests_total{route="/a"} 2' in text
+    assert 'demo_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'demo_latency_seconds_bucket{le="1"} 2' in text
+    assert 'demo_latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "demo_latency_seconds_count 3" in text
+    assert "demo_in_flight 3" in text
+
+
+def test_multiprocess_mode_merges_worker_snapshots(tmp_path: Path) -> None:
+    registry = MetricsRegistry()
+    registry.enable_multiprocess(tmp_path)
+    requests = registry.counter("demo_requests_total", "Requests.")
+    in_flight = registry.gauge("demo_in_flight", "In flight.")
+    requests.inc(amount=2)
+    in_flight.set(1)
+
+    exited_pid = 2**22 + 12345
+    (tmp_path / f"metrics-{exited_pid}.json").write_text(
+        '{"demo_requests_total": [[[], 5]], "demo_in_flight": [[[], 7]]}', encoding="utf-8"
+    )
+
+    text = registry.render()
+
+    assert "demo_requests_total 7" in text
+    assert "demo_in_flight 1" in text
+    assert (tmp_path / f"metrics-{os.getpid()}.json").exists()
+
+
+def test_flush_thread_writes_snapshots_without_requests(tmp_path: Path) -> None:
+    registry = MetricsRegistry()
+    registry.enable_multiprocess(tmp_path, flush_interval=0.01)
+    registry.counter("demo_requests_total", "Requests.").inc()
+    snapshot = tmp_path / f"metrics-{os.getpid()}.json"
+
+    registry.start_flushing()
+    deadline = time.monotonic() + 5
+    while not snapshot.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    registry.stop_flushing()
+
+    assert snapshot.exists()
+    assert not any(thread.name == "metrics-flush" for thread in threading.enumerate())
+
+
+def test_wipe_removes_snapshots_from_a_previous_run(tmp_path: Path) -> None:
+    (tmp_path / "metrics-123.json").write_text("{}", encoding="utf-8")
+    (tmp_path / ".metrics-123.json.tmp").write_text("{}", encoding="utf-8")
+    (tmp_path / "app-metrics-123.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "unrelated.txt").write_text("keep", encoding="utf-8")
+
+    wipe_multiprocess_directory(tmp_path)
+
+    assert [path.name for path in tmp_path.iterdir()] == ["unrelated.txt"]
+
+
+def test_sqlite_quiz_count_is_cached_between_refreshes(tmp_path: Path) -> None:
+    repository = SqliteQuizRepository(str(tmp_path / "quizzes.sqlite3"))
+    assert repository.cached_len(max_age_seconds=60) == 0
+    repository.save(_GENERATED_QUIZ)
+
+    assert repository.cached_len(max_age_seconds=60) == 0
+    assert repository.cached_len(max_age_seconds=0) == 1
+    repository.close()
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_route_and_stage_latency() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        payload = {"topic": "python lists", "difficulty": "easy", "num_questions": 2}
+        quiz_id = (await client.post("/api/v1/quizzes/generate", json=payload)).json()["quiz_id"]
+        await client.get(f"/api/v1/quizzes/{quiz_id}")
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert (
+        'examifyr_http_request_duration_seconds_count{route="/api/v1/quizzes/{quiz_id}",'
+        'method="GET",status="200"}' in text
+    )
+    for stage in ("normalize_topic", "generate", "repository_save", "repository_get"):
+        assert f'examifyr_stage_duration_seconds_count{{stage="{stage}"}}' in text
+    assert "examifyr_repository_quizzes " in text
+    assert "examifyr_http_requests_in_flight 1" in text
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pytest
+
+from app.quiz.bank import (
+    DEFAULT_BANK_PATH,
+    BankFormatError,
+    InMemoryQuestionBank,
+    MappedQuestionBank,
+    QuestionBankItem,
+    compile_bank,
+    load_bank_source,
+    main,
+)
+from app.quiz.generator import DeterministicQuizGenerator
+
+
+def test_compiled_bank_matches_source(tmp_path: Path) -> None:
+    source = InMemoryQuestionBank.default()
+    path = tmp_path / "bank.exqb"
+    compile_bank({topic: source.get(topic) for topic in source.topics()}, path)
+
+    mapped = MappedQuestionBank(path)
+
+    assert sorted(mapped.topics()) == sorted(source.topics())
+    for topic in source.topics():
+        assert mapped.get(topic) == tuple(source.get(topic))
+    assert mapped.get("unknown topic") is None
+    assert mapped.fingerprint == source.fingerprint
+    mapped.close()
+
+
+def test_generator_output_is_identical_with_mapped_bank(tmp_path: Path) -> None:
+    path = tmp_path / "bank.exqb"
+    main(["compile", str(DEFAULT_BANK_PATH), str(path)])
+    mapped = DeterministicQuizGenerator(MappedQuestionBank(path))
+    in_memory = DeterministicQuizGenerator()
+
+    for topic in ("python lists", "sql basics", "Linear Algebra"):
+        assert mapped.generate(topic, "medium", 7) == in_memory.generate(topic, "medium", 7)
+    assert mapped.version == in_memory.version
+
+
+def test_compiled_bank_handles_many_topics(tmp_path: Path) -> None:
+    bank = {
+        f"topic {index:05d}": [
+            QuestionBankItem(
+                question=f"Question {index}?",
+                correct="Shared correct answer.",
+                distractors=["Shared distractor A.", "Shared distractor B.", f"Unique {index}."],
+                explanation="Shared explanation.",
+            )
+        ]
+        for index in range(2000)
+    }
+    path = tmp_path / "bank.exqb"
+    compile_bank(bank, path)
+
+    mapped = MappedQuestionBank(path)
+
+    assert mapped.get("topic 01234")[0].question == "Question 1234?"
+    assert mapped.get("topic 01234")[0].distractors[2] == "Unique 1234."
+    assert mapped.get("topic 99999") is None
+    mapped.close()
+
+
+def test_invalid_bank_files_are_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "bank.exqb"
+    path.write_bytes(b"not a bank" * 20)
+    with pytest.raises(BankFormatError):
+        MappedQuestionBank(path)
+
+    source = tmp_path / "bank.json"
+    source.write_text('{"topic": [{"question": "Missing fields"}]}', encoding="utf-8")
+    with pytest.raises(BankFormatError):
+        load_bank_source(source)
@@ -0,0 +1,83 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.quiz.generator import DeterministicQuizGenerator
+from app.quiz.repo import InMemoryQuizRepository
+from app.quiz.service import QuizService
+
+
+class CountingGenerator(DeterministicQuizGenerator):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def generate(self, topic, difficulty, num_questions):
+        self.calls += 1
+        return super().generate(topic, difficulty, num_questions)
+
+
+class RecordingRepository(InMemoryQuizRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.save_many_calls = 0
+
+    def save_many(self, quizzes):
+        self.save_many_calls += 1
+        super().save_many(quizzes)
+
+
+def test_generate_quizzes_dedupes_specs_and_saves_once() -> None:
+    generator = CountingGenerator()
+    repository = RecordingRepository()
+    service = QuizService(generator=generator, repository=repository)
+    specs = [("python lists", "easy", 3), ("sql basics", "hard", 2), ("python lists", "easy", 3)]
+
+    quizzes = service.generate_quizzes(specs)
+
+    assert generator.calls == 2
+    assert repository.save_many_calls == 1
+    assert len(repository) == 3
+    assert quizzes[0].quiz_id != quizzes[2].quiz_id
+    assert quizzes[0].questions == quizzes[2].questions
+
+
+@pytest.mark.asyncio
+async def test_batch_endpoint_returns_per_item_results() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        payload = {
+            "items": [
+                {"topic": "lists", "difficulty": "easy", "num_questions": 2},
+                {"topic": "   "},
+                {"topic": "SQL", "difficulty": "medium", "num_questions": 1},
+            ]
+        }
+        response = await client.post("/api/v1/quizzes/generate:batch", json=payload)
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == ["ok", "error", "ok"]
+        assert results[0]["quiz"]["topic"] == "python lists"
+        assert results[1]["error"]["details"][0]["loc"] == ["topic"]
+        assert results[2]["quiz"]["topic"] == "sql basics"
+
+        quiz_id = results[0]["quiz"]["quiz_id"]
+        get_response = await client.get(f"/api/v1/quizzes/{quiz_id}")
+        assert get_response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_batch_endpoint_enforces_limits() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        too_many_items = {"items": [{"topic": "Math"}] * 101}
+        too_many_questions = {"items": [{"topic": "Math", "num_questions": 20}] * 51}
+        empty = {"items": []}
+
+        responses = [
+            await client.post("/api/v1/quizzes/generate:batch", json=payload)
+            for payload in (too_many_items, too_many_questions, empty)
+        ]
+
+    assert [response.status_code for response in responses] == [422, 422, 422]
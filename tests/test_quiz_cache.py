@@ -0,0 +1,61 @@
+import pytest
+from pydantic import ValidationError
+
+from app.quiz.cache import QuizContentCache
+from app.quiz.generator import CachingQuizGenerator, DeterministicQuizGenerator
+
+
+def test_caching_generator_matches_uncached_output() -> None:
+    generator = DeterministicQuizGenerator()
+    cached = CachingQuizGenerator(DeterministicQuizGenerator(), QuizContentCache())
+
+    first = cached.generate("python lists", "easy", 3)
+    second = cached.generate("python lists", "easy", 3)
+
+    assert first == generator.generate("python lists", "easy", 3)
+    assert first == second
+    assert first is not second
+    assert all(a is b for a, b in zip(first, second))
+
+    stats = cached.cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.entries == 1
+
+
+def test_cached_questions_are_immutable() -> None:
+    cached = CachingQuizGenerator(DeterministicQuizGenerator(), QuizContentCache())
+    question = cached.generate("sql basics", "hard", 1)[0]
+
+    with pytest.raises(ValidationError):
+        question.answer_index = 0
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = QuizContentCache(max_entries=2)
+    cached = CachingQuizGenerator(DeterministicQuizGenerator(), cache)
+
+    cached.generate("python lists", "easy", 1)
+    cached.generate("python dicts", "easy", 1)
+    cached.generate("python lists", "easy", 1)
+    cached.generate("sql basics", "easy", 1)
+
+    assert cache.get(("python dicts", "easy", 1)) is None
+    assert cache.get(("python lists", "easy", 1)) is not None
+    assert cache.stats().evictions == 1
+
+
+def test_cache_respects_byte_budget_and_invalidation() -> None:
+    cache = QuizContentCache(max_entries=100, max_bytes=4096)
+    cached = CachingQuizGenerator(DeterministicQuizGenerator(), cache)
+
+    for count in range(1, 6):
+        cached.generate("python functions", "medium", count)
+
+    stats = cache.stats()
+    assert stats.size_bytes <= 4096
+    assert stats.evictions > 0
+
+    cache.invalidate()
+    assert cache.stats().entries == 0
+    assert cache.stats().size_bytes == 0
@@ -23,7 +23,7 @@ async def test_generate_quiz_success() -> None:
 
     assert response.status_code == 200
     data = response.json()
-    assert set(data.keys()) == {"quiz_id", "topic", "difficulty", "questions"}
+    assert set(data.keys()) == {"quiz_id", "topic", "difficulty", "questions", "created_at"}
     assert data["topic"] == payload["topic"]
     assert len(data["questions"]) == 3
     for question in data["questions"]:
@@ -102,3 +102,23 @@ async def test_quiz_generation_is_deterministic() -> None:
         assert q1["choices"] == q2["choices"]
         assert q1["answer_index"] == q2["answer_index"]
         assert q1["explanation"] == q2["explanation"]
+
+
+@pytest.mark.asyncio
+async def test_get_quiz_serves_stored_payload_and_documents_schema() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        payload = {"topic": "sql basics", "difficulty": "hard", "num_questions": 2}
+        created = (await _post_quiz(client, payload)).json()
+        get_response = await client.get(f"/api/v1/quizzes/{created['quiz_id']}")
+        schema = (await client.get("/openapi.json")).json()
+
+    assert get_response.headers["content-type"] == "application/json"
+    assert get_response.json() == created
+    operation = schema["paths"]["/api/v1/quizzes/{quiz_id}"]["get"]
+    documented = operation["responses"]["200"]["content"]["application/json"]["schema"]
+    assert documented["anyOf"] == [
+        {"$ref": "#/components/schemas/QuizGenerateResponse"},
+        {"$ref": "#/components/schemas/QuizSheetResponse"},
+    ]
+    assert "$ref" not in documented
@@ -0,0 +1,118 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.quiz.grading import UNANSWERED, AnswerKey, SubmissionLengthError
+from app.quiz.models import MAX_SUBMISSION_ANSWERS
+
+
+def test_answer_key_grades_many_submissions_at_once() -> None:
+    key = AnswerKey(answers=bytes([0, 3, 1]), explanations=("a", "b", "c"))
+
+    graded = key.grade_many([[0, 3, 1], [1, 3, None], [None, None, None]])
+
+    assert graded == [b"\x01\x01\x01", b"\x00\x01\x00", b"\x00\x00\x00"]
+    assert key.grade([0, 0, 1]) == b"\x01\x00\x01"
+    assert UNANSWERED not in key.answers
+
+
+def test_answer_key_rejects_submissions_of_the_wrong_length() -> None:
+    key = AnswerKey(answers=bytes([0, 1]), explanations=("a", "b"))
+
+    with pytest.raises(SubmissionLengthError) as excinfo:
+        key.grade_many([[0, 1], [0]])
+    assert excinfo.value.index == 1
+
+
+async def _create_quiz(client: AsyncClient) -> dict:
+    payload = {"topic": "python lists", "difficulty": "easy", "num_questions": 4}
+    response = await client.post("/api/v1/quizzes/generate", json=payload)
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_submission_is_graded_with_explanations() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        quiz = await _create_quiz(client)
+        answers = [question["answer_index"] for question in quiz["questions"]]
+        answers[1] = (answers[1] + 1) % 4
+        answers[3] = None
+        response = await client.post(
+            f"/api/v1/quizzes/{quiz['quiz_id']}/submissions", json={"answers": answers}
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["score"], data["total"]) == (2, 4)
+    assert [question["correct"] for question in data["questions"]] == [True, False, True, False]
+    assert data["questions"][3]["submitted_index"] is None
+    assert data["questions"][0]["explanation"] == quiz["questions"][0]["explanation"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_submissions_are_scored_per_submission() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        quiz = await _create_quiz(client)
+        perfect = [question["answer_index"] for question in quiz["questions"]]
+        wrong = [(answer + 1) % 4 for answer in perfect]
+        response = await client.post(
+            f"/api/v1/quizzes/{quiz['quiz_id']}/submissions:batch",
+            json={"submissions": [{"answers": perfect}, {"answers": wrong}] * 1000},
+        )
+        mismatched = await client.post(
+            f"/api/v1/quizzes/{quiz['quiz_id']}/submissions:batch",
+            json={"submissions": [{"answers": perfect}, {"answers": perfect[:2]}]},
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["answer_indexes"] == perfect
+    assert len(data["results"]) == 2000
+    assert [result["score"] for result in data["results"][:2]] == [4, 0]
+    assert data["results"][1]["correct"] == [False] * 4
+    assert mismatched.status_code == 422
+    assert "Submission 1" in mismatched.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_submission_for_unknown_quiz_returns_404() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/quizzes/00000000-0000-4000-8000-000000000000/submissions",
+            json={"answers": [0]},
+        )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_submission_longer_than_any_quiz_is_rejected_before_lookup() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/quizzes/00000000-0000-4000-8000-000000000000/submissions",
+            json={"answers": [0] * (MAX_SUBMISSION_ANSWERS + 1)},
+        )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_quiz_can_leave_out_answers() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        quiz = await _create_quiz(client)
+        response = await client.get(
+            f"/api/v1/quizzes/{quiz['quiz_id']}", params={"include_answers": "false"}
+        )
+        full = await client.get(f"/api/v1/quizzes/{quiz['quiz_id']}")
+
+    assert response.status_code == 200
+    sheet = response.json()
+    assert set(sheet["questions"][0]) == {"id", "question", "choices"}
+    assert sheet["questions"][0]["choices"] == quiz["questions"][0]["choices"]
+    assert response.headers["etag"] != full.headers["etag"]
+    assert full.json() == quiz
@@ -0,0 +1,161 @@
+import sqlite3
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.quiz.listing import QuizIndex, listing_key
+from app.quiz.models import QuizGenerateResponse, QuizSummary
+from app.quiz.repo import BoundedInMemoryQuizRepository, InMemoryQuizRepository
+from app.quiz.sqlite_repo import SqliteQuizRepository
+
+from conftest import make_quiz
+
+_START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _quizzes() -> list[QuizGenerateResponse]:
+    topics = ("sql basics", "python lists")
+    difficulties = ("easy", "medium")
+    return [
+        make_quiz(
+            topics[i % 2],
+            difficulties[(i // 2) % 2],
+            created_at=_START + timedelta(minutes=i),
+        )
+        for i in range(20)
+    ]
+
+
+def _walk(repository, topic, difficulty, limit):
+    pages, before = [], None
+    while True:
+        page = repository.list_quizzes(topic, difficulty, limit, before)
+        if not page:
+            return pages
+        pages.append(page)
+        before = listing_key(page[-1])
+
+
+def test_index_pages_newest_first_with_keyset_cursors() -> None:
+    index = QuizIndex()
+    quizzes = _quizzes()
+    for quiz in quizzes:
+        index.add(QuizSummary.from_quiz(quiz))
+
+    first = index.page("sql basics", "medium", 3)
+    second = index.page("sql basics", "medium", 3, before=listing_key(first[-1]))
+
+    expected = [
+        quiz.quiz_id
+        for quiz in reversed(quizzes)
+        if quiz.topic == "sql basics" and quiz.difficulty == "medium"
+    ]
+    assert [summary.quiz_id for summary in first + second] == expected[:5]
+    index.remove(quizzes[-1].quiz_id)
+    assert quizzes[-1].quiz_id not in {summary.quiz_id for summary in index.page(None, None, 50)}
+    assert len(index) == 19
+
+
+def test_index_pages_skip_removed_quizzes() -> None:
+    index = QuizIndex()
+    quizzes = _quizzes()
+    for quiz in quizzes:
+        index.add(QuizSummary.from_quiz(quiz))
+
+    for quiz in quizzes[:7] + quizzes[10:12]:
+        index.remove(quiz.quiz_id)
+    index.add(QuizSummary.from_quiz(quizzes[10]))
+
+    live = [quiz for quiz in reversed(quizzes) if quiz not in quizzes[:7] + quizzes[11:12]]
+    for topic, difficulty in [(None, None), ("sql basics", None), ("python lists", "medium")]:
+        expected = [
+            quiz.quiz_id
+            for quiz in live
+            if topic in (None, quiz.topic) and difficulty in (None, quiz.difficulty)
+        ]
+        pages = _walk(SimpleNamespace(list_quizzes=index.page), topic, difficulty, 2)
+        assert [summary.quiz_id for page in pages for summary in page] == expected
+    assert len(index) == 12
+
+
+@pytest.mark.parametrize("limit", [1, 4, 7])
+def test_sqlite_and_memory_listings_agree(tmp_path: Path, limit: int) -> None:
+    memory = InMemoryQuizRepository()
+    sqlite = SqliteQuizRepository(str(tmp_path / "quizzes.sqlite3"))
+    quizzes = _quizzes()
+    memory.save_many(quizzes)
+    sqlite.save_many(quizzes)
+
+    scopes = [(None, None), ("python lists", None), (None, "easy"), ("sql basics", "easy")]
+    for topic, difficulty in scopes:
+        assert _walk(sqlite, topic, difficulty, limit) == _walk(memory, topic, difficulty, limit)
+    sqlite.close()
+
+
+def test_bounded_repository_drops_evicted_quizzes_from_listing() -> None:
+    repository = BoundedInMemoryQuizRepository(max_entries=5)
+    quizzes = _quizzes()
+    repository.save_many(quizzes)
+
+    listed = repository.list_quizzes(None, None, 50)
+
+    assert [summary.quiz_id for summary in listed] == [quiz.quiz_id for quiz in quizzes[:-6:-1]]
+
+
+def test_sqlite_migrates_version_1_databases(tmp_path: Path) -> None:
+    path = tmp_path / "quizzes.sqlite3"
+    quiz = make_quiz("sql basics", "easy", created_at=_START)
+    legacy = quiz.model_dump_json(exclude={"created_at"}).encode("utf-8")
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE quizzes (quiz_id BLOB PRIMARY KEY, payload BLOB NOT NULL) WITHOUT ROWID"
+    )
+    connection.execute(
+        "INSERT INTO quizzes VALUES (?, ?)", (quiz.quiz_id.bytes, zlib.compress(legacy))
+    )
+    connection.execute("PRAGMA user_version = 1")
+    connection.commit()
+    connection.close()
+
+    repository = SqliteQuizRepository(str(path))
+
+    migrated = repository.get(quiz.quiz_id)
+    assert migrated.questions == quiz.questions
+    assert repository.list_quizzes("sql basics", "easy", 10)[0].created_at == migrated.created_at
+    repository.close()
+
+
+@pytest.mark.asyncio
+async def test_list_quizzes_endpoint_paginates_by_cursor() -> None:
+    transport = ASGITransport(app=app)
+    topic = f"listing {uuid4().hex}"
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = [
+            (
+                await client.post(
+                    "/api/v1/quizzes/generate",
+                    json={"topic": topic, "difficulty": "hard", "num_questions": 1},
+                )
+            ).json()["quiz_id"]
+            for _ in range(5)
+        ]
+        first = (await client.get("/api/v1/quizzes", params={"topic": topic, "limit": 3})).json()
+        second = (
+            await client.get(
+                "/api/v1/quizzes",
+                params={"topic": topic, "limit": 3, "cursor": first["next_cursor"]},
+            )
+        ).json()
+        invalid = await client.get("/api/v1/quizzes", params={"cursor": "not-a-cursor"})
+
+    listed = [item["quiz_id"] for item in first["items"] + second["items"]]
+    assert sorted(listed) == sorted(created)
+    assert second["next_cursor"] is None
+    assert first["items"][0]["created_at"] >= first["items"][-1]["created_at"]
+    assert invalid.status_code == 400
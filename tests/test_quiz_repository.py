@@ -0,0 +1,142 @@
+from uuid import uuid4
+
+from app.http_cache import RepresentationCache
+from app.quiz.generator import DeterministicQuizGenerator
+from app.quiz.grading import AnswerKeyCache
+from app.quiz.models import serialize_quiz
+from app.quiz.repo import BoundedInMemoryQuizRepository, InMemoryQuizRepository, SeedQuizRepository
+
+from conftest import FakeClock, make_quiz
+
+
+def test_bounded_repository_evicts_least_recently_used() -> None:
+    repo = BoundedInMemoryQuizRepository(max_entries=2)
+    first, second, third = make_quiz(), make_quiz(), make_quiz()
+
+    repo.save(first)
+    repo.save(second)
+    assert repo.get(first.quiz_id) == first
+    repo.save(third)
+
+    assert repo.get(second.quiz_id) is None
+    assert repo.get(first.quiz_id) == first
+    assert repo.get(third.quiz_id) == third
+    stats = repo.stats()
+    assert stats.entries == 2
+    assert stats.evictions == 1
+
+
+def test_bounded_repository_enforces_byte_budget() -> None:
+    repo = BoundedInMemoryQuizRepository(max_entries=100, max_bytes=8192)
+    for _ in range(10):
+        repo.save(make_quiz(num_questions=5))
+
+    stats = repo.stats()
+    assert 0 < stats.size_bytes <= 8192
+    assert stats.evictions > 0
+    assert len(repo) == stats.entries
+
+
+def test_bounded_repository_expires_entries_after_ttl() -> None:
+    clock = FakeClock()
+    repo = BoundedInMemoryQuizRepository(ttl_seconds=10, clock=clock)
+    stale, fresh = make_quiz(), make_quiz()
+
+    repo.save(stale)
+    clock.now = 5
+    repo.save(fresh)
+    clock.now = 11
+
+    assert repo.get(stale.quiz_id) is None
+    assert repo.get(fresh.quiz_id) == fresh
+    clock.now = 20
+    repo.save(make_quiz())
+
+    assert repo.get(fresh.quiz_id) is None
+    assert repo.stats().expirations == 2
+    assert repo.stats().entries == 1
+
+
+def test_seed_repository_rebuilds_identical_quiz() -> None:
+    generator = DeterministicQuizGenerator()
+    repo = SeedQuizRepository(generator)
+    quiz = make_quiz("python functions", num_questions=4)
+
+    repo.save(quiz)
+
+    assert repo.get(quiz.quiz_id) == quiz
+    assert repo.get(uuid4()) is None
+    assert len(repo) == 1
+
+
+def test_seed_repository_resolves_records_from_previous_generator() -> None:
+    class ChangedBankGenerator(DeterministicQuizGenerator):
+        @property
+        def version(self) -> str:
+            return "det-changed"
+
+        def generate(self, topic, difficulty, num_questions):
+            return list(reversed(super().generate(topic, difficulty, num_questions)))
+
+    original = DeterministicQuizGenerator()
+    quiz = make_quiz(num_questions=3)
+    old_repo = SeedQuizRepository(original)
+    old_repo.save(quiz)
+
+    new_repo = SeedQuizRepository(ChangedBankGenerator(), previous_generators=[original])
+    new_repo._records = old_repo._records
+
+    assert new_repo.get(quiz.quiz_id) == quiz
+
+    unregistered_repo = SeedQuizRepository(ChangedBankGenerator())
+    unregistered_repo._records = old_repo._records
+    assert unregistered_repo.get(quiz.quiz_id) is None
+
+
+def test_repositories_return_serialized_payload() -> None:
+    quiz = make_quiz()
+    for repo in (
+        InMemoryQuizRepository(),
+        BoundedInMemoryQuizRepository(),
+        SeedQuizRepository(DeterministicQuizGenerator()),
+    ):
+        repo.save(quiz)
+        assert repo.get_json(quiz.quiz_id) == serialize_quiz(quiz)
+        assert repo.get_json(uuid4()) is None
+
+
+def test_caches_drop_quizzes_the_bounded_repository_expired_or_evicted() -> None:
+    clock = FakeClock()
+    repo = BoundedInMemoryQuizRepository(max_entries=3, ttl_seconds=10, clock=clock)
+    representations = RepresentationCache(is_live=repo.contains)
+    answer_keys = AnswerKeyCache(is_live=repo.contains)
+    expiring, evicted = make_quiz(), make_quiz()
+    repo.save(expiring)
+    repo.save(evicted)
+    for quiz in (expiring, evicted):
+        assert representations.get_or_load(quiz.quiz_id, repo.get_json) is not None
+        assert answer_keys.get_or_load(quiz.quiz_id, repo.get) is not None
+
+    # A cache hit counts as a use, so the untouched quiz is the one evicted.
+    assert representations.get_or_load(expiring.quiz_id, repo.get_json) is not None
+    repo.save(make_quiz())
+    repo.save(make_quiz())
+    assert representations.get_or_load(expiring.quiz_id, repo.get_json) is not None
+    assert representations.get_or_load(evicted.quiz_id, repo.get_json) is None
+    assert answer_keys.get_or_load(evicted.quiz_id, repo.get) is None
+
+    clock.now = 11
+    assert representations.get_or_load(expiring.quiz_id, repo.get_json) is None
+    assert answer_keys.get_or_load(expiring.quiz_id, repo.get) is None
+
+
+def test_bounded_repository_keeps_an_oversize_newest_quiz() -> None:
+    repo = BoundedInMemoryQuizRepository(max_bytes=1000)
+    small, oversize = make_quiz(num_questions=1), make_quiz(num_questions=20)
+
+    repo.save(small)
+    repo.save(oversize)
+
+    assert repo.get(oversize.quiz_id) == oversize
+    assert repo.get(small.quiz_id) is None
+    assert len(repo) == 1
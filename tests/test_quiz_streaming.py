@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.quiz.generator import DeterministicQuizGenerator
+
+
+def test_iter_questions_matches_generate() -> None:
+    generator = DeterministicQuizGenerator()
+    for topic in ("python lists", "Quantum Basket Weaving"):
+        assert list(generator.iter_questions(topic, "hard", 12)) == generator.generate(
+            topic, "hard", 12
+        )
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_header_questions_and_end_as_ndjson() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/quizzes/generate:stream",
+            json={"topic": "python lists", "difficulty": "medium", "num_questions": 250},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    frames = [json.loads(line) for line in response.text.splitlines()]
+    assert [frame["type"] for frame in frames[:2]] == ["header", "question"]
+    assert frames[0]["data"]["num_questions"] == 250
+    assert frames[-1] == {"type": "end", "data": {"count": 250}}
+    questions = [frame["data"] for frame in frames if frame["type"] == "question"]
+    assert [question["id"] for question in questions] == list(range(1, 251))
+
+
+@pytest.mark.asyncio
+async def test_stream_uses_server_sent_events_when_requested() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/quizzes/generate:stream",
+            json={"topic": "sql", "num_questions": 3},
+            headers={"Accept": "text/event-stream"},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    assert [event[0] for event in events] == ["event: header"] + ["event: question"] * 3 + [
+        "event: end"
+    ]
+    header = json.loads(events[0][1].removeprefix("data: "))
+    assert header["topic"] == "sql basics"
+    assert "quiz_id" not in header
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_oversized_quizzes() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/quizzes/generate:stream",
+            json={"topic": "sql", "num_questions": 501},
+        )
+
+    assert response.status_code == 422
@@ -0,0 +1,182 @@
+import threading
+import time
+
+import httpx
+import pytest
+
+from app.main import build_services
+from app.quiz.cache import QuizContentCache
+from app.quiz.generator import CachingQuizGenerator, DeterministicQuizGenerator
+from app.quiz.remote import CircuitBreaker, RemoteQuizGenerator
+from app.quiz.remote_stub import StubGeneratorServer
+from app.settings import Settings
+
+from conftest import FakeClock
+
+_LOCAL = DeterministicQuizGenerator()
+_FALLBACK = DeterministicQuizGenerator(engine="counter")
+
+
+def _remote(stub: StubGeneratorServer, **kwargs) -> RemoteQuizGenerator:
+    return RemoteQuizGenerator(
+        "http://generator.test",
+        fallback=_FALLBACK,
+        transport=httpx.WSGITransport(app=stub),
+        **kwargs,
+    )
+
+
+def test_remote_generator_returns_server_questions() -> None:
+    stub = StubGeneratorServer()
+    remote = _remote(stub)
+
+    questions = remote.generate("python lists", "easy", 4)
+
+    assert questions == _LOCAL.generate("python lists", "easy", 4)
+    assert list(remote.iter_questions("sql basics", "hard", 2)) == _LOCAL.generate(
+        "sql basics", "hard", 2
+    )
+    assert remote.version.startswith("remote-")
+    remote.close()
+
+
+def test_slow_first_attempt_is_hedged() -> None:
+    calls = iter([0.5])
+    stub = StubGeneratorServer(latency=lambda: next(calls, 0.0))
+    remote = _remote(stub, initial_hedge_delay=0.02)
+
+    started = time.monotonic()
+    questions = remote.generate("python dicts", "medium", 3)
+
+    assert time.monotonic() - started < 0.4
+    assert questions == _LOCAL.generate("python dicts", "medium", 3)
+    assert stub.requests == 2
+    remote.close()
+
+
+def test_deadline_falls_back_to_local_generator() -> None:
+    stub = StubGeneratorServer(latency=lambda: 0.3)
+    remote = _remote(stub, timeout_seconds=0.05, initial_hedge_delay=0.01)
+
+    started = time.monotonic()
+    questions = remote.generate("sql basics", "easy", 3)
+
+    assert time.monotonic() - started < 0.25
+    assert questions == _FALLBACK.generate("sql basics", "easy", 3)
+    remote.close()
+
+
+def test_open_circuit_skips_the_remote() -> None:
+    stub = StubGeneratorServer(fail=lambda: True)
+    remote = _remote(stub, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+
+    expected = _FALLBACK.generate("sql basics", "easy", 2)
+    for _ in range(3):
+        assert remote.generate("sql basics", "easy", 2) == expected
+
+    assert remote.breaker.state == "open"
+    assert stub.requests == 2
+    remote.close()
+
+
+def test_concurrency_is_bounded() -> None:
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def latency() -> float:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return 0.0
+
+    remote = _remote(
+        StubGeneratorServer(latency=latency), max_concurrency=2, initial_hedge_delay=5
+    )
+    threads = [
+        threading.Thread(target=remote.generate, args=("python lists", "easy", 2))
+        for _ in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
+    remote.close()
+
+
+def test_circuit_breaker_lets_one_trial_through_after_reset_timeout() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.parametrize("backend", ["local", "remote"])
+def test_settings_validate_generator_backend(backend: str) -> None:
+    env = {"EXAMIFYR_GENERATOR_BACKEND": backend}
+    if backend == "remote":
+        with pytest.raises(ValueError):
+            Settings.from_env(env)
+        env["EXAMIFYR_REMOTE_GENERATOR_URL"] = "http://generator.internal"
+    assert Settings.from_env(env).generator_backend == backend
+
+
+def test_fallback_questions_are_not_cached() -> None:
+    healthy = False
+    stub = StubGeneratorServer(fail=lambda: not healthy)
+    remote = _remote(stub)
+    cached = CachingQuizGenerator(remote, QuizContentCache())
+
+    spec = ("python lists", "easy", 3)
+
+    assert cached.generate(*spec) == _FALLBACK.generate(*spec)
+    healthy = True
+    assert cached.generate(*spec) == _LOCAL.generate(*spec)
+    assert cached.generate(*spec) == _LOCAL.generate(*spec)
+    assert stub.requests == 2
+    remote.close()
+
+
+def test_settings_reject_seed_repository_with_remote_generator() -> None:
+    with pytest.raises(ValueError):
+        Settings.from_env(
+            {
+                "EXAMIFYR_REPOSITORY_BACKEND": "seed",
+                "EXAMIFYR_GENERATOR_BACKEND": "remote",
+                "EXAMIFYR_REMOTE_GENERATOR_URL": "http://generator.internal",
+            }
+        )
+
+
+def test_remote_backend_gets_a_generation_pool_as_wide_as_its_concurrency() -> None:
+    settings = Settings(
+        prewarm_top_topics=0,
+        generator_backend="remote",
+        remote_generator_url="http://generator.internal",
+        remote_generator_max_concurrency=16,
+        generation_workers=4,
+    )
+    services = build_services(settings)
+    try:
+        assert services.generation_executor.max_workers == 16
+    finally:
+        services.generation_executor.shutdown()
+        services.remote_generator.close()
@@ -0,0 +1,54 @@
+import threading
+from pathlib import Path
+from uuid import uuid4
+
+from app.quiz.models import QuizGenerateResponse, serialize_quiz
+from app.quiz.sqlite_repo import SqliteQuizRepository
+
+from conftest import make_quiz
+
+
+def test_sqlite_repository_round_trip(tmp_path: Path) -> None:
+    repo = SqliteQuizRepository(str(tmp_path / "quizzes.sqlite3"))
+    quiz = make_quiz("sql basics", "medium", 3)
+
+    repo.save(quiz)
+
+    assert repo.get(quiz.quiz_id) == quiz
+    assert repo.get_json(quiz.quiz_id) == serialize_quiz(quiz)
+    assert repo.get(uuid4()) is None
+    repo.close()
+
+
+def test_sqlite_repository_is_shared_between_instances(tmp_path: Path) -> None:
+    path = str(tmp_path / "quizzes.sqlite3")
+    writer = SqliteQuizRepository(path)
+    reader = SqliteQuizRepository(path)
+    quizzes = [make_quiz("sql basics", "medium", 3), make_quiz("python dicts", "medium", 3)]
+
+    writer.save_many(quizzes)
+
+    for quiz in quizzes:
+        assert reader.get(quiz.quiz_id) == quiz
+    assert len(reader) == 2
+    writer.close()
+    reader.close()
+
+
+def test_sqlite_repository_uses_one_connection_per_thread(tmp_path: Path) -> None:
+    repo = SqliteQuizRepository(str(tmp_path / "quizzes.sqlite3"))
+    quiz = make_quiz("sql basics", "medium", 3)
+    repo.save(quiz)
+    results: list[QuizGenerateResponse | None] = []
+
+    def read() -> None:
+        results.append(repo.get(quiz.quiz_id))
+        results.append(repo.get(quiz.quiz_id))
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    thread.join()
+
+    assert results == [quiz, quiz]
+    assert len(repo._connections) == 2
+    repo.close()
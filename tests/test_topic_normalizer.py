@@ -0,0 +1,64 @@
+from app.quiz.normalizer import TopicNormalizer, edit_distance, normalize_topic
+
+
+def test_exact_aliases_and_passthrough() -> None:
+    assert normalize_topic("  Python   LISTS ") == "python lists"
+    assert normalize_topic("SQL") == "sql basics"
+    assert normalize_topic("Python  Programming") == "Python Programming"
+
+
+def test_fuzzy_matches_close_misspellings() -> None:
+    assert normalize_topic("pyhton lists") == "python lists"
+    assert normalize_topic("SQL basic") == "sql basics"
+    assert normalize_topic("dictionaris") == "python dicts"
+    assert normalize_topic("python lsits") == "python lists"
+    assert normalize_topic("pythonlists") == "python lists"
+
+
+def test_short_or_distant_inputs_are_not_corrected() -> None:
+    assert normalize_topic("lisp") == "lisp"
+    assert normalize_topic("Linear Algebra") == "Linear Algebra"
+
+
+def test_real_words_near_bare_aliases_are_not_rewritten() -> None:
+    for topic in ("diets", "lifts", "gists", "edicts", "junctions"):
+        assert normalize_topic(topic) == topic
+    for topic in (
+        "python tests",
+        "python lints",
+        "python gists",
+        "python mists",
+        "python fists",
+        "python lifts",
+        "python ducts",
+        "python diets",
+        "python edicts",
+        "sql bases",
+        "sql basins",
+    ):
+        assert normalize_topic(topic) == topic
+
+
+def test_edit_distance_counts_transpositions_once() -> None:
+    assert edit_distance("pyhton", "python", 2) == 1
+    assert edit_distance("kitten", "sitting", 3) == 3
+    assert edit_distance("kitten", "sitting", 1) == 2
+
+
+def test_reload_replaces_alias_table() -> None:
+    normalizer = TopicNormalizer()
+    assert normalizer.normalize("js") == "js"
+
+    normalizer.reload({"js": "javascript basics", "javascript": "javascript basics"})
+
+    assert normalizer.normalize("JS") == "javascript basics"
+    assert normalizer.normalize("javascirpt") == "javascript basics"
+    assert normalizer.normalize("lists") == "lists"
+
+
+def test_large_alias_tables_resolve_fuzzy_queries() -> None:
+    aliases = {f"course {index:06d} fundamentals": f"topic {index}" for index in range(100_000)}
+    normalizer = TopicNormalizer(aliases)
+
+    assert normalizer.normalize("course 054321 fundamentals") == "topic 54321"
+    assert normalizer.normalize("course 054321 fundamentls") == "topic 54321"
@@ -0,0 +1,122 @@
+import fcntl
+import os
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.quiz.cache import QuizContentCache
+from app.quiz.generator import CachingQuizGenerator, DeterministicQuizGenerator
+from app.quiz.repo import InMemoryQuizRepository
+from app.quiz.service import QuizService
+from app.quiz.stats import DecayingTopK, load_topic_snapshot, save_topic_snapshot
+
+from conftest import FakeClock
+
+
+def test_heavy_hitters_survive_a_long_tail_in_fixed_memory() -> None:
+    tracker: DecayingTopK[str] = DecayingTopK(capacity=16, clock=FakeClock())
+    for i in range(5000):
+        tracker.record(f"rare-{i}")
+        if i % 5 == 0:
+            tracker.record("hot")
+        if i % 10 == 0:
+            tracker.record("warm")
+
+    top = tracker.top(2)
+
+    assert len(tracker) == 16
+    assert [hitter.key for hitter in top] == ["hot", "warm"]
+    assert top[0].count - top[0].error <= 1000 <= top[0].count
+
+
+def test_new_keys_replace_the_currently_smallest_counter() -> None:
+    clock = FakeClock()
+    tracker: DecayingTopK[str] = DecayingTopK(capacity=3, half_life_seconds=10, clock=clock)
+    for key, amount in (("a", 1), ("b", 2), ("c", 3)):
+        tracker.record(key, amount)
+    tracker.record("a", 5)
+
+    tracker.record("d", 2)
+    clock.now = 500
+    tracker.record("e")
+
+    assert {hitter.key for hitter in tracker.top(3)} == {"a", "d", "e"}
+    assert tracker.top(3)[0].key == "e"
+
+
+def test_counts_halve_every_half_life_and_survive_rescaling() -> None:
+    clock = FakeClock()
+    tracker: DecayingTopK[str] = DecayingTopK(half_life_seconds=10, clock=clock)
+    tracker.record("a", 8)
+
+    clock.now = 10
+    assert tracker.top(1)[0].count == pytest.approx(4)
+
+    clock.now = 1000
+    tracker.record("b")
+    assert tracker.top(2)[0].key == "b"
+    assert tracker.top(2)[1].count == pytest.approx(8 * 2.0**-100)
+
+
+def test_topic_snapshot_round_trip(tmp_path: Path) -> None:
+    path = str(tmp_path / "topics.json")
+    source: DecayingTopK[tuple[str, str]] = DecayingTopK(clock=FakeClock())
+    source.record(("sql basics", "easy"), 3)
+    source.record(("python lists", "hard"))
+    save_topic_snapshot(path, source.top(10))
+
+    restored: DecayingTopK[tuple[str, str]] = DecayingTopK(clock=FakeClock())
+    load_topic_snapshot(path, restored)
+    load_topic_snapshot(str(tmp_path / "missing.json"), restored)
+
+    assert [(hitter.key, hitter.count) for hitter in restored.top(10)] == [
+        (("sql basics", "easy"), 3.0),
+        (("python lists", "hard"), 1.0),
+    ]
+
+
+def test_only_the_process_holding_the_lock_writes_the_snapshot(tmp_path: Path) -> None:
+    path = str(tmp_path / "topics.json")
+    other_worker = os.open(f"{path}.lock", os.O_RDWR | os.O_CREAT)
+    fcntl.flock(other_worker, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    tracker: DecayingTopK[tuple[str, str]] = DecayingTopK(clock=FakeClock())
+    tracker.record(("sql basics", "easy"))
+
+    assert save_topic_snapshot(path, tracker.top(10)) is False
+    os.close(other_worker)
+    assert save_topic_snapshot(path, tracker.top(10)) is True
+    assert save_topic_snapshot(path, tracker.top(10)) is True
+
+    assert os.path.exists(path)
+    assert sorted(os.listdir(tmp_path)) == ["topics.json", "topics.json.lock"]
+
+
+def test_prewarm_fills_the_generator_cache() -> None:
+    cache = QuizContentCache()
+    service = QuizService(
+        generator=CachingQuizGenerator(DeterministicQuizGenerator(), cache),
+        repository=InMemoryQuizRepository(),
+    )
+
+    assert service.prewarm([("sql basics", "easy", 5), ("python lists", "hard", 10)]) == 2
+    assert cache.stats().entries == 2
+    assert cache.get(("sql basics", "easy", 5)) is not None
+
+
+@pytest.mark.asyncio
+async def test_topic_stats_endpoint_reports_generated_topics() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(3):
+            await client.post(
+                "/api/v1/quizzes/generate",
+                json={"topic": "dictionaries", "difficulty": "hard", "num_questions": 1},
+            )
+        response = await client.get("/api/v1/stats/topics", params={"limit": 100})
+
+    assert response.status_code == 200
+    data = response.json()
+    counts = {(item["topic"], item["difficulty"]): item["count"] for item in data["topics"]}
+    assert counts[("python dicts", "hard")] >= 3 - 1e-3
@@ -0,0 +1,161 @@
+import asyncio
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+import app.main as main
+from app.quiz.generator import GENERATION_ENGINES, DeterministicQuizGenerator
+from app.tracing import (
+    TracedRoute,
+    Trace,
+    TraceStore,
+    Tracer,
+    TracingMiddleware,
+    _current_trace,
+    span,
+    span_since_route_entry,
+)
+
+PAYLOAD = {"topic": "python lists", "difficulty": "medium", "num_questions": 3}
+
+
+@pytest.fixture
+def admin_tracer(monkeypatch: pytest.MonkeyPatch) -> Tracer:
+    tracer = main.app.state.services.tracer
+    monkeypatch.setattr(tracer, "admin_token", "secret")
+    monkeypatch.setattr(tracer, "enabled", False)
+    tracer.store.clear()
+    yield tracer
+    tracer.store.clear()
+
+
+def test_span_is_a_no_op_outside_a_trace() -> None:
+    with span("anything"):
+        pass
+
+
+def test_store_keeps_the_slowest_traces() -> None:
+    store = TraceStore(max_traces=2)
+    for duration in (5.0, 1.0, 9.0, 3.0):
+        trace = Trace(method="POST", path="/")
+        trace.duration_ms = duration
+        store.add(trace)
+
+    assert [trace.duration_ms for trace in store.slowest()] == [9.0, 5.0]
+
+
+@pytest.mark.parametrize("engine", GENERATION_ENGINES)
+def test_both_generation_engines_record_build_choices(engine: str) -> None:
+    trace = Trace(method="POST", path="/")
+    token = _current_trace.set(trace)
+    try:
+        DeterministicQuizGenerator(engine=engine).generate("python lists", "easy", 2)
+    finally:
+        _current_trace.reset(token)
+
+    assert [s.name for s in trace.spans].count("build_choices") == 2
+
+
+@pytest.mark.asyncio
+async def test_route_entry_span_excludes_time_before_routing() -> None:
+    router = APIRouter(route_class=TracedRoute)
+
+    @router.get("/")
+    async def endpoint() -> dict[str, str]:
+        span_since_route_entry("validation")
+        return {}
+
+    app = FastAPI()
+    app.include_router(router)
+
+    @app.middleware("http")
+    async def slow_middleware(request, call_next):
+        await asyncio.sleep(0.05)
+        return await call_next(request)
+
+    tracer = Tracer(enabled=True)
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.get("/")
+
+    (validation,) = tracer.store.slowest()[0].spans
+    assert validation.start_ms >= 50
+    assert validation.duration_ms < 50
+
+
+@pytest.mark.asyncio
+async def test_disabled_tracing_records_nothing(admin_tracer: Tracer) -> None:
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/v1/quizzes/generate", json=PAYLOAD)
+
+    assert response.status_code == 200
+    assert "x-trace-id" not in response.headers
+    assert admin_tracer.store.slowest() == []
+
+
+@pytest.mark.asyncio
+async def test_enabled_tracing_records_generation_stages(admin_tracer: Tracer) -> None:
+    headers = {"X-Admin-Token": "secret"}
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        switched = await client.put("/admin/tracing", json={"enabled": True}, headers=headers)
+        response = await client.post(
+            "/api/v1/quizzes/generate",
+            json={**PAYLOAD, "topic": "tracing stages"},
+        )
+        trace = await client.get(
+            f"/admin/traces/{response.headers['x-trace-id']}", headers=headers
+        )
+        listed = await client.get("/admin/traces", headers=headers)
+
+    assert switched.json() == {"enabled": True}
+    assert trace.status_code == 200
+    names = {span["name"] for span in trace.json()["spans"]}
+    assert {
+        "validation",
+        "normalize_topic",
+        "generate",
+        "build_choices",
+        "repository.save",
+        "serialize_response",
+    } <= names
+    assert trace.json()["status"] == 200
+    assert listed.json()["enabled"] is True
+    assert response.headers["x-trace-id"] in {t["trace_id"] for t in listed.json()["traces"]}
+
+
+@pytest.mark.asyncio
+async def test_profile_header_requires_the_admin_token(admin_tracer: Tracer) -> None:
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        anonymous = await client.post(
+            "/api/v1/quizzes/generate", json=PAYLOAD, headers={"X-Profile": "1"}
+        )
+        profiled = await client.post(
+            "/api/v1/quizzes/generate",
+            json=PAYLOAD,
+            headers={"X-Profile": "1", "X-Admin-Token": "secret"},
+        )
+        trace = await client.get(
+            f"/admin/traces/{profiled.headers['x-trace-id']}",
+            headers={"X-Admin-Token": "secret"},
+        )
+
+    assert "x-trace-id" not in anonymous.headers
+    assert trace.json()["profile"] is not None
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoints_check_the_token(
+    admin_tracer: Tracer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        wrong = await client.get("/admin/traces", headers={"X-Admin-Token": "nope"})
+        monkeypatch.setattr(admin_tracer, "admin_token", None)
+        unconfigured = await client.get("/admin/traces", headers={"X-Admin-Token": "nope"})
+
+    assert wrong.status_code == 403
+    assert unconfigured.status_code == 404